@@ -0,0 +1,27 @@
+from sqlalchemy import text
+from database import engine
+
+# Columns added to existing summary tables after their initial creation
+new_columns = [
+    ('benchmark_summaries', 'results_hash', 'VARCHAR(64)'),
+    ('monthly_summaries', 'quick_ratio', 'NUMERIC(10, 4)'),
+    ('reports', 'content_hash', 'VARCHAR(64)'),
+]
+
+# Indexes added to existing summary tables after their initial creation
+new_indexes = [
+    ('ix_monthly_summaries_company_month_desc', 'monthly_summaries',
+     '(company_id, month DESC) INCLUDE (revenue, net_income, current_ratio, quick_ratio, debt_to_equity, '
+     'current_liabilities, operating_cash_flow, net_margin)'),
+    ('idx_company_report_content_hash', 'reports', '(company_id, content_hash)'),
+]
+
+with engine.begin() as conn:
+    for table_name, col_name, col_type in new_columns:
+        print(f"Ensuring column: {table_name}.{col_name}")
+        conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {col_name} {col_type}"))
+    for index_name, table_name, index_def in new_indexes:
+        print(f"Ensuring index: {index_name}")
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} {index_def}"))
+
+print("Migration completed successfully")
@@ -350,12 +350,19 @@ class MonthlySummary(Base):
     gross_margin = Column(Numeric(5, 4))
     net_margin = Column(Numeric(5, 4))
     current_ratio = Column(Numeric(8, 4))
+    quick_ratio = Column(Numeric(10, 4))  # (current assets - inventory) / current liabilities, set at ingest
     debt_to_equity = Column(Numeric(8, 4))
     financial_health_score = Column(Numeric(5, 2))
     statement_json = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-    __table_args__ = (UniqueConstraint('company_id', 'month', name='_company_month_uc'),)
+    __table_args__ = (
+        UniqueConstraint('company_id', 'month', name='_company_month_uc'),
+        # Serves "latest N months for a company" scans; INCLUDE makes the scoring window index-only on Postgres
+        Index('ix_monthly_summaries_company_month_desc', 'company_id', month.desc(),
+              postgresql_include=['revenue', 'net_income', 'current_ratio', 'quick_ratio', 'debt_to_equity',
+                                  'current_liabilities', 'operating_cash_flow', 'net_margin']),
+    )
 
 class RiskSummary(Base):
     __tablename__ = "risk_summaries"
@@ -520,6 +527,9 @@ class BenchmarkSummary(Base):
     metrics_above_avg = Column(Integer)  # Count of metrics above industry average
     total_metrics = Column(Integer)
     
+    # SHA-256 of the stored results, used to skip no-op rewrites
+    results_hash = Column(String(64))
+    
     last_updated = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -554,7 +564,13 @@ class Report(Base):
     processing_period = Column(String(7))  # YYYY-MM
     data_months_used = Column(Integer)
     
-    __table_args__ = (Index('idx_company_report_version', 'company_id', 'version_number'),)
+    # SHA-256 of the source rows the report was built from, used to reuse unchanged reports
+    content_hash = Column(String(64))
+    
+    __table_args__ = (
+        Index('idx_company_report_version', 'company_id', 'version_number'),
+        Index('idx_company_report_content_hash', 'company_id', 'content_hash'),
+    )
 
 class UploadedDocument(Base):
     __tablename__ = "uploaded_documents"
@@ -7,7 +7,6 @@ from deps import get_request_company_id
 from auth import get_current_active_user
 from models import User
 from utils.credit_scorer import CreditScorer
-from sqlalchemy.sql import func
 
 router = APIRouter()
 
@@ -58,52 +57,6 @@ async def get_credit_evaluation(
     
     # Cache the result if we have valid data
     if credit_data['credit_score'] is not None:
-        existing = db.query(CreditScoreSummary).filter(
-            CreditScoreSummary.company_id == company_id
-        ).first()
-        
-        if existing:
-            existing.credit_score = credit_data['credit_score']
-            existing.credit_rating = credit_data['credit_rating']
-            existing.profitability_score = credit_data['component_scores']['profitability']
-            existing.liquidity_score = credit_data['component_scores']['liquidity']
-            existing.leverage_score = credit_data['component_scores']['leverage']
-            existing.cash_flow_score = credit_data['component_scores']['cash_flow']
-            existing.growth_score = credit_data['component_scores']['growth']
-            existing.repayment_capacity_ratio = credit_data['repayment_capacity_ratio']
-            existing.loan_eligibility_status = credit_data['loan_eligibility_status']
-            existing.risk_flags = credit_data['risk_flags']
-            existing.net_margin = credit_data['component_details']['net_margin']
-            existing.current_ratio = credit_data['component_details']['current_ratio']
-            existing.quick_ratio = credit_data['component_details']['quick_ratio']
-            existing.debt_to_equity = credit_data['component_details']['debt_to_equity']
-            existing.cash_flow_stability = credit_data['component_details']['cash_flow_stability']
-            existing.revenue_growth_rate = credit_data['component_details']['revenue_growth_rate']
-            existing.improvement_recommendations = credit_data['improvement_recommendations']
-            existing.last_updated = func.now()
-        else:
-            new_summary = CreditScoreSummary(
-                company_id=company_id,
-                credit_score=credit_data['credit_score'],
-                credit_rating=credit_data['credit_rating'],
-                profitability_score=credit_data['component_scores']['profitability'],
-                liquidity_score=credit_data['component_scores']['liquidity'],
-                leverage_score=credit_data['component_scores']['leverage'],
-                cash_flow_score=credit_data['component_scores']['cash_flow'],
-                growth_score=credit_data['component_scores']['growth'],
-                repayment_capacity_ratio=credit_data['repayment_capacity_ratio'],
-                loan_eligibility_status=credit_data['loan_eligibility_status'],
-                risk_flags=credit_data['risk_flags'],
-                net_margin=credit_data['component_details']['net_margin'],
-                current_ratio=credit_data['component_details']['current_ratio'],
-                quick_ratio=credit_data['component_details']['quick_ratio'],
-                debt_to_equity=credit_data['component_details']['debt_to_equity'],
-                cash_flow_stability=credit_data['component_details']['cash_flow_stability'],
-                revenue_growth_rate=credit_data['component_details']['revenue_growth_rate'],
-                improvement_recommendations=credit_data['improvement_recommendations']
-            )
-            db.add(new_summary)
-        
-        db.commit()
+        scorer.store_credit_summary(company_id, db, credit_data)
     
     return credit_data
@@ -12,7 +12,7 @@ from models import FinancialData, User, FinancialMetrics, RiskAssessment, Credit
 from schemas import FinancialDataCreate, FinancialDataResponse, FileUploadResponse
 from auth import get_current_active_user
 from utils.data_processor import DataProcessor
-from utils.financial_calculator import FinancialCalculator
+from utils.financial_calculator import forecast_payload, get_calculator
 from utils.audit import log_audit
 from deps import get_request_company_id
 
@@ -65,7 +65,7 @@ async def upload_financial_data(
             )
         
         # Initialize calculator for downstream calculations
-        calculator = FinancialCalculator()
+        calculator = get_calculator()
         
         # Create financial data record# Store the latest month's data in FinancialData (for compatibility)
         # Only include fields that exist in FinancialData model
@@ -97,9 +97,13 @@ async def upload_financial_data(
         monthly_statements = parsed_data.get('monthly_statements', {})
         if monthly_statements:
             from models import MonthlySummary, RiskSummary
-            for month, stmt in monthly_statements.items():
-                # Compute metrics for this month
-                metrics_dict = calculator.calculate_financial_metrics(stmt)
+            latest_month, latest_stmt = None, None
+            # Compute metrics for every month in one vectorized pass
+            monthly_metrics = calculator.calculate_financial_metrics_batch(list(monthly_statements.values()))
+            for (month, stmt), metrics_dict in zip(monthly_statements.items(), monthly_metrics):
+                # Months are ISO YYYY-MM strings, so the latest one can be tracked while upserting
+                if latest_month is None or month > latest_month:
+                    latest_month, latest_stmt = month, stmt
                 health_score_dict = calculator.calculate_financial_health_score(metrics_dict)
                 
                 # Upsert monthly summary
@@ -121,6 +125,7 @@ async def upload_financial_data(
                     existing.gross_margin = metrics_dict.get('gross_profit_margin')
                     existing.net_margin = metrics_dict.get('net_profit_margin')
                     existing.current_ratio = metrics_dict.get('current_ratio')
+                    existing.quick_ratio = metrics_dict.get('quick_ratio')
                     existing.debt_to_equity = stmt.get('debt_to_equity')
                     existing.financial_health_score = health_score_dict.get('financial_health_score')
                     existing.statement_json = {k: v for k, v in stmt.items() if k != 'monthly_statements'}
@@ -141,6 +146,7 @@ async def upload_financial_data(
                         gross_margin=metrics_dict.get('gross_profit_margin'),
                         net_margin=metrics_dict.get('net_profit_margin'),
                         current_ratio=metrics_dict.get('current_ratio'),
+                        quick_ratio=metrics_dict.get('quick_ratio'),
                         debt_to_equity=stmt.get('debt_to_equity'),
                         financial_health_score=health_score_dict.get('financial_health_score'),
                         statement_json={k: v for k, v in stmt.items() if k != 'monthly_statements'}
@@ -148,8 +154,6 @@ async def upload_financial_data(
                     db.add(db_month)
             
             # Atomically update RiskSummary with latest month's debt metrics
-            latest_month = max(monthly_statements.keys())
-            latest_stmt = monthly_statements[latest_month]
             existing_risk = db.query(RiskSummary).filter(RiskSummary.company_id == company_id).first()
             if existing_risk:
                 existing_risk.debt_to_equity = latest_stmt.get('debt_to_equity')
@@ -165,9 +169,16 @@ async def upload_financial_data(
             print(f"[RISK UPDATE] company_id={company_id} debt_to_equity={latest_stmt.get('debt_to_equity'):.2f} risk_level={latest_stmt.get('risk_level')}")
             db.commit()
             
+            # Monthly and risk data changed, so any cached credit score is stale
+            from utils.credit_scorer import CreditScorer
+            CreditScorer.invalidate_cache(company_id, monthly_statements.keys())
+            
             # Calculate and store comprehensive financial health
             from utils.financial_health_calculator import FinancialHealthCalculator
+            from utils.financial_forecaster import FinancialForecaster
             from models import FinancialHealthSummary
+            FinancialHealthCalculator.invalidate_cache(company_id)
+            FinancialForecaster.invalidate_cache(company_id)
             health_calc = FinancialHealthCalculator()
             health_data = health_calc.calculate_comprehensive_health(company_id, db)
             
@@ -272,62 +283,14 @@ async def upload_financial_data(
             
             # Calculate and store credit evaluation
             from utils.credit_scorer import CreditScorer
-            from models import CreditScoreSummary
             credit_scorer = CreditScorer()
             credit_data = credit_scorer.calculate_credit_score(company_id, db)
             
             if credit_data['credit_score'] is not None:
-                existing_credit = db.query(CreditScoreSummary).filter(
-                    CreditScoreSummary.company_id == company_id
-                ).first()
-                
-                if existing_credit:
-                    existing_credit.credit_score = credit_data['credit_score']
-                    existing_credit.credit_rating = credit_data['credit_rating']
-                    existing_credit.profitability_score = credit_data['component_scores']['profitability']
-                    existing_credit.liquidity_score = credit_data['component_scores']['liquidity']
-                    existing_credit.leverage_score = credit_data['component_scores']['leverage']
-                    existing_credit.cash_flow_score = credit_data['component_scores']['cash_flow']
-                    existing_credit.growth_score = credit_data['component_scores']['growth']
-                    existing_credit.repayment_capacity_ratio = credit_data['repayment_capacity_ratio']
-                    existing_credit.loan_eligibility_status = credit_data['loan_eligibility_status']
-                    existing_credit.risk_flags = credit_data['risk_flags']
-                    existing_credit.net_margin = credit_data['component_details']['net_margin']
-                    existing_credit.current_ratio = credit_data['component_details']['current_ratio']
-                    existing_credit.quick_ratio = credit_data['component_details']['quick_ratio']
-                    existing_credit.debt_to_equity = credit_data['component_details']['debt_to_equity']
-                    existing_credit.cash_flow_stability = credit_data['component_details']['cash_flow_stability']
-                    existing_credit.revenue_growth_rate = credit_data['component_details']['revenue_growth_rate']
-                    existing_credit.improvement_recommendations = credit_data['improvement_recommendations']
-                    existing_credit.last_updated = func.now()
-                else:
-                    credit_summary = CreditScoreSummary(
-                        company_id=company_id,
-                        credit_score=credit_data['credit_score'],
-                        credit_rating=credit_data['credit_rating'],
-                        profitability_score=credit_data['component_scores']['profitability'],
-                        liquidity_score=credit_data['component_scores']['liquidity'],
-                        leverage_score=credit_data['component_scores']['leverage'],
-                        cash_flow_score=credit_data['component_scores']['cash_flow'],
-                        growth_score=credit_data['component_scores']['growth'],
-                        repayment_capacity_ratio=credit_data['repayment_capacity_ratio'],
-                        loan_eligibility_status=credit_data['loan_eligibility_status'],
-                        risk_flags=credit_data['risk_flags'],
-                        net_margin=credit_data['component_details']['net_margin'],
-                        current_ratio=credit_data['component_details']['current_ratio'],
-                        quick_ratio=credit_data['component_details']['quick_ratio'],
-                        debt_to_equity=credit_data['component_details']['debt_to_equity'],
-                        cash_flow_stability=credit_data['component_details']['cash_flow_stability'],
-                        revenue_growth_rate=credit_data['component_details']['revenue_growth_rate'],
-                        improvement_recommendations=credit_data['improvement_recommendations']
-                    )
-                    db.add(credit_summary)
-                
-                db.commit()
+                credit_scorer.store_credit_summary(company_id, db, credit_data)
                 print(f"[CREDIT EVALUATION UPDATE] company_id={company_id} credit_score={credit_data['credit_score']:.2f} rating={credit_data['credit_rating']}")
             
             # Generate financial forecasts
-            from utils.financial_forecaster import FinancialForecaster
             from models import ForecastSummary
             forecaster = FinancialForecaster()
             
@@ -381,7 +344,7 @@ async def upload_financial_data(
 
         # Trigger downstream calculations
         try:
-            calculator = FinancialCalculator()
+            calculator = get_calculator()
             # 1) Calculate and store metrics
             metrics_dict = calculator.calculate_financial_metrics(parsed_data)
             existing_metrics = db.query(FinancialMetrics).filter(
@@ -438,7 +401,7 @@ async def upload_financial_data(
             metrics_dict['health_grade'] = health_score_dict['grade']
 
             # 5) Simple forecast (6/12 month moving average)
-            forecast_dict = calculator.generate_forecast([parsed_data], months=12)
+            forecast_dict = forecast_payload(calculator.generate_forecast([parsed_data], months=12))
             existing_forecast = db.query(Forecast).filter(
                 Forecast.company_id == company_id,
                 Forecast.generated_for_period == period
@@ -7,6 +7,7 @@ from deps import get_request_company_id
 from auth import get_current_active_user
 from models import User
 from utils.risk_analyzer import RiskAnalyzer
+from utils.credit_scorer import CreditScorer
 from sqlalchemy.sql import func
 
 router = APIRouter()
@@ -122,5 +123,8 @@ async def get_risk_analysis(
             db.add(new_summary)
         
         db.commit()
+        
+        # Credit scores use the leverage risk level, so cached scores are stale now
+        CreditScorer.invalidate_cache(company_id)
     
     return risk_data
@@ -0,0 +1,53 @@
+"""Per-company cache generations shared by every worker process through Redis
+
+In-process caches store the generation an entry was computed under and only reuse it while
+the shared counter still matches, so an invalidation in one worker reaches all of them.
+"""
+import os
+from typing import Iterable, List, Optional
+
+try:
+    import redis
+except ImportError:  # Redis is optional; in-process caches still work without it
+    redis = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+_redis_client = None
+
+
+def get_redis():
+    """Shared Redis client when REDIS_URL is configured, otherwise None"""
+    global _redis_client
+    if _redis_client is None and redis is not None and REDIS_URL:
+        _redis_client = redis.Redis.from_url(REDIS_URL)
+    return _redis_client
+
+
+def cache_generations(namespace: str, cache_keys: Iterable[str]) -> List[Optional[int]]:
+    """Current generation for each key: 0 without Redis, None when Redis is configured but unreachable"""
+    cache_keys = list(cache_keys)
+    client = get_redis()
+    if client is None:
+        return [0] * len(cache_keys)
+    if not cache_keys:
+        return []
+    try:
+        values = client.mget([f"{namespace}_gen:{cache_key}" for cache_key in cache_keys])
+    except redis.RedisError:
+        return [None] * len(cache_keys)
+    return [int(value or 0) for value in values]
+
+
+def cache_generation(namespace: str, cache_key: str) -> Optional[int]:
+    """Current generation for one key (see cache_generations)"""
+    return cache_generations(namespace, (cache_key,))[0]
+
+
+def bump_generation(namespace: str, cache_key: str):
+    """Invalidate the key's entries in every process by advancing its shared generation"""
+    client = get_redis()
+    if client is not None:
+        try:
+            client.incr(f"{namespace}_gen:{cache_key}")
+        except redis.RedisError:
+            pass
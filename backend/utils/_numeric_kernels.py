@@ -0,0 +1,62 @@
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Below this length plain float loops beat NumPy's per-call dispatch; longer series use NumPy
+_SMALL_SERIES = 32
+
+
+def series_stats(values: Sequence[float]) -> Tuple[float, float]:
+    """Coefficient of variation and compound per-period growth rate of a short series
+
+    The health and forecast engines work on at most 12 monthly values, where
+    NumPy's per-call dispatch costs more than the arithmetic, so both figures
+    come from plain float loops over the series; only series of _SMALL_SERIES
+    values or more take the NumPy path for the variation.
+    """
+    n = len(values)
+    if n < 2:
+        return 1.0, 0
+
+    # Coefficient of variation (population std / |mean|); 1.0 when the mean is zero
+    if n >= _SMALL_SERIES:
+        array = np.asarray(values, dtype=np.float64)
+        mean = float(array.mean())
+        cv = 1.0 if mean == 0 else float(array.std()) / abs(mean)
+        start, end = float(array[0]), float(array[-1])
+    else:
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        mean = math.fsum(values) / n
+        if mean == 0:
+            cv = 1.0
+        else:
+            cv = math.sqrt(math.fsum([(v - mean) * (v - mean) for v in values]) / n) / abs(mean)
+        start, end = values[0], values[-1]
+
+    # Compound growth from the first to the last value, as expm1(log(ratio) / periods) so rates
+    # near zero keep their precision. A series that hits zero or changes sign over several
+    # periods has no real compound rate and counts as a total loss (-100%)
+    if start == 0:
+        growth = 0
+    else:
+        ratio = end / start
+        periods = n - 1
+        if periods == 1:
+            growth = ratio - 1
+        elif ratio > 0:
+            growth = math.expm1(math.log(ratio) / periods)
+        else:
+            growth = -1.0
+    return cv, growth
+
+
+def coefficient_of_variation(values: Sequence[float]) -> float:
+    """Population std / |mean| (lower = more stable); 1.0 for short or zero-mean series"""
+    return series_stats(values)[0]
+
+
+def compound_growth_rate(values: Sequence[float]) -> float:
+    """Compound per-period growth from the first to the last value; 0 when undefined"""
+    return series_stats(values)[1]
@@ -1,9 +1,159 @@
+import bisect
+import hashlib
+import json
+import math
+import time
 import numpy as np
-from typing import Dict, List, Any, Tuple, Optional
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Any, Tuple, Optional, Sequence
+from sqlalchemy import Float, cast
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import insert
 from decimal import Decimal
 from models import MonthlySummary, IndustryBenchmarks, BenchmarkSummary
 
+
+@dataclass(slots=True, frozen=True)
+class MetricResult:
+    """Comparison of one company metric against its industry benchmark"""
+    value: float
+    industry_avg: float
+    percentile: float
+    status: str
+    deviation_percent: float
+    top_quartile: float
+    bottom_quartile: float
+
+
+# Benchmarked metrics, in the order company values are calculated and reported
+_METRIC_NAMES = (
+    'net_profit_margin', 'gross_margin', 'current_ratio', 'debt_to_equity',
+    'revenue_growth_rate', 'operating_margin', 'quick_ratio', 'cash_conversion_cycle'
+)
+
+# Default benchmarks per industry as (metric, industry_avg, top_quartile, bottom_quartile) rows
+_DEFAULT_BENCHMARK_ROWS = (
+    ('Retail', (
+        ('net_profit_margin', 0.03, 0.06, 0.01),
+        ('gross_margin', 0.35, 0.45, 0.25),
+        ('current_ratio', 1.5, 2.0, 1.0),
+        ('debt_to_equity', 1.2, 0.8, 2.0),
+        ('revenue_growth_rate', 0.08, 0.15, 0.02),
+        ('operating_margin', 0.06, 0.10, 0.03),
+        ('quick_ratio', 0.8, 1.2, 0.5),
+        ('cash_conversion_cycle', 45, 30, 60)
+    )),
+    ('Manufacturing', (
+        ('net_profit_margin', 0.05, 0.08, 0.02),
+        ('gross_margin', 0.30, 0.40, 0.20),
+        ('current_ratio', 1.8, 2.5, 1.2),
+        ('debt_to_equity', 1.5, 1.0, 2.5),
+        ('revenue_growth_rate', 0.06, 0.12, 0.01),
+        ('operating_margin', 0.10, 0.15, 0.05),
+        ('quick_ratio', 1.0, 1.5, 0.7),
+        ('cash_conversion_cycle', 60, 45, 90)
+    )),
+    ('Services', (
+        ('net_profit_margin', 0.12, 0.18, 0.06),
+        ('gross_margin', 0.55, 0.65, 0.45),
+        ('current_ratio', 1.6, 2.2, 1.1),
+        ('debt_to_equity', 0.8, 0.5, 1.5),
+        ('revenue_growth_rate', 0.10, 0.20, 0.03),
+        ('operating_margin', 0.15, 0.22, 0.08),
+        ('quick_ratio', 1.2, 1.8, 0.8),
+        ('cash_conversion_cycle', 30, 20, 45)
+    )),
+    ('Technology', (
+        ('net_profit_margin', 0.15, 0.25, 0.08),
+        ('gross_margin', 0.65, 0.75, 0.55),
+        ('current_ratio', 2.0, 3.0, 1.3),
+        ('debt_to_equity', 0.6, 0.3, 1.2),
+        ('revenue_growth_rate', 0.25, 0.40, 0.10),
+        ('operating_margin', 0.20, 0.30, 0.10),
+        ('quick_ratio', 1.5, 2.5, 1.0),
+        ('cash_conversion_cycle', 25, 15, 40)
+    )),
+    ('General', (
+        ('net_profit_margin', 0.08, 0.12, 0.04),
+        ('gross_margin', 0.40, 0.50, 0.30),
+        ('current_ratio', 1.7, 2.3, 1.2),
+        ('debt_to_equity', 1.0, 0.7, 1.8),
+        ('revenue_growth_rate', 0.08, 0.15, 0.02),
+        ('operating_margin', 0.12, 0.18, 0.06),
+        ('quick_ratio', 1.0, 1.5, 0.7),
+        ('cash_conversion_cycle', 40, 30, 60)
+    ))
+)
+
+
+def _build_default_benchmark_arrays() -> Tuple[Dict[str, int], np.ndarray, np.ndarray, np.ndarray]:
+    """Flatten the default benchmark rows into (industry, metric) indexed arrays"""
+    shape = (len(_DEFAULT_BENCHMARK_ROWS), len(_METRIC_NAMES))
+    avg, tq, bq = np.empty(shape), np.empty(shape), np.empty(shape)
+    industry_index = {}
+    for row, (industry_type, metric_rows) in enumerate(_DEFAULT_BENCHMARK_ROWS):
+        industry_index[industry_type] = row
+        for metric_name, industry_avg, top_quartile, bottom_quartile in metric_rows:
+            col = _METRIC_NAMES.index(metric_name)
+            avg[row, col], tq[row, col], bq[row, col] = industry_avg, top_quartile, bottom_quartile
+    return industry_index, avg, tq, bq
+
+
+_INDUSTRY_INDEX, _DEFAULT_AVG, _DEFAULT_TQ, _DEFAULT_BQ = _build_default_benchmark_arrays()
+
+
+# Percentile tier breakpoints and their status labels (tier i covers [breaks[i-1], breaks[i]))
+_STATUS_BREAKS = (25, 40, 60, 75)
+_STATUS_LABELS = ('Bottom 25%', 'Below Average', 'Near Average', 'Above Average', 'Top 25%')
+_SUMMARY_TEXTS = (
+    'Poor performance - significantly below industry standards',
+    'Below average performance - room for improvement',
+    'Average performance - near industry standards',
+    'Strong performance - above industry average',
+    'Excellent performance - significantly above industry standards'
+)
+
+
+def _reciprocal(value: float) -> float:
+    """Reciprocal with a 0.0 guard for zero denominators"""
+    return 1.0 / value if value else 0.0
+
+
+def _attach_reciprocals(benchmark: Dict) -> Dict:
+    """Precompute the reciprocal denominators used by the percentile/deviation kernels"""
+    industry_avg = benchmark['industry_avg']
+    top_quartile = benchmark['top_quartile']
+    bottom_quartile = benchmark['bottom_quartile']
+    benchmark['_inv_industry_avg'] = _reciprocal(industry_avg)
+    benchmark['_inv_top_quartile'] = _reciprocal(top_quartile)
+    benchmark['_inv_top_spread'] = _reciprocal(top_quartile - industry_avg)
+    benchmark['_inv_bottom_spread'] = _reciprocal(industry_avg - bottom_quartile)
+    benchmark['_inv_bottom_quartile'] = _reciprocal(bottom_quartile)
+    return benchmark
+
+
+def _percentile_batch(values: np.ndarray, avgs: np.ndarray, tqs: np.ndarray, bqs: np.ndarray,
+                      inv_tqs: np.ndarray, inv_top_spreads: np.ndarray,
+                      inv_bottom_spreads: np.ndarray, inv_bqs: np.ndarray) -> np.ndarray:
+    """Vectorized percentile ladder over parallel metric/benchmark arrays"""
+    return np.select(
+        [values >= tqs, values >= avgs, values >= bqs],
+        [
+            75 + np.minimum(25, (values - tqs) * inv_tqs * 25),
+            50 + (values - avgs) * inv_top_spreads * 25,
+            25 + (values - bqs) * inv_bottom_spreads * 25
+        ],
+        default=np.maximum(0, values * inv_bqs * 25)
+    )
+
+
+def _deviation_batch(values: np.ndarray, avgs: np.ndarray, inv_avgs: np.ndarray) -> np.ndarray:
+    """Vectorized percentage deviation from industry average (0 where average is 0)"""
+    return (values - avgs) * inv_avgs * 100
+
+
 class BenchmarkAnalyzer:
     """Industry benchmarking and comparison engine"""
     
@@ -34,38 +184,61 @@ class BenchmarkAnalyzer:
         }
     }
     
+    # Per-metric result columns persisted on BenchmarkSummary
+    SUMMARY_METRICS = (
+        'net_profit_margin', 'gross_margin', 'debt_to_equity', 'current_ratio',
+        'quick_ratio', 'revenue_growth_rate', 'operating_margin', 'cash_conversion_cycle'
+    )
+    
+    # Per-process cache of loaded benchmarks: industry_type -> (loaded_at, benchmarks)
+    BENCHMARK_CACHE_TTL = 300
+    _benchmark_cache: Dict[str, Tuple[float, Dict[str, Dict]]] = {}
+    
+    @classmethod
+    def clear_benchmark_cache(cls):
+        """Drop cached industry benchmarks so the next analysis reloads them"""
+        cls._benchmark_cache.clear()
+    
     def analyze_benchmarks(self, company_id: str, db: Session, industry_type: Optional[str] = None) -> Dict[str, Any]:
         """Perform comprehensive benchmark analysis"""
         
-        # Get latest financial data
-        latest_summary = db.query(MonthlySummary).filter(
+        # Get historical data for growth calculations (newest first)
+        # NUMERIC columns are cast to float in SQL so rows arrive without Decimal values
+        summaries = db.query(
+            MonthlySummary.month,
+            cast(MonthlySummary.revenue, Float).label('revenue'),
+            cast(MonthlySummary.operating_expense, Float).label('operating_expense'),
+            cast(MonthlySummary.total_assets, Float).label('total_assets'),
+            cast(MonthlySummary.gross_margin, Float).label('gross_margin'),
+            cast(MonthlySummary.net_margin, Float).label('net_margin'),
+            cast(MonthlySummary.current_ratio, Float).label('current_ratio'),
+            cast(MonthlySummary.debt_to_equity, Float).label('debt_to_equity')
+        ).filter(
             MonthlySummary.company_id == company_id
-        ).order_by(MonthlySummary.month.desc()).first()
+        ).order_by(MonthlySummary.month.desc()).limit(12).all()
         
-        if not latest_summary:
+        if not summaries:
             return self._empty_benchmark_response()
         
-        # Get historical data for growth calculations
-        summaries = db.query(MonthlySummary).filter(
-            MonthlySummary.company_id == company_id
-        ).order_by(MonthlySummary.month.desc()).limit(12).all()
+        # Latest financial data is the head of the window
+        latest_summary = summaries[0]
         
         # Determine industry type
         if not industry_type:
             industry_type = self._classify_industry(latest_summary, summaries)
         
-        # Calculate company metrics
-        company_metrics = self._calculate_company_metrics(latest_summary, summaries)
-        
         # Get industry benchmarks
         industry_benchmarks = self._get_industry_benchmarks(db, industry_type)
         
-        # Compare against benchmarks
-        benchmark_results = self._compare_with_benchmarks(company_metrics, industry_benchmarks)
+        # Calculate company metrics and compare against benchmarks in one pass
+        company_metrics, benchmark_results = self._build_results(latest_summary, summaries, industry_benchmarks)
         
         # Calculate overall summary
         overall_summary = self._calculate_overall_summary(benchmark_results)
         
+        # Results leave the analyzer as plain dicts for JSON columns and the API
+        benchmark_results = {name: asdict(result) for name, result in benchmark_results.items()}
+        
         # Store results
         self._store_benchmark_summary(company_id, db, industry_type, benchmark_results, overall_summary)
         
@@ -78,12 +251,16 @@ class BenchmarkAnalyzer:
             'last_updated': latest_summary.month
         }
     
-    def _classify_industry(self, latest: MonthlySummary, summaries: List) -> str:
+    def _classify_industry(self, latest: Row, summaries: List[Row]) -> str:
         """Simple industry classification based on financial characteristics"""
         # This is a simplified classification - in production, use more sophisticated methods
-        gross_margin = float(latest.gross_margin or 0)
-        revenue = float(latest.revenue or 0)
-        total_assets = float(latest.total_assets or 0)
+        # Without a reported revenue the heuristics below have nothing to go on
+        if not summaries or latest.revenue is None:
+            return 'General'
+        
+        gross_margin = latest.gross_margin or 0.0
+        revenue = latest.revenue or 0.0
+        total_assets = latest.total_assets or 0.0
         
         # Simple heuristics for industry classification
         if gross_margin > 0.4 and revenue > 1000000:
@@ -97,191 +274,160 @@ class BenchmarkAnalyzer:
         else:
             return 'General'
     
-    def _calculate_company_metrics(self, latest: MonthlySummary, summaries: List) -> Dict[str, float]:
+    def _calculate_company_metrics(self, latest: Row, summaries: List[Row]) -> Dict[str, float]:
         """Calculate company's financial metrics"""
-        metrics = {}
-        
+        return dict(zip(_METRIC_NAMES, self._company_metric_values(latest, summaries)))
+    
+    def _company_metric_values(self, latest: Row, summaries: List[Row]) -> Tuple[float, ...]:
+        """Calculate company's financial metrics in _METRIC_NAMES order"""
         # Profitability metrics
-        metrics['net_profit_margin'] = float(latest.net_margin or 0)
-        metrics['gross_margin'] = float(latest.gross_margin or 0)
+        net_profit_margin = latest.net_margin or 0.0
+        gross_margin = latest.gross_margin or 0.0
         
         # Calculate operating margin if we have operating expense
         if latest.operating_expense and latest.revenue:
-            operating_income = float(latest.revenue) - float(latest.operating_expense)
-            metrics['operating_margin'] = operating_income / float(latest.revenue)
+            operating_income = latest.revenue - latest.operating_expense
+            operating_margin = operating_income / latest.revenue
         else:
-            metrics['operating_margin'] = 0
+            operating_margin = 0
         
         # Liquidity metrics
-        metrics['current_ratio'] = float(latest.current_ratio or 0)
+        current_ratio = latest.current_ratio or 0.0
         
         # Estimate quick ratio (assuming 60% of current assets are quick assets)
         if latest.current_ratio:
-            metrics['quick_ratio'] = float(latest.current_ratio) * 0.6
+            quick_ratio = latest.current_ratio * 0.6
         else:
-            metrics['quick_ratio'] = 0
+            quick_ratio = 0
         
         # Leverage metrics
-        metrics['debt_to_equity'] = float(latest.debt_to_equity or 0)
+        debt_to_equity = latest.debt_to_equity or 0.0
         
         # Growth metrics
-        if len(summaries) > 1:
-            revenues = [float(s.revenue or 0) for s in reversed(summaries)]
-            if revenues[0] > 0:
-                growth_rate = (revenues[-1] / revenues[0]) ** (1/(len(revenues)-1)) - 1
-                metrics['revenue_growth_rate'] = growth_rate
+        # Summaries are ordered newest first, so only the two endpoints are needed
+        periods = len(summaries) - 1
+        if periods > 0:
+            newest_revenue = summaries[0].revenue or 0.0
+            oldest_revenue = summaries[-1].revenue or 0.0
+            if oldest_revenue > 0 and newest_revenue > 0:
+                # expm1/log form stays accurate for growth rates close to zero
+                revenue_growth_rate = math.expm1(math.log(newest_revenue / oldest_revenue) / periods)
+            elif oldest_revenue > 0:
+                revenue_growth_rate = -1.0
             else:
-                metrics['revenue_growth_rate'] = 0
+                revenue_growth_rate = 0
         else:
-            metrics['revenue_growth_rate'] = 0
+            revenue_growth_rate = 0
         
         # Cash conversion cycle (simplified calculation - skip if insufficient data)
         # Note: This requires receivables, inventory, and payables which aren't in MonthlySummary
         # Setting to 0 for now, can be enhanced with additional data sources
-        metrics['cash_conversion_cycle'] = 0
+        cash_conversion_cycle = 0
         
-        return metrics
+        return (net_profit_margin, gross_margin, current_ratio, debt_to_equity,
+                revenue_growth_rate, operating_margin, quick_ratio, cash_conversion_cycle)
+    
+    def _build_results(self, latest: Row, summaries: List[Row],
+                       industry_benchmarks: Dict) -> Tuple[Dict[str, float], Dict[str, MetricResult]]:
+        """Calculate company metrics and score them against benchmarks in one pass"""
+        values = self._company_metric_values(latest, summaries)
+        benchmark_results = self._score_metrics(_METRIC_NAMES, values, industry_benchmarks)
+        return dict(zip(_METRIC_NAMES, values)), benchmark_results
     
     def _get_industry_benchmarks(self, db: Session, industry_type: str) -> Dict[str, Dict]:
         """Get industry benchmarks from database or use defaults"""
+        loaded_at, cached = self._benchmark_cache.get(industry_type, (0.0, None))
+        if cached is not None and time.monotonic() - loaded_at < self.BENCHMARK_CACHE_TTL:
+            return cached
+        
         benchmarks = {}
         
         # Try to get from database first
-        stored_benchmarks = db.query(IndustryBenchmarks).filter(
+        stored_benchmarks = db.query(
+            IndustryBenchmarks.metric_name,
+            cast(IndustryBenchmarks.industry_avg, Float).label('industry_avg'),
+            cast(IndustryBenchmarks.top_quartile, Float).label('top_quartile'),
+            cast(IndustryBenchmarks.bottom_quartile, Float).label('bottom_quartile'),
+            IndustryBenchmarks.percentile_distribution
+        ).filter(
             IndustryBenchmarks.industry_type == industry_type
         ).all()
         
         if stored_benchmarks:
             for benchmark in stored_benchmarks:
-                benchmarks[benchmark.metric_name] = {
-                    'industry_avg': float(benchmark.industry_avg or 0),
-                    'top_quartile': float(benchmark.top_quartile or 0),
-                    'bottom_quartile': float(benchmark.bottom_quartile or 0),
+                benchmarks[benchmark.metric_name] = _attach_reciprocals({
+                    'industry_avg': benchmark.industry_avg or 0.0,
+                    'top_quartile': benchmark.top_quartile or 0.0,
+                    'bottom_quartile': benchmark.bottom_quartile or 0.0,
                     'percentile_distribution': benchmark.percentile_distribution or []
-                }
+                })
         else:
             # Use default benchmarks if not stored
             benchmarks = self._get_default_benchmarks(industry_type)
         
+        self._benchmark_cache[industry_type] = (time.monotonic(), benchmarks)
         return benchmarks
     
     def _get_default_benchmarks(self, industry_type: str) -> Dict[str, Dict]:
         """Get default industry benchmarks"""
-        defaults = {
-            'Retail': {
-                'net_profit_margin': {'industry_avg': 0.03, 'top_quartile': 0.06, 'bottom_quartile': 0.01},
-                'gross_margin': {'industry_avg': 0.35, 'top_quartile': 0.45, 'bottom_quartile': 0.25},
-                'current_ratio': {'industry_avg': 1.5, 'top_quartile': 2.0, 'bottom_quartile': 1.0},
-                'debt_to_equity': {'industry_avg': 1.2, 'top_quartile': 0.8, 'bottom_quartile': 2.0},
-                'revenue_growth_rate': {'industry_avg': 0.08, 'top_quartile': 0.15, 'bottom_quartile': 0.02},
-                'operating_margin': {'industry_avg': 0.06, 'top_quartile': 0.10, 'bottom_quartile': 0.03},
-                'quick_ratio': {'industry_avg': 0.8, 'top_quartile': 1.2, 'bottom_quartile': 0.5},
-                'cash_conversion_cycle': {'industry_avg': 45, 'top_quartile': 30, 'bottom_quartile': 60}
-            },
-            'Manufacturing': {
-                'net_profit_margin': {'industry_avg': 0.05, 'top_quartile': 0.08, 'bottom_quartile': 0.02},
-                'gross_margin': {'industry_avg': 0.30, 'top_quartile': 0.40, 'bottom_quartile': 0.20},
-                'current_ratio': {'industry_avg': 1.8, 'top_quartile': 2.5, 'bottom_quartile': 1.2},
-                'debt_to_equity': {'industry_avg': 1.5, 'top_quartile': 1.0, 'bottom_quartile': 2.5},
-                'revenue_growth_rate': {'industry_avg': 0.06, 'top_quartile': 0.12, 'bottom_quartile': 0.01},
-                'operating_margin': {'industry_avg': 0.10, 'top_quartile': 0.15, 'bottom_quartile': 0.05},
-                'quick_ratio': {'industry_avg': 1.0, 'top_quartile': 1.5, 'bottom_quartile': 0.7},
-                'cash_conversion_cycle': {'industry_avg': 60, 'top_quartile': 45, 'bottom_quartile': 90}
-            },
-            'Services': {
-                'net_profit_margin': {'industry_avg': 0.12, 'top_quartile': 0.18, 'bottom_quartile': 0.06},
-                'gross_margin': {'industry_avg': 0.55, 'top_quartile': 0.65, 'bottom_quartile': 0.45},
-                'current_ratio': {'industry_avg': 1.6, 'top_quartile': 2.2, 'bottom_quartile': 1.1},
-                'debt_to_equity': {'industry_avg': 0.8, 'top_quartile': 0.5, 'bottom_quartile': 1.5},
-                'revenue_growth_rate': {'industry_avg': 0.10, 'top_quartile': 0.20, 'bottom_quartile': 0.03},
-                'operating_margin': {'industry_avg': 0.15, 'top_quartile': 0.22, 'bottom_quartile': 0.08},
-                'quick_ratio': {'industry_avg': 1.2, 'top_quartile': 1.8, 'bottom_quartile': 0.8},
-                'cash_conversion_cycle': {'industry_avg': 30, 'top_quartile': 20, 'bottom_quartile': 45}
-            },
-            'Technology': {
-                'net_profit_margin': {'industry_avg': 0.15, 'top_quartile': 0.25, 'bottom_quartile': 0.08},
-                'gross_margin': {'industry_avg': 0.65, 'top_quartile': 0.75, 'bottom_quartile': 0.55},
-                'current_ratio': {'industry_avg': 2.0, 'top_quartile': 3.0, 'bottom_quartile': 1.3},
-                'debt_to_equity': {'industry_avg': 0.6, 'top_quartile': 0.3, 'bottom_quartile': 1.2},
-                'revenue_growth_rate': {'industry_avg': 0.25, 'top_quartile': 0.40, 'bottom_quartile': 0.10},
-                'operating_margin': {'industry_avg': 0.20, 'top_quartile': 0.30, 'bottom_quartile': 0.10},
-                'quick_ratio': {'industry_avg': 1.5, 'top_quartile': 2.5, 'bottom_quartile': 1.0},
-                'cash_conversion_cycle': {'industry_avg': 25, 'top_quartile': 15, 'bottom_quartile': 40}
-            },
-            'General': {
-                'net_profit_margin': {'industry_avg': 0.08, 'top_quartile': 0.12, 'bottom_quartile': 0.04},
-                'gross_margin': {'industry_avg': 0.40, 'top_quartile': 0.50, 'bottom_quartile': 0.30},
-                'current_ratio': {'industry_avg': 1.7, 'top_quartile': 2.3, 'bottom_quartile': 1.2},
-                'debt_to_equity': {'industry_avg': 1.0, 'top_quartile': 0.7, 'bottom_quartile': 1.8},
-                'revenue_growth_rate': {'industry_avg': 0.08, 'top_quartile': 0.15, 'bottom_quartile': 0.02},
-                'operating_margin': {'industry_avg': 0.12, 'top_quartile': 0.18, 'bottom_quartile': 0.06},
-                'quick_ratio': {'industry_avg': 1.0, 'top_quartile': 1.5, 'bottom_quartile': 0.7},
-                'cash_conversion_cycle': {'industry_avg': 40, 'top_quartile': 30, 'bottom_quartile': 60}
-            }
+        row = _INDUSTRY_INDEX.get(industry_type, _INDUSTRY_INDEX['General'])
+        return {
+            metric_name: _attach_reciprocals({
+                'industry_avg': float(_DEFAULT_AVG[row, col]),
+                'top_quartile': float(_DEFAULT_TQ[row, col]),
+                'bottom_quartile': float(_DEFAULT_BQ[row, col])
+            })
+            for col, metric_name in enumerate(_METRIC_NAMES)
         }
-        
-        return defaults.get(industry_type, defaults['General'])
     
-    def _compare_with_benchmarks(self, company_metrics: Dict, industry_benchmarks: Dict) -> Dict[str, Dict]:
+    def _compare_with_benchmarks(self, company_metrics: Dict, industry_benchmarks: Dict) -> Dict[str, MetricResult]:
         """Compare company metrics against industry benchmarks"""
+        return self._score_metrics(tuple(company_metrics), tuple(company_metrics.values()), industry_benchmarks)
+    
+    def _score_metrics(self, names: Sequence[str], values: Sequence[float],
+                       industry_benchmarks: Dict) -> Dict[str, MetricResult]:
+        """Score parallel metric names/values against industry benchmarks"""
         results = {}
         
-        for metric_name, company_value in company_metrics.items():
-            if metric_name in industry_benchmarks:
-                benchmark = industry_benchmarks[metric_name]
-                
-                # Calculate percentile rank (simplified)
-                percentile = self._calculate_percentile(company_value, benchmark)
-                
-                # Determine status
-                status = self._determine_status(company_value, benchmark, percentile)
-                
-                # Calculate deviation from industry average
-                deviation = self._calculate_deviation(company_value, benchmark['industry_avg'])
-                
-                results[metric_name] = {
-                    'value': company_value,
-                    'industry_avg': benchmark['industry_avg'],
-                    'percentile': percentile,
-                    'status': status,
-                    'deviation_percent': deviation,
-                    'top_quartile': benchmark['top_quartile'],
-                    'bottom_quartile': benchmark['bottom_quartile']
-                }
+        # Only metrics present on both sides are compared; bail out before packing arrays if none
+        selected = [i for i, name in enumerate(names) if name in industry_benchmarks]
+        if not selected:
+            return results
+        metric_names = [names[i] for i in selected]
+        metric_values = [values[i] for i in selected]
+        
+        # Pack metrics and benchmarks into parallel arrays for a single vectorized pass
+        benchmarks = [industry_benchmarks[name] for name in metric_names]
+        values_arr = np.array(metric_values, dtype=np.float64)
+        avgs = np.array([b['industry_avg'] for b in benchmarks], dtype=np.float64)
+        tqs = np.array([b['top_quartile'] for b in benchmarks], dtype=np.float64)
+        bqs = np.array([b['bottom_quartile'] for b in benchmarks], dtype=np.float64)
+        inv_avgs = np.array([b['_inv_industry_avg'] for b in benchmarks], dtype=np.float64)
+        inv_tqs = np.array([b['_inv_top_quartile'] for b in benchmarks], dtype=np.float64)
+        inv_top_spreads = np.array([b['_inv_top_spread'] for b in benchmarks], dtype=np.float64)
+        inv_bottom_spreads = np.array([b['_inv_bottom_spread'] for b in benchmarks], dtype=np.float64)
+        inv_bqs = np.array([b['_inv_bottom_quartile'] for b in benchmarks], dtype=np.float64)
+        
+        percentiles = _percentile_batch(values_arr, avgs, tqs, bqs, inv_tqs, inv_top_spreads, inv_bottom_spreads, inv_bqs)
+        deviations = _deviation_batch(values_arr, avgs, inv_avgs)
+        status_tiers = np.digitize(percentiles, _STATUS_BREAKS)
+        
+        for i, metric_name in enumerate(metric_names):
+            benchmark = benchmarks[i]
+            percentile = float(percentiles[i])
+            
+            results[metric_name] = MetricResult(
+                value=metric_values[i],
+                industry_avg=benchmark['industry_avg'],
+                percentile=percentile,
+                status=_STATUS_LABELS[status_tiers[i]],
+                deviation_percent=float(deviations[i]),
+                top_quartile=benchmark['top_quartile'],
+                bottom_quartile=benchmark['bottom_quartile']
+            )
         
         return results
     
-    def _calculate_percentile(self, value: float, benchmark: Dict) -> float:
-        """Calculate percentile rank for a value"""
-        # Simplified percentile calculation
-        if value >= benchmark['top_quartile']:
-            return 75 + min(25, (value - benchmark['top_quartile']) / benchmark['top_quartile'] * 25)
-        elif value >= benchmark['industry_avg']:
-            return 50 + ((value - benchmark['industry_avg']) / (benchmark['top_quartile'] - benchmark['industry_avg'])) * 25
-        elif value >= benchmark['bottom_quartile']:
-            return 25 + ((value - benchmark['bottom_quartile']) / (benchmark['industry_avg'] - benchmark['bottom_quartile'])) * 25
-        else:
-            return max(0, (value / benchmark['bottom_quartile']) * 25)
-    
-    def _determine_status(self, value: float, benchmark: Dict, percentile: float) -> str:
-        """Determine performance status"""
-        if percentile >= 75:
-            return 'Top 25%'
-        elif percentile >= 60:
-            return 'Above Average'
-        elif percentile >= 40:
-            return 'Near Average'
-        elif percentile >= 25:
-            return 'Below Average'
-        else:
-            return 'Bottom 25%'
-    
-    def _calculate_deviation(self, value: float, industry_avg: float) -> float:
-        """Calculate percentage deviation from industry average"""
-        if industry_avg == 0:
-            return 0
-        return ((value - industry_avg) / industry_avg) * 100
-    
     def _calculate_overall_summary(self, benchmark_results: Dict) -> Dict:
         """Calculate overall performance summary"""
         if not benchmark_results:
@@ -292,23 +438,16 @@ class BenchmarkAnalyzer:
                 'summary_text': 'No data available'
             }
         
-        percentiles = [result['percentile'] for result in benchmark_results.values()]
-        overall_percentile = sum(percentiles) / len(percentiles)
-        
-        metrics_above_avg = sum(1 for result in benchmark_results.values() if result['percentile'] > 50)
         total_metrics = len(benchmark_results)
+        percentiles = np.fromiter(
+            (result.percentile for result in benchmark_results.values()),
+            dtype=np.float64, count=total_metrics
+        )
+        overall_percentile = float(percentiles.mean())
+        metrics_above_avg = int(np.count_nonzero(percentiles > 50))
         
-        # Generate summary text
-        if overall_percentile >= 75:
-            summary_text = 'Excellent performance - significantly above industry standards'
-        elif overall_percentile >= 60:
-            summary_text = 'Strong performance - above industry average'
-        elif overall_percentile >= 40:
-            summary_text = 'Average performance - near industry standards'
-        elif overall_percentile >= 25:
-            summary_text = 'Below average performance - room for improvement'
-        else:
-            summary_text = 'Poor performance - significantly below industry standards'
+        # Generate summary text from the same tiers as the per-metric status
+        summary_text = _SUMMARY_TEXTS[bisect.bisect_right(_STATUS_BREAKS, overall_percentile)]
         
         return {
             'overall_percentile': overall_percentile,
@@ -320,42 +459,27 @@ class BenchmarkAnalyzer:
     def _store_benchmark_summary(self, company_id: str, db: Session, industry_type: str,
                                 benchmark_results: Dict, overall_summary: Dict):
         """Store benchmark summary in database"""
-        existing = db.query(BenchmarkSummary).filter(
-            BenchmarkSummary.company_id == company_id
-        ).first()
-        
-        if existing:
-            existing.industry_type = industry_type
-            existing.net_profit_margin = benchmark_results.get('net_profit_margin')
-            existing.gross_margin = benchmark_results.get('gross_margin')
-            existing.debt_to_equity = benchmark_results.get('debt_to_equity')
-            existing.current_ratio = benchmark_results.get('current_ratio')
-            existing.quick_ratio = benchmark_results.get('quick_ratio')
-            existing.revenue_growth_rate = benchmark_results.get('revenue_growth_rate')
-            existing.operating_margin = benchmark_results.get('operating_margin')
-            existing.cash_conversion_cycle = benchmark_results.get('cash_conversion_cycle')
-            existing.overall_percentile = overall_summary['overall_percentile']
-            existing.metrics_above_avg = overall_summary['metrics_above_avg']
-            existing.total_metrics = overall_summary['total_metrics']
-            existing.last_updated = func.now()
-        else:
-            new_summary = BenchmarkSummary(
-                company_id=company_id,
-                industry_type=industry_type,
-                net_profit_margin=benchmark_results.get('net_profit_margin'),
-                gross_margin=benchmark_results.get('gross_margin'),
-                debt_to_equity=benchmark_results.get('debt_to_equity'),
-                current_ratio=benchmark_results.get('current_ratio'),
-                quick_ratio=benchmark_results.get('quick_ratio'),
-                revenue_growth_rate=benchmark_results.get('revenue_growth_rate'),
-                operating_margin=benchmark_results.get('operating_margin'),
-                cash_conversion_cycle=benchmark_results.get('cash_conversion_cycle'),
-                overall_percentile=overall_summary['overall_percentile'],
-                metrics_above_avg=overall_summary['metrics_above_avg'],
-                total_metrics=overall_summary['total_metrics']
-            )
-            db.add(new_summary)
+        values = {
+            'industry_type': industry_type,
+            'overall_percentile': overall_summary['overall_percentile'],
+            'metrics_above_avg': overall_summary['metrics_above_avg'],
+            'total_metrics': overall_summary['total_metrics']
+        }
+        for metric_name in self.SUMMARY_METRICS:
+            values[metric_name] = benchmark_results.get(metric_name)
+        values['results_hash'] = hashlib.sha256(
+            json.dumps(values, sort_keys=True, default=float).encode()
+        ).hexdigest()
         
+        # Single-statement upsert keyed on the unique company_id; the row is only
+        # rewritten when the recomputed results differ from what is stored
+        stmt = insert(BenchmarkSummary).values(company_id=company_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BenchmarkSummary.company_id],
+            set_={**{key: stmt.excluded[key] for key in values}, 'last_updated': func.now()},
+            where=BenchmarkSummary.results_hash.is_distinct_from(stmt.excluded.results_hash)
+        )
+        db.execute(stmt)
         db.commit()
     
     def _empty_benchmark_response(self) -> Dict[str, Any]:
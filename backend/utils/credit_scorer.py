@@ -1,8 +1,94 @@
+import bisect
+import json
 import numpy as np
-from typing import Dict, List, Any, Tuple
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Any, Tuple, Optional
+from sqlalchemy import Float, cast, lambda_stmt, select
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from decimal import Decimal
-from models import MonthlySummary, RiskSummary
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import insert
+from models import MonthlySummary, RiskSummary, CreditScoreSummary
+from utils._cache_generation import get_redis
+
+try:
+    import redis
+except ImportError:  # Redis is optional; the in-process cache still works without it
+    redis = None
+
+
+# Score ladders as (ascending thresholds, scores); a value scores the entry for
+# the number of thresholds it reaches (>= on "higher is better" ladders)
+_NET_MARGIN_LADDER = (np.array([-0.05, 0.0, 0.05, 0.10, 0.15]), np.array([0, 50, 100, 140, 170, 200]))
+_CURRENT_RATIO_LADDER = (np.array([0.5, 1.0, 1.5, 2.0]), np.array([0, 40, 70, 85, 100]))
+_QUICK_RATIO_LADDER = (np.array([0.4, 0.7, 1.0, 1.5]), np.array([0, 40, 70, 85, 100]))
+_POSITIVE_CASH_FLOW_LADDER = (np.array([0.2, 0.4, 0.6, 0.8]), np.array([0, 40, 60, 80, 100]))
+_GROWTH_RATE_LADDER = (np.array([-0.05, 0.0, 0.05, 0.10, 0.15, 0.20]), np.array([0, 25, 40, 55, 70, 85, 100]))
+# Debt-to-equity is "lower is better": a value scores by the thresholds it exceeds (<= keeps the band)
+_DEBT_TO_EQUITY_LADDER = (np.array([0.3, 0.7, 1.5, 3.0, 5.0]), np.array([200, 170, 140, 100, 50, 0]))
+
+# Leverage risk levels pre-encoded as integer codes indexing their score adjustment
+_LEVERAGE_RISK_CODES = {'Low': 1, 'High': 2, 'Critical': 3}
+_LEVERAGE_RISK_ADJUSTMENTS = (0, 20, -30, -50)
+
+# Risk flags and their recommendations, in bit order of CreditScorer._risk_flag_mask
+_RISK_FLAGS = (
+    ('Weak Profitability', 'Improve operating margins through cost optimization'),
+    ('Poor Liquidity', 'Enhance liquidity by improving working capital management'),
+    ('High Leverage', 'Reduce debt levels to improve leverage ratios'),
+    ('Cash Flow Issues', 'Strengthen cash flow generation through operational improvements'),
+    ('Low Growth', 'Focus on revenue growth strategies and market expansion'),
+    ('Negative Profitability', 'Address negative profitability immediately through cost reduction'),
+    ('Current Ratio < 1.0', 'Increase current assets or reduce short-term liabilities'),
+    ('Debt to Equity > 3.0', 'Consider equity infusion to reduce leverage')
+)
+
+
+def _scoring_columns() -> Tuple:
+    """Columns read by the credit scorer, with the company's RiskSummary level joined in"""
+    # NUMERIC columns are cast to float in SQL so rows arrive without Decimal values
+    return (
+        MonthlySummary.month,
+        cast(MonthlySummary.revenue, Float).label('revenue'),
+        cast(MonthlySummary.net_income, Float).label('net_income'),
+        cast(MonthlySummary.current_ratio, Float).label('current_ratio'),
+        cast(MonthlySummary.quick_ratio, Float).label('quick_ratio'),
+        cast(MonthlySummary.debt_to_equity, Float).label('debt_to_equity'),
+        cast(MonthlySummary.current_liabilities, Float).label('current_liabilities'),
+        cast(MonthlySummary.operating_cash_flow, Float).label('operating_cash_flow'),
+        cast(MonthlySummary.net_margin, Float).label('net_margin'),
+        RiskSummary.leverage_risk_level
+    )
+
+
+def _ladder_score(ladder: Tuple[np.ndarray, np.ndarray], value: float, side: str = 'right') -> int:
+    """Look up the score band for a value with a single searchsorted"""
+    thresholds, scores = ladder
+    return int(scores[np.searchsorted(thresholds, value, side=side)])
+
+
+def _ladder_scores(ladder: Tuple[np.ndarray, np.ndarray], values: np.ndarray, side: str = 'right') -> np.ndarray:
+    """Vectorized _ladder_score"""
+    thresholds, scores = ladder
+    return scores[np.searchsorted(thresholds, values, side=side)]
+
+
+def _adjust(scores: np.ndarray, reward: np.ndarray, penalize: np.ndarray,
+            bonus: int, penalty: int, cap: int) -> np.ndarray:
+    """Add a bonus (capped) where reward holds, otherwise a penalty (floored at 0) where penalize holds"""
+    return np.where(reward, np.minimum(cap, scores + bonus),
+                    np.where(penalize, np.maximum(0, scores - penalty), scores))
+
+
+def _row_stability(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Per-row CreditScorer._calculate_stability of NaN-padded series with `counts` values each"""
+    present = ~np.isnan(values)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(present, values, 0).sum(axis=1) / counts
+        deviations = np.where(present, values - mean[:, None], 0)
+        std = np.sqrt((deviations * deviations).sum(axis=1) / counts)
+        return np.where((counts < 2) | (mean == 0), 1.0, std / np.abs(mean))
+
 
 class CreditScorer:
     """Deterministic credit scoring engine on 0-900 scale"""
@@ -26,64 +112,312 @@ class CreditScorer:
         (0, 399): 'High Risk'
     }
     
+    # Band lower bounds sorted ascending for bisect lookup in _get_rating
+    _BAND_LADDER = sorted((min_score, rating) for (min_score, _), rating in RATING_BANDS.items())
+    _BAND_MINS = tuple(min_score for min_score, _ in _BAND_LADDER)
+    _BAND_NAMES = tuple(rating for _, rating in _BAND_LADDER)
+    
+    # Scores cached per company together with the latest month they were computed from,
+    # the monthly window rows they were scored on (when scored in this process) and the
+    # company's cache generation. With Redis the generation is a shared counter bumped by
+    # every invalidation, so entries held by other worker processes stop matching too
+    SCORE_CACHE_SIZE = 1024
+    SCORE_CACHE_TTL = 24 * 60 * 60  # Redis expiry in seconds
+    _score_cache: "OrderedDict[str, Tuple[str, Dict[str, Any], Optional[List[Row]], int]]" = OrderedDict()
+    
+    @classmethod
+    def invalidate_cache(cls, company_id: str, months: Optional[Iterable[str]] = None):
+        """Drop the cached score for a company after its monthly data changes"""
+        cache_key = str(company_id)
+        
+        # Months appended after the cached window keep it valid; the next score only
+        # fetches the new months and rolls the window forward
+        entry = cls._score_cache.get(cache_key)
+        months = list(months or ())
+        if months and entry is not None and entry[2] is not None and min(months) > entry[0]:
+            return
+        
+        cls._score_cache.pop(cache_key, None)
+        client = get_redis()
+        if client is not None:
+            try:
+                pipeline = client.pipeline()
+                pipeline.incr(f"credit_score_gen:{cache_key}")
+                pipeline.delete(f"credit_score:{cache_key}")
+                pipeline.execute()
+            except redis.RedisError:
+                pass
+    
     def calculate_credit_score(self, company_id: str, db: Session) -> Dict[str, Any]:
-        """Calculate comprehensive credit score"""
-        
-        # Get latest financial and risk data
-        latest_summary = db.query(MonthlySummary).filter(
+        """Calculate comprehensive credit score, reusing the cached result for the latest month"""
+        latest_month = db.execute(lambda_stmt(lambda: select(func.max(MonthlySummary.month)).where(
             MonthlySummary.company_id == company_id
-        ).order_by(MonthlySummary.month.desc()).first()
+        ))).scalar()
+        if latest_month is None:
+            return self._empty_credit_response()
+        
+        cache_key = str(company_id)
+        cached, generation = self._get_cached_score(cache_key, latest_month)
+        if cached is not None:
+            return cached
         
-        risk_summary = db.query(RiskSummary).filter(
-            RiskSummary.company_id == company_id
-        ).first()
+        entry = self._score_cache.get(cache_key)
+        if (entry is not None and entry[2] is not None and generation is not None
+                and entry[3] == generation and entry[0] < latest_month):
+            # Only months newer than the cached window changed: load just those
+            summaries = (self._load_window(company_id, db, since=entry[0]) + entry[2])[:12]
+        else:
+            summaries = self._load_window(company_id, db)
         
-        if not latest_summary or len(db.query(MonthlySummary).filter(
+        result = self._score_summaries(summaries)
+        self._set_cached_score(cache_key, latest_month, result, summaries, generation)
+        return result
+    
+    def _get_cached_score(self, cache_key: str, latest_month: str) -> Tuple[Optional[Dict[str, Any]], Optional[int]]:
+        """Look up a cached score computed from the given latest month, with the company's cache generation
+        
+        The generation is 0 without Redis and None when Redis is configured but unreachable,
+        in which case nothing cached is trusted.
+        """
+        client = get_redis()
+        payload = None
+        if client is None:
+            generation = 0
+        else:
+            try:
+                generation_value, payload = client.mget(f"credit_score_gen:{cache_key}", f"credit_score:{cache_key}")
+            except redis.RedisError:
+                return None, None
+            generation = int(generation_value or 0)
+        
+        entry = self._score_cache.get(cache_key)
+        if entry is not None and entry[0] == latest_month and entry[3] == generation:
+            self._score_cache.move_to_end(cache_key)
+            return entry[1], generation
+        
+        if payload:
+            cached = json.loads(payload)
+            # Payloads are [latest month, generation, result]
+            if len(cached) == 3 and cached[0] == latest_month and cached[1] == generation:
+                self._remember_score(cache_key, latest_month, cached[2], generation)
+                return cached[2], generation
+        return None, generation
+    
+    def _set_cached_score(self, cache_key: str, latest_month: str, result: Dict[str, Any],
+                          summaries: List[Row], generation: Optional[int]):
+        """Store a freshly computed score in the in-process cache and Redis"""
+        if generation is None:
+            return
+        self._remember_score(cache_key, latest_month, result, generation, summaries)
+        client = get_redis()
+        if client is not None:
+            try:
+                client.setex(f"credit_score:{cache_key}", self.SCORE_CACHE_TTL,
+                             json.dumps([latest_month, generation, result]))
+            except redis.RedisError:
+                pass
+    
+    @classmethod
+    def _remember_score(cls, cache_key: str, latest_month: str, result: Dict[str, Any], generation: int,
+                        summaries: Optional[List[Row]] = None):
+        """Insert into the bounded in-process LRU"""
+        cls._score_cache[cache_key] = (latest_month, result, summaries, generation)
+        cls._score_cache.move_to_end(cache_key)
+        while len(cls._score_cache) > cls.SCORE_CACHE_SIZE:
+            cls._score_cache.popitem(last=False)
+    
+    def _load_window(self, company_id: str, db: Session, since: Optional[str] = None) -> List[Row]:
+        """Load up to 12 monthly rows for trend analysis (newest first), optionally only after `since`"""
+        # Built as a lambda statement so the compiled SQL is cached across calls
+        stmt = lambda_stmt(lambda: select(*_scoring_columns()).outerjoin(
+            RiskSummary, RiskSummary.company_id == MonthlySummary.company_id
+        ).where(
             MonthlySummary.company_id == company_id
-        ).all()) < 2:
+        ))
+        if since is not None:
+            stmt += lambda s: s.where(MonthlySummary.month > since)
+        stmt += lambda s: s.order_by(MonthlySummary.month.desc()).limit(12)
+        return db.execute(stmt).all()
+    
+    def calculate_credit_scores(self, company_ids: List[str], db: Session) -> Dict[str, Dict[str, Any]]:
+        """Calculate credit scores for several companies with a single window query and one vectorized scoring pass"""
+        if not company_ids:
+            return {}
+        
+        # Number each company's months newest first and keep the 12-month windows
+        ranked = select(
+            *_scoring_columns(),
+            MonthlySummary.company_id,
+            func.row_number().over(
+                partition_by=MonthlySummary.company_id,
+                order_by=MonthlySummary.month.desc()
+            ).label('month_rank')
+        ).outerjoin(
+            RiskSummary, RiskSummary.company_id == MonthlySummary.company_id
+        ).where(
+            MonthlySummary.company_id.in_(company_ids)
+        ).subquery()
+        rows = db.execute(
+            select(ranked).where(ranked.c.month_rank <= 12).order_by(ranked.c.company_id, ranked.c.month_rank)
+        ).all()
+        
+        windows = defaultdict(list)
+        for row in rows:
+            windows[str(row.company_id)].append(row)
+        
+        results = {}
+        pending = []
+        for company_id in company_ids:
+            cache_key = str(company_id)
+            summaries = windows.get(cache_key)
+            if not summaries or len(summaries) < 2:
+                results[company_id] = self._empty_credit_response()
+                continue
+            
+            # The window head is the latest month, so cached scores can be reused without a probe query
+            result, generation = self._get_cached_score(cache_key, summaries[0].month)
+            results[company_id] = result  # Misses are filled in below, keeping the callers' order
+            if result is None:
+                pending.append((company_id, summaries, generation))
+        
+        scored = self._score_windows([summaries for _, summaries, _ in pending])
+        for (company_id, summaries, generation), result in zip(pending, scored):
+            results[company_id] = result
+            self._set_cached_score(str(company_id), summaries[0].month, result, summaries, generation)
+        
+        return results
+    
+    def _score_windows(self, windows: List[List[Row]]) -> List[Dict[str, Any]]:
+        """Score several monthly windows (each newest first, at least 2 months) in one vectorized pass
+        
+        Windows are left-aligned in NaN-padded (companies, months) matrices with a lengths vector,
+        so each component ladder is one searchsorted over every company.
+        """
+        n = len(windows)
+        if not n:
+            return []
+        
+        lengths = np.fromiter(map(len, windows), dtype=np.int64, count=n)
+        width = int(lengths.max())
+        revenues, net_incomes, cash_flows = (np.full((n, width), np.nan) for _ in range(3))
+        for i, window in enumerate(windows):
+            months = len(window)
+            revenues[i, :months] = [s.revenue or 0.0 for s in window]
+            net_incomes[i, :months] = [s.net_income or 0.0 for s in window]
+            cash_flows[i, :months] = [s.operating_cash_flow or 0.0 for s in window]
+        present = ~np.isnan(revenues)
+        latest = [window[0] for window in windows]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Trend statistics shared by the component scores and component_details. Like
+            # _calculate_growth_rate this compares the oldest month against the latest one
+            cash_flow_stability = _row_stability(cash_flows, lengths)
+            first, last = revenues[:, 0], revenues[np.arange(n), lengths - 1]
+            ratio = last / first
+            revenue_growth_rate = np.where(first == 0, 0.0, np.power(ratio, 1 / (lengths - 1)) - 1)
+            
+            # Profitability: stored net margin (derived when missing), adjusted by margin volatility
+            net_margin = np.array([np.nan if s.net_margin is None else s.net_margin for s in latest])
+            net_margin = np.where(np.isnan(net_margin), np.where(first > 0, net_incomes[:, 0] / first, -1), net_margin)
+            has_revenue = present & (revenues > 0)
+            margin_counts = has_revenue.sum(axis=1)
+            margin_volatility = _row_stability(np.where(has_revenue, net_incomes / revenues, np.nan), margin_counts)
+            profitability = _ladder_scores(_NET_MARGIN_LADDER, net_margin)
+            profitability = np.where(margin_counts > 1, _adjust(profitability, margin_volatility < 0.3,
+                                                                margin_volatility > 0.7, 20, 30, 200), profitability)
+        
+        # Liquidity: mean of the current and quick ratio ladders, zero without either ratio
+        current_ratio = np.array([s.current_ratio or 0.0 for s in latest])
+        quick_ratio = np.array([self._quick_ratio(s) for s in latest])
+        no_ratios = np.array([s.current_ratio is None and s.quick_ratio is None for s in latest])
+        liquidity = np.where(no_ratios, 0.0, (_ladder_scores(_CURRENT_RATIO_LADDER, current_ratio)
+                                              + _ladder_scores(_QUICK_RATIO_LADDER, quick_ratio)) / 2 * 2)
+        
+        # Leverage: debt-to-equity ladder shifted by the RiskSummary level
+        debt_to_equity = np.array([s.debt_to_equity or 0.0 for s in latest])
+        risk_adjustments = np.array([_LEVERAGE_RISK_ADJUSTMENTS[_LEVERAGE_RISK_CODES.get(s.leverage_risk_level, 0)]
+                                     for s in latest])
+        leverage = np.clip(_ladder_scores(_DEBT_TO_EQUITY_LADDER, debt_to_equity, side='left') + risk_adjustments, 0, 200)
+        
+        # Cash flow: share of positive months, adjusted by stability and by the share of non-falling steps
+        cash_flow = _ladder_scores(_POSITIVE_CASH_FLOW_LADDER, (cash_flows > 0).sum(axis=1) / lengths)
+        cash_flow = _adjust(cash_flow, cash_flow_stability < 0.3, cash_flow_stability > 0.7, 20, 30, 100)
+        trend_ratio = (np.diff(cash_flows, axis=1) >= 0).sum(axis=1) / (lengths - 1)
+        revenue_rises = (np.diff(revenues, axis=1) > 0).sum(axis=1) / (lengths - 1)
+        cash_flow = _adjust(cash_flow, trend_ratio >= 0.7, trend_ratio <= 0.3, 20, 20, 100) * 2
+        
+        # Growth: growth-rate ladder, adjusted by growth consistency from three months on
+        growth = _ladder_scores(_GROWTH_RATE_LADDER, revenue_growth_rate)
+        growth = np.where(lengths > 2, _adjust(growth, revenue_rises >= 0.8, revenue_rises <= 0.4, 10, 15, 100), growth)
+        
+        # Repayment capacity against 10% of current liabilities as annual debt service
+        latest_net_income = np.array([s.net_income or 0.0 for s in latest])
+        debt_service = np.array([s.current_liabilities or 0.0 for s in latest]) * 0.1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            repayment_capacity = np.where(debt_service == 0, (latest_net_income > 0).astype(np.float64),
+                                          latest_net_income / debt_service)
+        
+        total = profitability + liquidity + leverage + cash_flow + growth
+        # A sign change over three or more months makes the compound growth rate complex;
+        # those windows keep the single-company path so their results stay identical
+        complex_growth = ((first != 0) & (ratio < 0) & (lengths > 2)).tolist()
+        
+        results = []
+        for i, row in enumerate(zip(profitability.tolist(), liquidity.tolist(), leverage.tolist(),
+                                    cash_flow.tolist(), growth.tolist(), repayment_capacity.tolist(),
+                                    total.tolist(), cash_flow_stability.tolist(), revenue_growth_rate.tolist())):
+            if complex_growth[i]:
+                results.append(self._score_summaries(windows[i]))
+            else:
+                results.append(self._credit_result(latest[i], *row))
+        return results
+    
+    def _score_summaries(self, summaries: List[Row]) -> Dict[str, Any]:
+        """Score a company's monthly window (newest first)"""
+        if len(summaries) < 2:
             return self._empty_credit_response()
         
-        # Get historical data for trend analysis
-        summaries = db.query(MonthlySummary).filter(
-            MonthlySummary.company_id == company_id
-        ).order_by(MonthlySummary.month.desc()).limit(12).all()
+        # Latest financial data is the head of the window
+        latest_summary = summaries[0]
         
-        # Calculate component scores
-        profitability_score = self._calculate_profitability_score(latest_summary, summaries)
-        liquidity_score = self._calculate_liquidity_score(latest_summary)
-        leverage_score = self._calculate_leverage_score(latest_summary, risk_summary)
-        cash_flow_score = self._calculate_cash_flow_score(summaries)
-        growth_score = self._calculate_growth_score(summaries)
+        # Convert the trend columns to float arrays once for all component scorers
+        months = len(summaries)
+        revenues = np.fromiter((s.revenue or 0.0 for s in summaries), dtype=np.float64, count=months)
+        net_incomes = np.fromiter((s.net_income or 0.0 for s in summaries), dtype=np.float64, count=months)
+        cash_flows = np.fromiter((s.operating_cash_flow or 0.0 for s in summaries), dtype=np.float64, count=months)
         
-        # Aggregate to total score (0-900)
-        total_score = (
-            profitability_score + 
-            liquidity_score + 
-            leverage_score + 
-            cash_flow_score + 
-            growth_score
-        )
+        # Trend statistics shared by the component scorers and component_details
+        cash_flow_stability = self._calculate_stability(cash_flows)
+        revenue_growth_rate = self._calculate_growth_rate(revenues)
         
+        # Numeric scoring runs in one pass; only the string outputs are built by _credit_result
+        leverage_risk_code = _LEVERAGE_RISK_CODES.get(latest_summary.leverage_risk_level, 0)
+        scores = self._score_kernel(
+            latest_summary, revenues, net_incomes, cash_flows,
+            cash_flow_stability, revenue_growth_rate, leverage_risk_code
+        )
+        return self._credit_result(latest_summary, *scores, cash_flow_stability, revenue_growth_rate)
+    
+    def _credit_result(self, latest_summary: Row, profitability_score: float, liquidity_score: float,
+                       leverage_score: float, cash_flow_score: float, growth_score: float,
+                       repayment_capacity: float, total_score: float, cash_flow_stability: float,
+                       revenue_growth_rate: float) -> Dict[str, Any]:
+        """Build the response for one company from its numeric scores"""
         # Determine rating
         credit_rating = self._get_rating(total_score)
         
-        # Calculate repayment capacity
-        repayment_capacity = self._calculate_repayment_capacity(latest_summary)
-        
         # Determine loan eligibility
         eligibility_status = self._determine_eligibility(total_score, repayment_capacity)
         
         # Generate risk flags
-        risk_flags = self._generate_risk_flags(
+        flag_mask = self._risk_flag_mask(
             profitability_score, liquidity_score, leverage_score, 
             cash_flow_score, growth_score, latest_summary
         )
+        risk_flags = self._generate_risk_flags(flag_mask)
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(
-            profitability_score, liquidity_score, leverage_score,
-            cash_flow_score, growth_score, risk_flags
-        )
+        recommendations = self._generate_recommendations(flag_mask)
         
         return {
             'credit_score': round(total_score, 2),
@@ -99,44 +433,88 @@ class CreditScorer:
             'loan_eligibility_status': eligibility_status,
             'risk_flags': risk_flags,
             'component_details': {
-                'net_margin': float(latest_summary.net_margin) if latest_summary.net_margin else None,
-                'current_ratio': float(latest_summary.current_ratio) if latest_summary.current_ratio else None,
-                'quick_ratio': float(latest_summary.current_ratio * Decimal('0.6')) if latest_summary.current_ratio else None,
-                'debt_to_equity': float(latest_summary.debt_to_equity) if latest_summary.debt_to_equity else None,
-                'cash_flow_stability': self._calculate_stability([s.operating_cash_flow for s in summaries]),
-                'revenue_growth_rate': self._calculate_growth_rate([s.revenue for s in summaries])
+                'net_margin': latest_summary.net_margin or None,
+                'current_ratio': latest_summary.current_ratio or None,
+                'quick_ratio': self._quick_ratio(latest_summary) or None,
+                'debt_to_equity': latest_summary.debt_to_equity or None,
+                'cash_flow_stability': cash_flow_stability,
+                'revenue_growth_rate': revenue_growth_rate
             },
             'improvement_recommendations': recommendations
         }
     
-    def _calculate_profitability_score(self, latest: MonthlySummary, summaries: List) -> float:
+    def store_credit_summary(self, company_id: str, db: Session, credit_data: Dict[str, Any]):
+        """Refresh the company's precomputed CreditScoreSummary row"""
+        component_scores = credit_data['component_scores']
+        component_details = credit_data['component_details']
+        values = {
+            'credit_score': credit_data['credit_score'],
+            'credit_rating': credit_data['credit_rating'],
+            'profitability_score': component_scores['profitability'],
+            'liquidity_score': component_scores['liquidity'],
+            'leverage_score': component_scores['leverage'],
+            'cash_flow_score': component_scores['cash_flow'],
+            'growth_score': component_scores['growth'],
+            'repayment_capacity_ratio': credit_data['repayment_capacity_ratio'],
+            'loan_eligibility_status': credit_data['loan_eligibility_status'],
+            'risk_flags': credit_data['risk_flags'],
+            'net_margin': component_details['net_margin'],
+            'current_ratio': component_details['current_ratio'],
+            'quick_ratio': component_details['quick_ratio'],
+            'debt_to_equity': component_details['debt_to_equity'],
+            'cash_flow_stability': component_details['cash_flow_stability'],
+            'revenue_growth_rate': component_details['revenue_growth_rate'],
+            'improvement_recommendations': credit_data['improvement_recommendations']
+        }
+        
+        # Single-statement upsert keyed on the unique company_id
+        stmt = insert(CreditScoreSummary).values(company_id=company_id, **values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CreditScoreSummary.company_id],
+            set_={**{key: stmt.excluded[key] for key in values}, 'last_updated': func.now()}
+        )
+        db.execute(stmt)
+        db.commit()
+    
+    def _score_kernel(self, latest: Row, revenues: np.ndarray, net_incomes: np.ndarray,
+                      cash_flows: np.ndarray, cash_flow_stability: float, revenue_growth_rate: float,
+                      leverage_risk_code: int) -> Tuple[float, ...]:
+        """Compute component scores, repayment capacity and total score (0-900)"""
+        profitability_score = self._calculate_profitability_score(latest.net_margin, revenues, net_incomes)
+        liquidity_score = self._calculate_liquidity_score(latest)
+        leverage_score = self._calculate_leverage_score(latest, leverage_risk_code)
+        cash_flow_score = self._calculate_cash_flow_score(cash_flows, cash_flow_stability)
+        growth_score = self._calculate_growth_score(revenues, revenue_growth_rate)
+        repayment_capacity = self._calculate_repayment_capacity(latest)
+        
+        # Aggregate to total score (0-900)
+        total_score = (
+            profitability_score + 
+            liquidity_score + 
+            leverage_score + 
+            cash_flow_score + 
+            growth_score
+        )
+        
+        return (profitability_score, liquidity_score, leverage_score, cash_flow_score,
+                growth_score, repayment_capacity, total_score)
+    
+    def _calculate_profitability_score(self, net_margin: Optional[float], revenues: np.ndarray,
+                                       net_incomes: np.ndarray) -> float:
         """Calculate profitability score (max 200 points)"""
-        net_income = float(latest.net_income or 0)
-        revenue = float(latest.revenue or 0)
-        net_margin = net_income / revenue if revenue > 0 else -1
+        # Use the margin stored at ingest; only derive it when the row has none.
+        # The arrays are newest first, so index 0 is the latest month
+        if net_margin is None:
+            revenue = float(revenues[0])
+            net_margin = float(net_incomes[0]) / revenue if revenue > 0 else -1
         
         # Base score from margin
-        if net_margin >= 0.15:
-            base_score = 200
-        elif net_margin >= 0.10:
-            base_score = 170
-        elif net_margin >= 0.05:
-            base_score = 140
-        elif net_margin >= 0:
-            base_score = 100
-        elif net_margin >= -0.05:
-            base_score = 50
-        else:
-            base_score = 0
+        base_score = _ladder_score(_NET_MARGIN_LADDER, net_margin)
         
         # Adjust for consistency
-        if len(summaries) > 1:
-            margins = []
-            for s in summaries:
-                rev = float(s.revenue or 0)
-                inc = float(s.net_income or 0)
-                if rev > 0:
-                    margins.append(inc / rev)
+        if len(revenues) > 1:
+            has_revenue = revenues > 0
+            margins = net_incomes[has_revenue] / revenues[has_revenue]
             
             if len(margins) > 1:
                 margin_volatility = self._calculate_stability(margins)
@@ -147,91 +525,53 @@ class CreditScorer:
         
         return base_score
     
-    def _calculate_liquidity_score(self, latest: MonthlySummary) -> float:
+    def _calculate_liquidity_score(self, latest: Row) -> float:
         """Calculate liquidity score (max 200 points)"""
-        current_ratio = float(latest.current_ratio or 0)
-        quick_ratio = current_ratio * 0.6 if current_ratio > 0 else 0
+        # Without either ratio both ladders score zero
+        if latest.current_ratio is None and latest.quick_ratio is None:
+            return 0.0
+        
+        current_ratio = latest.current_ratio or 0.0
+        quick_ratio = self._quick_ratio(latest)
         
         # Score based on current ratio
-        if current_ratio >= 2.0:
-            current_score = 100
-        elif current_ratio >= 1.5:
-            current_score = 85
-        elif current_ratio >= 1.0:
-            current_score = 70
-        elif current_ratio >= 0.5:
-            current_score = 40
-        else:
-            current_score = 0
+        current_score = _ladder_score(_CURRENT_RATIO_LADDER, current_ratio)
         
         # Score based on quick ratio
-        if quick_ratio >= 1.5:
-            quick_score = 100
-        elif quick_ratio >= 1.0:
-            quick_score = 85
-        elif quick_ratio >= 0.7:
-            quick_score = 70
-        elif quick_ratio >= 0.4:
-            quick_score = 40
-        else:
-            quick_score = 0
+        quick_score = _ladder_score(_QUICK_RATIO_LADDER, quick_ratio)
         
         return (current_score + quick_score) / 2 * 2  # Scale to max 200
     
-    def _calculate_leverage_score(self, latest: MonthlySummary, risk_summary: RiskSummary) -> float:
+    def _quick_ratio(self, latest: Row) -> float:
+        """Quick ratio stored at ingest, estimated for rows ingested before it was stored"""
+        if latest.quick_ratio is not None:
+            return latest.quick_ratio
+        # Legacy estimate (assumes 60% of current assets are quick assets); current_ratio is
+        # NUMERIC(8, 4), so rounding to 5 places keeps the Decimal-exact product
+        return round(latest.current_ratio * 0.6, 5) if latest.current_ratio else 0.0
+    
+    def _calculate_leverage_score(self, latest: Row, leverage_risk_code: int) -> float:
         """Calculate leverage score (max 200 points)"""
-        debt_to_equity = float(latest.debt_to_equity or 0)
+        debt_to_equity = latest.debt_to_equity or 0.0
         
         # Base score from debt-to-equity
-        if debt_to_equity <= 0.3:
-            base_score = 200
-        elif debt_to_equity <= 0.7:
-            base_score = 170
-        elif debt_to_equity <= 1.5:
-            base_score = 140
-        elif debt_to_equity <= 3.0:
-            base_score = 100
-        elif debt_to_equity <= 5.0:
-            base_score = 50
-        else:
-            base_score = 0
-        
-        # Adjust for risk level if available
-        if risk_summary and risk_summary.leverage_risk_level:
-            if risk_summary.leverage_risk_level == 'Critical':
-                base_score = max(0, base_score - 50)
-            elif risk_summary.leverage_risk_level == 'High':
-                base_score = max(0, base_score - 30)
-            elif risk_summary.leverage_risk_level == 'Low':
-                base_score = min(200, base_score + 20)
+        base_score = _ladder_score(_DEBT_TO_EQUITY_LADDER, debt_to_equity, side='left')
         
-        return base_score
+        # Adjust for risk level if available (code 0 means no adjustment)
+        return min(200, max(0, base_score + _LEVERAGE_RISK_ADJUSTMENTS[leverage_risk_code]))
     
-    def _calculate_cash_flow_score(self, summaries: List) -> float:
+    def _calculate_cash_flow_score(self, cash_flows: np.ndarray, stability: float) -> float:
         """Calculate cash flow score (max 200 points)"""
-        cash_flows = [float(s.operating_cash_flow or 0) for s in summaries]
-        
-        if not cash_flows:
+        if not len(cash_flows):
             return 0
         
         # Check for positive cash flows
-        positive_months = sum(1 for cf in cash_flows if cf > 0)
-        positive_ratio = positive_months / len(cash_flows)
+        positive_ratio = np.count_nonzero(cash_flows > 0) / len(cash_flows)
         
         # Base score from positivity
-        if positive_ratio >= 0.8:
-            base_score = 100
-        elif positive_ratio >= 0.6:
-            base_score = 80
-        elif positive_ratio >= 0.4:
-            base_score = 60
-        elif positive_ratio >= 0.2:
-            base_score = 40
-        else:
-            base_score = 0
+        base_score = _ladder_score(_POSITIVE_CASH_FLOW_LADDER, positive_ratio)
         
         # Adjust for stability
-        stability = self._calculate_stability(cash_flows)
         if stability < 0.3:
             base_score = min(100, base_score + 20)
         elif stability > 0.7:
@@ -239,8 +579,7 @@ class CreditScorer:
         
         # Check for consistency (trend)
         if len(cash_flows) > 1:
-            trend_positive = sum(1 for i in range(1, len(cash_flows)) if cash_flows[i] >= cash_flows[i-1])
-            trend_ratio = trend_positive / (len(cash_flows) - 1)
+            trend_ratio = np.count_nonzero(np.diff(cash_flows) >= 0) / (len(cash_flows) - 1)
             if trend_ratio >= 0.7:
                 base_score = min(100, base_score + 20)
             elif trend_ratio <= 0.3:
@@ -248,30 +587,13 @@ class CreditScorer:
         
         return base_score * 2  # Scale to max 200
     
-    def _calculate_growth_score(self, summaries: List) -> float:
+    def _calculate_growth_score(self, revenues: np.ndarray, growth_rate: float) -> float:
         """Calculate growth score (max 100 points)"""
-        revenues = [float(s.revenue or 0) for s in summaries]
-        
         if len(revenues) < 2:
             return 50  # Neutral score
         
-        growth_rate = self._calculate_growth_rate(revenues)
-        
         # Score based on growth rate
-        if growth_rate >= 0.20:
-            base_score = 100
-        elif growth_rate >= 0.15:
-            base_score = 85
-        elif growth_rate >= 0.10:
-            base_score = 70
-        elif growth_rate >= 0.05:
-            base_score = 55
-        elif growth_rate >= 0:
-            base_score = 40
-        elif growth_rate >= -0.05:
-            base_score = 25
-        else:
-            base_score = 0
+        base_score = _ladder_score(_GROWTH_RATE_LADDER, growth_rate)
         
         # Adjust for consistency
         if len(revenues) > 2:
@@ -283,11 +605,11 @@ class CreditScorer:
         
         return base_score
     
-    def _calculate_repayment_capacity(self, latest: MonthlySummary) -> float:
+    def _calculate_repayment_capacity(self, latest: Row) -> float:
         """Calculate repayment capacity ratio"""
-        net_income = float(latest.net_income or 0)
+        net_income = latest.net_income or 0.0
         # Use current_liabilities as proxy for total debt obligations
-        total_debt = float(latest.current_liabilities or 0)
+        total_debt = latest.current_liabilities or 0.0
         
         # Estimate annual debt service (10% of total debt)
         annual_debt_service = total_debt * 0.1
@@ -306,100 +628,61 @@ class CreditScorer:
         else:
             return 'Not Eligible'
     
-    def _generate_risk_flags(self, profit: float, liquid: float, lever: float, 
-                            cash: float, growth: float, latest: MonthlySummary) -> List[str]:
+    def _risk_flag_mask(self, profit: float, liquid: float, lever: float,
+                        cash: float, growth: float, latest: Row) -> int:
+        """Pack the risk flag conditions into a bitmask indexed like _RISK_FLAGS"""
+        return (
+            (profit < 100)
+            | (liquid < 100) << 1
+            | (lever < 100) << 2
+            | (cash < 100) << 3
+            | (growth < 50) << 4
+            # Specific metric flags
+            | bool(latest.net_income and latest.net_income < 0) << 5
+            | bool(latest.current_ratio and latest.current_ratio < 1.0) << 6
+            | bool(latest.debt_to_equity and latest.debt_to_equity > 3.0) << 7
+        )
+    
+    def _generate_risk_flags(self, flag_mask: int) -> List[str]:
         """Generate risk flags based on component scores"""
-        flags = []
-        
-        if profit < 100:
-            flags.append('Weak Profitability')
-        if liquid < 100:
-            flags.append('Poor Liquidity')
-        if lever < 100:
-            flags.append('High Leverage')
-        if cash < 100:
-            flags.append('Cash Flow Issues')
-        if growth < 50:
-            flags.append('Low Growth')
-        
-        # Specific metric flags
-        if latest.net_income and float(latest.net_income) < 0:
-            flags.append('Negative Profitability')
-        if latest.current_ratio and float(latest.current_ratio) < 1.0:
-            flags.append('Current Ratio < 1.0')
-        if latest.debt_to_equity and float(latest.debt_to_equity) > 3.0:
-            flags.append('Debt to Equity > 3.0')
-        
-        return flags
-    
-    def _generate_recommendations(self, profit: float, liquid: float, lever: float,
-                               cash: float, growth: float, flags: List[str]) -> List[str]:
+        return [flag for bit, (flag, _) in enumerate(_RISK_FLAGS) if flag_mask >> bit & 1]
+    
+    def _generate_recommendations(self, flag_mask: int) -> List[str]:
         """Generate improvement recommendations"""
-        recommendations = []
-        
-        if profit < 100:
-            recommendations.append('Improve operating margins through cost optimization')
-        if liquid < 100:
-            recommendations.append('Enhance liquidity by improving working capital management')
-        if lever < 100:
-            recommendations.append('Reduce debt levels to improve leverage ratios')
-        if cash < 100:
-            recommendations.append('Strengthen cash flow generation through operational improvements')
-        if growth < 50:
-            recommendations.append('Focus on revenue growth strategies and market expansion')
-        
-        # Specific flag-based recommendations
-        if 'Negative Profitability' in flags:
-            recommendations.append('Address negative profitability immediately through cost reduction')
-        if 'Current Ratio < 1.0' in flags:
-            recommendations.append('Increase current assets or reduce short-term liabilities')
-        if 'Debt to Equity > 3.0' in flags:
-            recommendations.append('Consider equity infusion to reduce leverage')
-        
-        return recommendations
+        return [recommendation for bit, (_, recommendation) in enumerate(_RISK_FLAGS) if flag_mask >> bit & 1]
     
     def _get_rating(self, score: float) -> str:
         """Get credit rating based on score"""
-        for (min_score, max_score), rating in self.RATING_BANDS.items():
-            if min_score <= score <= max_score:
-                return rating
-        return 'High Risk'
+        # Each band runs up to the next band's minimum, so fractional scores such as
+        # 799.5 no longer fall between bands
+        band = bisect.bisect_right(self._BAND_MINS, score) - 1
+        return self._BAND_NAMES[band] if band >= 0 else 'High Risk'
     
-    def _calculate_stability(self, values: List[float]) -> float:
+    def _calculate_stability(self, values: np.ndarray) -> float:
         """Calculate coefficient of variation"""
-        if len(values) < 2 or not any(values):
+        if len(values) < 2 or not values.any():
             return 1.0
         
-        values_array = np.array([float(v) for v in values])
-        mean = np.mean(values_array)
+        mean = values.mean()
         if mean == 0:
             return 1.0
         
-        std_dev = np.std(values_array)
-        return std_dev / abs(mean)
+        return float(values.std() / abs(mean))
     
-    def _calculate_growth_rate(self, values: List[float]) -> float:
+    def _calculate_growth_rate(self, values: np.ndarray) -> float:
         """Calculate compound growth rate"""
         if len(values) < 2 or values[0] == 0:
             return 0
         
-        start_value = float(values[0])
-        end_value = float(values[-1])
         periods = len(values) - 1
-        
-        return (end_value / start_value) ** (1/periods) - 1
+        return (float(values[-1]) / float(values[0])) ** (1/periods) - 1
     
-    def _calculate_growth_consistency(self, revenues: List[float]) -> float:
+    def _calculate_growth_consistency(self, revenues: np.ndarray) -> float:
         """Calculate growth consistency (positive growth periods ratio)"""
         if len(revenues) < 2:
             return 0
         
-        positive_growth = 0
-        for i in range(1, len(revenues)):
-            if revenues[i] > revenues[i-1]:
-                positive_growth += 1
-        
-        return positive_growth / (len(revenues) - 1)
+        return np.count_nonzero(np.diff(revenues) > 0) / (len(revenues) - 1)
     
     def _empty_credit_response(self) -> Dict[str, Any]:
         """Return empty response when insufficient data"""
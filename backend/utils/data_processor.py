@@ -1,65 +1,131 @@
 import io
+import logging
 import re
 from PyPDF2 import PdfReader
 from typing import Dict, Tuple, List, Optional
+import numpy as np
 import pandas as pd
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import python_calamine  # noqa: F401
+    _EXCEL_ENGINE = 'calamine'
+except ImportError:
+    _EXCEL_ENGINE = None
+
+try:
+    import pyarrow  # noqa: F401
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = 'c'
+
+logger = logging.getLogger(__name__)
+
+_is_na = pd.isna
+
+# Currency symbols, thousands separators and whitespace stripped from text values
+_STRIP = str.maketrans('', '', '$,₹€£¥ \t\n\r\x0b\x0c\xa0')
+
+# Category substrings mapped to statement fields, checked in order (first match wins)
+_CATEGORY_PATTERNS = [
+    ('revenue', r'revenue|sales|income'),
+    ('other_operating_expense', r'expense|cost|operating'),
+    ('interest_expense', r'loan|debt'),
+    ('tax_expense', r'tax'),
+    ('total_assets', r'asset'),
+    ('current_liabilities', r'liability'),
+    ('accounts_receivable', r'receivable'),
+    ('accounts_payable', r'payable'),
+    ('inventory', r'inventory'),
+]
+
+# Debt-to-equity upper bounds for Low/Moderate/High; anything above (or non-positive equity) is Critical
+_RISK_THRESHOLDS = np.array([0.5, 1.5, 3.0])
+_RISK_LABELS = np.array(['Low', 'Moderate', 'High', 'Critical'], dtype=object)
+
+
+def _classify_risk_batch(debt_to_equity: np.ndarray, equity: np.ndarray) -> np.ndarray:
+    """Map debt-to-equity ratios to int8 risk codes indexing _RISK_LABELS"""
+    codes = np.searchsorted(_RISK_THRESHOLDS, debt_to_equity, side='left').astype(np.int8)
+    codes[equity <= 0] = 3
+    return codes
+
+
 class DataProcessor:
+    _FIELD_MAPPINGS = {
+        # Revenue fields
+        'revenue': ['revenue', 'sales', 'turnover', 'income', 'total revenue', 'Revenue'],
+        'sales_returns': ['sales returns', 'returns', 'sales allowances'],
+        'net_sales': ['net sales', 'net revenue', 'net turnover'],
+        # Cost fields
+        'cost_of_goods_sold': ['cogs', 'cost of goods sold', 'cost of sales', 'COGS'],
+        'gross_profit': ['gross profit', 'gross margin'],
+        # Expense fields
+        'salaries_wages': ['salaries', 'wages', 'salary expenses', 'payroll'],
+        'rent_expense': ['rent', 'rental expense', 'lease expense'],
+        'utilities': ['utilities', 'electricity', 'water', 'gas'],
+        'marketing_expense': ['marketing', 'advertising', 'promotion'],
+        'administrative_expense': ['admin', 'administrative', 'office expenses', 'Operating_Expenses'],
+        'depreciation': ['depreciation', 'amortization'],
+        'other_operating_expense': ['other expenses', 'miscellaneous expenses'],
+        # Profit fields
+        'operating_income': ['operating income', 'ebit', 'operating profit'],
+        'interest_expense': ['interest', 'interest expense', 'finance cost', 'Interest_Expense'],
+        'tax_expense': ['tax', 'income tax', 'tax expense', 'Tax'],
+        'net_income': ['net income', 'net profit', 'profit after tax'],
+        # Balance sheet assets
+        'cash': ['cash', 'cash and equivalents', 'bank balance'],
+        'accounts_receivable': ['accounts receivable', 'ar', 'debtors', 'Accounts_Receivable'],
+        'inventory': ['inventory', 'stock', 'goods in transit', 'Inventory'],
+        'current_assets': ['current assets', 'current total assets', 'Current_Assets'],
+        'fixed_assets': ['fixed assets', 'property plant equipment', 'ppe'],
+        'total_assets': ['total assets', 'assets total', 'Total_Assets'],
+        # Balance sheet liabilities
+        'accounts_payable': ['accounts payable', 'ap', 'creditors', 'Accounts_Payable'],
+        'short_term_debt': ['short term debt', 'current debt', 'short term loans'],
+        'current_liabilities': ['current liabilities', 'current total liabilities', 'Current_Liabilities'],
+        'long_term_debt': ['long term debt', 'long term loans'],
+        'total_liabilities': ['total liabilities', 'liabilities total', 'Total_Liabilities'],
+        'equity': ['equity', 'shareholders equity', 'owners equity'],
+        # Cash flow
+        'operating_cash_flow': ['operating cash flow', 'ocf'],
+        'investing_cash_flow': ['investing cash flow', 'icf'],
+        'financing_cash_flow': ['financing cash flow', 'fcf'],
+        'net_cash_flow': ['net cash flow', 'cash flow change', 'Cash_Flow']
+    }
+    # Reverse index of lowercased keyword -> field, in field priority order
+    _REVERSE = {keyword.lower(): field_name for field_name, keywords in _FIELD_MAPPINGS.items() for keyword in keywords}
+    _FIELD_RANK = {field_name: rank for rank, field_name in enumerate(_FIELD_MAPPINGS)}
+    # Lookahead alternation reports the highest-priority keyword starting at every position
+    _FIELD_MATCH_RE = re.compile('(?=(' + '|'.join(map(re.escape, _REVERSE)) + '))')
+    # Longest keywords first so e.g. "net sales" wins over "sales"
+    _KEYWORD_RE = re.compile(
+        '(' + '|'.join(sorted(map(re.escape, _REVERSE), key=len, reverse=True)) + r')[:\t\r\f\v ]*([\d,]+\.?\d*)',
+        re.IGNORECASE,
+    )
+
     def __init__(self):
-        self.field_mappings = {
-            # Revenue fields
-            'revenue': ['revenue', 'sales', 'turnover', 'income', 'total revenue', 'Revenue'],
-            'sales_returns': ['sales returns', 'returns', 'sales allowances'],
-            'net_sales': ['net sales', 'net revenue', 'net turnover'],
-            # Cost fields
-            'cost_of_goods_sold': ['cogs', 'cost of goods sold', 'cost of sales', 'COGS'],
-            'gross_profit': ['gross profit', 'gross margin'],
-            # Expense fields
-            'salaries_wages': ['salaries', 'wages', 'salary expenses', 'payroll'],
-            'rent_expense': ['rent', 'rental expense', 'lease expense'],
-            'utilities': ['utilities', 'electricity', 'water', 'gas'],
-            'marketing_expense': ['marketing', 'advertising', 'promotion'],
-            'administrative_expense': ['admin', 'administrative', 'office expenses', 'Operating_Expenses'],
-            'depreciation': ['depreciation', 'amortization'],
-            'other_operating_expense': ['other expenses', 'miscellaneous expenses'],
-            # Profit fields
-            'operating_income': ['operating income', 'ebit', 'operating profit'],
-            'interest_expense': ['interest', 'interest expense', 'finance cost', 'Interest_Expense'],
-            'tax_expense': ['tax', 'income tax', 'tax expense', 'Tax'],
-            'net_income': ['net income', 'net profit', 'profit after tax'],
-            # Balance sheet assets
-            'cash': ['cash', 'cash and equivalents', 'bank balance'],
-            'accounts_receivable': ['accounts receivable', 'ar', 'debtors', 'Accounts_Receivable'],
-            'inventory': ['inventory', 'stock', 'goods in transit', 'Inventory'],
-            'current_assets': ['current assets', 'current total assets', 'Current_Assets'],
-            'fixed_assets': ['fixed assets', 'property plant equipment', 'ppe'],
-            'total_assets': ['total assets', 'assets total', 'Total_Assets'],
-            # Balance sheet liabilities
-            'accounts_payable': ['accounts payable', 'ap', 'creditors', 'Accounts_Payable'],
-            'short_term_debt': ['short term debt', 'current debt', 'short term loans'],
-            'current_liabilities': ['current liabilities', 'current total liabilities', 'Current_Liabilities'],
-            'long_term_debt': ['long term debt', 'long term loans'],
-            'total_liabilities': ['total liabilities', 'liabilities total', 'Total_Liabilities'],
-            'equity': ['equity', 'shareholders equity', 'owners equity'],
-            # Cash flow
-            'operating_cash_flow': ['operating cash flow', 'ocf'],
-            'investing_cash_flow': ['investing cash flow', 'icf'],
-            'financing_cash_flow': ['financing cash flow', 'fcf'],
-            'net_cash_flow': ['net cash flow', 'cash flow change', 'Cash_Flow']
+        self.field_mappings = self._FIELD_MAPPINGS
+        # Upload content type -> reader
+        self._handlers = {
+            "text/csv": self._process_csv,
+            "application/vnd.ms-excel": self._process_excel,
+            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": self._process_excel,
+            "application/pdf": self._process_pdf,
         }
 
     def process_file(self, content: bytes, filename: str, content_type: str) -> Tuple[Dict, List[str]]:
         """Process uploaded file and extract financial data with schema validation"""
         errors = []
         try:
-            if content_type == "text/csv":
-                data, file_errors = self._process_csv(content)
-            elif content_type in ["application/vnd.ms-excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"]:
-                data, file_errors = self._process_excel(content)
-            elif content_type == "application/pdf":
-                data, file_errors = self._process_pdf(content)
-            else:
+            handler = self._handlers.get(content_type)
+            if handler is None:
                 return {}, ["Unsupported file type"]
+            data, file_errors = handler(content)
             errors.extend(file_errors)
 
             # Normalize and validate schema
@@ -73,45 +139,64 @@ class DataProcessor:
 
     def _process_csv(self, content: bytes) -> Tuple[Dict, List[str]]:
         try:
-            df = pd.read_csv(io.StringIO(content.decode('utf-8')))
+            # Both engines read the raw bytes as UTF-8, so no separate decode/copy is needed
+            df = pd.read_csv(io.BytesIO(content), engine=_CSV_ENGINE)
             return self._extract_data_from_dataframe(df), []
         except Exception as e:
             return {}, [f"Error reading CSV: {str(e)}"]
 
     def _process_excel(self, content: bytes) -> Tuple[Dict, List[str]]:
         try:
-            df = pd.read_excel(io.BytesIO(content))
+            df = self._read_excel(content)
             return self._extract_data_from_dataframe(df), []
         except Exception as e:
             return {}, [f"Error reading Excel: {str(e)}"]
 
+    def _read_excel(self, content: bytes) -> pd.DataFrame:
+        """Read a spreadsheet with the Rust calamine engine when available, else pandas' default"""
+        if _EXCEL_ENGINE:
+            try:
+                return pd.read_excel(io.BytesIO(content), engine=_EXCEL_ENGINE)
+            except ValueError:
+                # Older pandas releases do not know the calamine engine
+                pass
+        return pd.read_excel(io.BytesIO(content))
+
     def _process_pdf(self, content: bytes) -> Tuple[Dict, List[str]]:
         try:
-            pdf_reader = PdfReader(io.BytesIO(content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return self._extract_data_from_text(text), []
+            # Scan page by page and stop reading once every field has been found
+            data = {}
+            for page_text in self._iter_pdf_pages(content):
+                self._scan_into(page_text, data)
+                if len(data) >= len(self.field_mappings):
+                    break
+            return data, []
         except Exception as e:
             return {}, [f"Error reading PDF (ensure text-based, not scanned): {str(e)}"]
 
+    def _iter_pdf_pages(self, content: bytes):
+        """Yield the text of each PDF page, using PDFium when available"""
+        if pdfium is not None:
+            pdf = pdfium.PdfDocument(content)
+            try:
+                for page in pdf:
+                    yield page.get_textpage().get_text_range()
+            finally:
+                pdf.close()
+        else:
+            # Lenient parsing: only page text is needed, not a fully validated object tree
+            for page in PdfReader(io.BytesIO(content), strict=False).pages:
+                yield page.extract_text() or ""
+
     def _normalize_and_validate(self, data: Dict) -> Dict:
         """Normalize currency formats and clean numeric values"""
-        cleaned = {}
-        for key, value in data.items():
-            if value is None:
-                cleaned[key] = None
-                continue
-            if isinstance(value, str):
-                # Remove currency symbols, commas, and whitespace
-                value = re.sub(r'[$,₹€£¥\s]', '', value)
-                # Convert to float if possible
-                try:
-                    cleaned[key] = float(value)
-                except ValueError:
-                    cleaned[key] = None
-            else:
-                cleaned[key] = value
+        cleaned = dict(data)
+        text_keys = [key for key, value in data.items() if isinstance(value, str)]
+        if text_keys:
+            # Remove currency symbols, commas, and whitespace, then convert all text values in one pass
+            values = pd.Series([data[key] for key in text_keys], index=text_keys, dtype=object)
+            numeric = pd.to_numeric(values.str.translate(_STRIP), errors='coerce').astype(float)
+            cleaned.update(numeric.astype(object).where(numeric.notna(), None).to_dict())
         return cleaned
 
     def _validate_required_columns(self, data: Dict) -> List[str]:
@@ -137,17 +222,6 @@ class DataProcessor:
         """Extract financial data from pandas DataFrame, handling category/amount style"""
         data = {}
 
-        try:
-            import pandas as pd  # type: ignore
-
-            def _is_na(v):
-                return pd.isna(v)
-
-        except Exception:
-
-            def _is_na(v):
-                return v is None or (isinstance(v, str) and v.strip() == "")
-
         # If CSV has 'month'/'Month', 'revenue'/'Revenue', and other financial columns, treat as pre-aggregated monthly data
         required_monthly_cols_lower = {'month', 'revenue'}
         required_monthly_cols_upper = {'Month', 'Revenue'}
@@ -155,87 +229,76 @@ class DataProcessor:
         df_columns_upper = set(df.columns)
         
         if required_monthly_cols_lower.issubset(df_columns_lower) or required_monthly_cols_upper.issubset(df_columns_upper):
-            # Pre-aggregated monthly format: map columns directly
-            statements = {}
-            for _, row in df.iterrows():
-                # Handle both 'month' and 'Month' column names
-                month = str(row.get('month', row.get('Month', '')))
-                
-                # Compute debt metrics deterministically
-                short_term_debt = row.get('short_term_debt', 0)
-                long_term_debt = row.get('long_term_debt', 0)
-                total_liabilities = row.get('total_liabilities', row.get('Total_Liabilities', 0))
-                total_assets = row.get('total_assets', row.get('Total_Assets', 0))
-                
-                # Compute total_debt: prefer explicit debt columns, fallback to total_liabilities
-                if short_term_debt > 0 or long_term_debt > 0:
-                    total_debt = short_term_debt + long_term_debt
-                else:
-                    total_debt = total_liabilities
-                
-                # Compute equity
-                equity = total_assets - total_liabilities
-                
-                # Compute debt_to_equity safely
-                if equity <= 0:
-                    debt_to_equity = 999.99  # Very high value for Critical risk
-                    risk_level = 'Critical'
-                else:
-                    debt_to_equity = total_debt / equity
-                    # Map ratio to risk levels
-                    if debt_to_equity <= 0.5:
-                        risk_level = 'Low'
-                    elif debt_to_equity <= 1.5:
-                        risk_level = 'Moderate'
-                    elif debt_to_equity <= 3:
-                        risk_level = 'High'
-                    else:
-                        risk_level = 'Critical'
-                
-                # Map CSV columns to standard field names using field_mappings
-                month_data = {}
-                for field_name, possible_columns in self.field_mappings.items():
-                    for col in possible_columns:
-                        if col in df.columns:
-                            month_data[field_name] = row.get(col, 0)
-                            break
-                
-                # Ensure required fields have default values
-                month_data.update({
-                    'total_assets': total_assets,
-                    'current_liabilities': total_liabilities,
-                    'short_term_debt': short_term_debt,
-                    'long_term_debt': long_term_debt,
-                    'total_debt': total_debt,
-                    'equity': equity,
-                    'debt_to_equity': debt_to_equity,
-                    'risk_level': risk_level
-                })
-                print(f"[DATA PROCESSOR] month={month} total_assets={total_assets} total_liabilities={total_liabilities} equity={equity} total_debt={total_debt} debt_to_equity={debt_to_equity:.2f} risk_level={risk_level}")
-                # Auto-generate derived fields
-                revenue = month_data.get('revenue', 0)
-                total_expenses = month_data.get('other_operating_expense', 0) + month_data.get('interest_expense', 0) + month_data.get('tax_expense', 0)
-                month_data['net_income'] = revenue - total_expenses
-                month_data['gross_profit'] = revenue - month_data.get('cost_of_goods_sold', 0)
-                month_data['operating_income'] = revenue - month_data.get('other_operating_expense', 0)
-                # Balance Sheet
-                total_assets = month_data.get('total_assets')
-                current_liabilities = month_data.get('current_liabilities')
-                if total_assets and current_liabilities:
-                    month_data['equity'] = total_assets - current_liabilities
-                # Current assets
-                cash = month_data.get('cash', 0)
-                ar = month_data.get('accounts_receivable', 0)
-                inv = month_data.get('inventory', 0)
-                if cash or ar or inv:
-                    month_data['current_assets'] = cash + ar + inv
-                else:
-                    month_data['current_assets'] = total_assets * 0.6 if total_assets else 0
-                # Cash Flow
-                month_data['operating_cash_flow'] = month_data.get('net_income', 0)
-                statements[month] = month_data
+            # Pre-aggregated monthly format: resolve each field's column once, then map columns directly
+            active_map = {}
+            for field_name, possible_columns in self.field_mappings.items():
+                for col in possible_columns:
+                    if col in df_columns_upper:
+                        active_map[field_name] = col
+                        break
+            work = pd.DataFrame({field_name: pd.to_numeric(df[col], errors='coerce').fillna(0)
+                                 for field_name, col in active_map.items()}, index=df.index)
+
+            def _numeric(*names):
+                for name in names:
+                    if name in df_columns_upper:
+                        return pd.to_numeric(df[name], errors='coerce').fillna(0).to_numpy(dtype=float)
+                return np.zeros(len(df))
+
+            # Handle both 'month' and 'Month' column names
+            month_col = 'month' if 'month' in df_columns_upper else 'Month' if 'Month' in df_columns_upper else None
+            months = df[month_col].astype(str) if month_col else pd.Series('', index=df.index)
+
+            # Compute debt metrics deterministically
+            short_term_debt = _numeric('short_term_debt')
+            long_term_debt = _numeric('long_term_debt')
+            total_liabilities = _numeric('total_liabilities', 'Total_Liabilities')
+            total_assets = _numeric('total_assets', 'Total_Assets')
+
+            # Compute total_debt: prefer explicit debt columns, fallback to total_liabilities
+            total_debt = np.where((short_term_debt > 0) | (long_term_debt > 0),
+                                  short_term_debt + long_term_debt, total_liabilities)
+            equity = total_assets - total_liabilities
+
+            # Compute debt_to_equity safely; non-positive equity gets a very high value for Critical risk
+            solvent = equity > 0
+            debt_to_equity = np.divide(total_debt, equity, out=np.full(len(df), 999.99), where=solvent)
+            risk_level = _RISK_LABELS[_classify_risk_batch(debt_to_equity, equity)]
+
+            # Ensure required fields have default values
+            work['total_assets'] = total_assets
+            work['current_liabilities'] = total_liabilities
+            work['short_term_debt'] = short_term_debt
+            work['long_term_debt'] = long_term_debt
+            work['total_debt'] = total_debt
+            work['equity'] = equity
+            work['debt_to_equity'] = debt_to_equity
+            work['risk_level'] = pd.Series(risk_level, index=df.index)
+
+            # Auto-generate derived fields
+            revenue = work.get('revenue', 0)
+            other_operating_expense = work.get('other_operating_expense', 0)
+            work['net_income'] = revenue - (other_operating_expense + work.get('interest_expense', 0) + work.get('tax_expense', 0))
+            work['gross_profit'] = revenue - work.get('cost_of_goods_sold', 0)
+            work['operating_income'] = revenue - other_operating_expense
+            # Current assets
+            cash = work.get('cash', 0)
+            ar = work.get('accounts_receivable', 0)
+            inv = work.get('inventory', 0)
+            work['current_assets'] = np.where((cash != 0) | (ar != 0) | (inv != 0), cash + ar + inv, total_assets * 0.6)
+            # Cash Flow
+            work['operating_cash_flow'] = work['net_income']
+
+            work.index = months
+            work = work[~work.index.duplicated(keep='last')]
+            statements = work.to_dict('index')
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("\n".join(
+                    f"[DATA PROCESSOR] month={month} total_assets={month_data['total_assets']} total_liabilities={month_data['current_liabilities']} equity={month_data['equity']} total_debt={month_data['total_debt']} debt_to_equity={month_data['debt_to_equity']:.2f} risk_level={month_data['risk_level']}"
+                    for month, month_data in statements.items()
+                ))
             # Return the latest month as primary data and include monthly summaries
-            latest_month = max(statements.keys()) if statements else None
+            latest_month = work.index.max() if len(work) else None
             if latest_month:
                 data = statements[latest_month]
                 data['monthly_statements'] = statements
@@ -247,70 +310,54 @@ class DataProcessor:
             df['amount'] = pd.to_numeric(df['amount'], errors='coerce').fillna(0)
             # Add month column
             df['month'] = df['date'].dt.to_period('M').astype(str)
-            # Aggregate by month and category
-            agg = df.groupby(['month', 'category'])['amount'].sum().reset_index()
-            # Build monthly statements
-            statements = {}
-            for month, group in agg.groupby('month'):
-                month_data = {}
-                for _, row in group.iterrows():
-                    cat, val = row['category'], row['amount']
-                    if 'revenue' in cat or 'sales' in cat or 'income' in cat:
-                        month_data['revenue'] = month_data.get('revenue', 0) + val
-                    elif 'expense' in cat or 'cost' in cat or 'operating' in cat:
-                        month_data['other_operating_expense'] = month_data.get('other_operating_expense', 0) + val
-                    elif 'loan' in cat or 'debt' in cat:
-                        month_data['interest_expense'] = month_data.get('interest_expense', 0) + val
-                    elif 'tax' in cat:
-                        month_data['tax_expense'] = month_data.get('tax_expense', 0) + val
-                    elif 'asset' in cat:
-                        month_data['total_assets'] = month_data.get('total_assets', 0) + val
-                    elif 'liability' in cat:
-                        month_data['current_liabilities'] = month_data.get('current_liabilities', 0) + val
-                    elif 'receivable' in cat:
-                        month_data['accounts_receivable'] = month_data.get('accounts_receivable', 0) + val
-                    elif 'payable' in cat:
-                        month_data['accounts_payable'] = month_data.get('accounts_payable', 0) + val
-                    elif 'inventory' in cat:
-                        month_data['inventory'] = month_data.get('inventory', 0) + val
-                # Auto-generate derived fields for financial statements
-                revenue = month_data.get('revenue', 0)
-                total_expenses = month_data.get('other_operating_expense', 0) + month_data.get('interest_expense', 0) + month_data.get('tax_expense', 0)
-                # Income Statement
-                month_data['net_income'] = revenue - total_expenses
-                month_data['gross_profit'] = revenue - month_data.get('cost_of_goods_sold', 0)
-                month_data['operating_income'] = revenue - month_data.get('other_operating_expense', 0)
-
-                # Balance Sheet: generate sensible defaults if not provided
-                total_assets = month_data.get('total_assets')
-                current_liabilities = month_data.get('current_liabilities')
-                if total_assets is None:
-                    # Estimate assets as 3x revenue if not provided
-                    total_assets = revenue * 3 if revenue > 0 else 0
-                    month_data['total_assets'] = total_assets
-                if current_liabilities is None:
-                    # Estimate liabilities as 40% of assets if not provided
-                    current_liabilities = total_assets * 0.4
-                    month_data['current_liabilities'] = current_liabilities
-                # Derive equity if possible
-                if total_assets and current_liabilities:
-                    month_data['equity'] = total_assets - current_liabilities
-                # Current assets if cash or receivables present
-                cash = month_data.get('cash', 0)
-                ar = month_data.get('accounts_receivable', 0)
-                inv = month_data.get('inventory', 0)
-                if cash or ar or inv:
-                    month_data['current_assets'] = cash + ar + inv
-                else:
-                    # Estimate current assets as 60% of total assets
-                    month_data['current_assets'] = total_assets * 0.6
-
-                # Cash Flow (simplified)
-                month_data['operating_cash_flow'] = month_data.get('net_income', 0)  # Simplified: net income as proxy
-
-                statements[month] = month_data
-            # Return the latest month as primary data and include monthly summaries
-            latest_month = max(statements.keys()) if statements else None
+            # Classify each category once (first matching pattern wins), then aggregate by month and field
+            categories = df['category'].fillna('')
+            df['field'] = np.select(
+                [categories.str.contains(pattern, regex=True) for _, pattern in _CATEGORY_PATTERNS],
+                [field_name for field_name, _ in _CATEGORY_PATTERNS],
+                default='',
+            )
+            # Months with no recognised categories still get a statement; absent fields stay NaN
+            matched = df[df['field'] != '']
+            monthly = (matched.groupby(['month', 'field'])['amount'].sum()
+                       .unstack()
+                       .reindex(pd.Index(df['month'].dropna().unique()).sort_values()))
+
+            def _field(name):
+                return monthly[name] if name in monthly else pd.Series(np.nan, index=monthly.index)
+
+            # Auto-generate derived fields for financial statements
+            revenue = _field('revenue').fillna(0)
+            other_operating_expense = _field('other_operating_expense').fillna(0)
+            total_expenses = other_operating_expense + _field('interest_expense').fillna(0) + _field('tax_expense').fillna(0)
+            # Income Statement
+            monthly['net_income'] = revenue - total_expenses
+            monthly['gross_profit'] = revenue - _field('cost_of_goods_sold').fillna(0)
+            monthly['operating_income'] = revenue - other_operating_expense
+
+            # Balance Sheet: generate sensible defaults if not provided
+            # Estimate assets as 3x revenue and liabilities as 40% of assets if not provided
+            total_assets = _field('total_assets').fillna(revenue.clip(lower=0) * 3)
+            current_liabilities = _field('current_liabilities').fillna(total_assets * 0.4)
+            monthly['total_assets'] = total_assets
+            monthly['current_liabilities'] = current_liabilities
+            # Derive equity if possible
+            monthly['equity'] = (total_assets - current_liabilities).where((total_assets != 0) & (current_liabilities != 0))
+            # Current assets if cash or receivables present, otherwise estimate as 60% of total assets
+            cash = _field('cash').fillna(0)
+            ar = _field('accounts_receivable').fillna(0)
+            inv = _field('inventory').fillna(0)
+            monthly['current_assets'] = (cash + ar + inv).where((cash != 0) | (ar != 0) | (inv != 0), total_assets * 0.6)
+
+            # Cash Flow (simplified)
+            monthly['operating_cash_flow'] = monthly['net_income']  # Simplified: net income as proxy
+
+            statements = {
+                month: {k: v for k, v in row.items() if not _is_na(v)}
+                for month, row in monthly.to_dict('index').items()
+            }
+            # Return the latest month as primary data and include monthly summaries; months are already sorted
+            latest_month = monthly.index[-1] if len(monthly) else None
             if latest_month:
                 data = statements[latest_month]
                 data['monthly_statements'] = statements  # Store all months for trend analysis
@@ -336,61 +383,35 @@ class DataProcessor:
         
         # Also check first column for labels and second column for values
         if len(df.columns) >= 2:
-            for idx, row in df.iterrows():
-                if _is_na(row.iloc[0]) or _is_na(row.iloc[1]):
-                    continue
-                    
-                label = str(row.iloc[0]).lower().strip()
-                matched_field = self._match_field(label)
-                
-                if matched_field:
-                    try:
-                        value = float(row.iloc[1])
-                        data[matched_field] = value
-                    except (ValueError, TypeError):
-                        continue
+            labels, values = df.iloc[:, 0], df.iloc[:, 1]
+            present = labels.notna() & values.notna()
+            fields = labels[present].astype(str).str.lower().map(self._match_field)
+            values = pd.to_numeric(values[present], errors='coerce')
+            matched = fields.notna() & values.notna()
+            data.update(zip(fields[matched], values[matched].astype(float).tolist()))
         
         return data
     
     def _extract_data_from_text(self, text: str) -> Dict:
         """Extract financial data from text content"""
         data = {}
-        
-        # Split text into lines
-        lines = text.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Try to find patterns like "Revenue: 1000000" or "Revenue 1000000"
-            for field_name, keywords in self.field_mappings.items():
-                for keyword in keywords:
-                    # Pattern to match keyword followed by number
-                    pattern = rf'{keyword}[:\s]*([\d,]+\.?\d*)'
-                    match = re.search(pattern, line, re.IGNORECASE)
-                    
-                    if match:
-                        try:
-                            value = float(match.group(1).replace(',', ''))
-                            data[field_name] = value
-                            break
-                        except ValueError:
-                            continue
-        
+        self._scan_into(text, data)
         return data
     
+    def _scan_into(self, text: str, data: Dict) -> None:
+        """Scan text in one pass, recording matched field values into data"""
+        # Try to find patterns like "Revenue: 1000000" or "Revenue 1000000"
+        for match in self._KEYWORD_RE.finditer(text):
+            try:
+                data[self._REVERSE[match.group(1).lower()]] = float(match.group(2).replace(',', ''))
+            except ValueError:
+                continue
+    
     def _match_field(self, text: str) -> Optional[str]:
         """Match text to financial field"""
         text = text.lower().strip()
-        
-        for field_name, keywords in self.field_mappings.items():
-            for keyword in keywords:
-                if keyword in text:
-                    return field_name
-        
-        return None
+        fields = [self._REVERSE[keyword] for keyword in self._FIELD_MATCH_RE.findall(text)]
+        return min(fields, key=self._FIELD_RANK.__getitem__) if fields else None
     
     def _validate_and_clean_data(self, data: Dict) -> Dict:
         """Validate and clean extracted data"""
@@ -1,41 +1,92 @@
 import os
 import base64
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+import binascii
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 import json
+from concurrent.futures import ThreadPoolExecutor
 
 # In production, load this from environment or secret manager
 ENCRYPTION_KEY = os.getenv("FIELD_ENCRYPTION_KEY", base64.urlsafe_b64encode(os.urandom(32)).decode())
 
-def _derive_key(password: bytes, salt: bytes) -> bytes:
+# Tokens written with the HKDF-derived keys carry this prefix; unprefixed tokens use the legacy PBKDF2 keys
+TOKEN_PREFIX = "v2:"
+# 16-byte salt followed by a 12-byte GCM IV
+_NONCE_SIZE = 28
+# Batches smaller than this are not worth a thread pool
+_PARALLEL_MIN_BATCH = 32
+
+def _master_key() -> bytes:
+    try:
+        decoded = base64.urlsafe_b64decode(ENCRYPTION_KEY + "==")
+    except (binascii.Error, ValueError):
+        decoded = b""
+    return decoded if len(decoded) == 32 else ENCRYPTION_KEY.encode()
+
+_MASTER = _master_key()
+_BACKEND = default_backend()
+
+def _derive_key(salt: bytes) -> bytes:
+    # The master key is already high-entropy, so a single HKDF pass is enough per field
+    hkdf = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        info=b"finhealth-field",
+        backend=_BACKEND,
+    )
+    return hkdf.derive(_MASTER)
+
+def _derive_legacy_key(password: bytes, salt: bytes) -> bytes:
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
         length=32,
         salt=salt,
         iterations=100_000,
-        backend=default_backend(),
+        backend=_BACKEND,
     )
     return kdf.derive(password)
 
-def encrypt_field(value: str | dict | float | int) -> str:
+def _seal(value: str | dict | float | int, nonce: bytes) -> str:
     if value is None:
         return None
     plaintext = json.dumps(value).encode()
-    salt = os.urandom(16)
-    iv = os.urandom(12)
-    key = _derive_key(ENCRYPTION_KEY.encode(), salt)
-    encryptor = Cipher(algorithms.AES(key), modes.GCM(iv), backend=default_backend()).encryptor()
-    ciphertext = encryptor.update(plaintext) + encryptor.finalize()
-    return base64.urlsafe_b64encode(salt + iv + encryptor.tag + ciphertext).decode()
+    salt, iv = nonce[:16], nonce[16:28]
+    key = _derive_key(salt)
+    # AESGCM appends the tag; tokens keep the salt + iv + tag + ciphertext layout
+    sealed = AESGCM(key).encrypt(iv, plaintext, None)
+    ciphertext, tag = sealed[:-16], sealed[-16:]
+    return TOKEN_PREFIX + base64.urlsafe_b64encode(salt + iv + tag + ciphertext).decode()
+
+def encrypt_field(value: str | dict | float | int) -> str:
+    return _seal(value, os.urandom(_NONCE_SIZE))
+
+def encrypt_fields(values: list) -> list[str]:
+    """Encrypt many values; salts and IVs come from a single urandom call"""
+    randomness = os.urandom(_NONCE_SIZE * len(values))
+    nonces = [randomness[i:i + _NONCE_SIZE] for i in range(0, len(randomness), _NONCE_SIZE)]
+    return _map(_seal, values, nonces)
 
 def decrypt_field(token: str) -> str | dict | float | int:
     if token is None:
         return None
-    data = base64.urlsafe_b64decode(token.encode())
+    legacy = not token.startswith(TOKEN_PREFIX)
+    data = base64.urlsafe_b64decode(token.removeprefix(TOKEN_PREFIX).encode())
     salt, iv, tag, ciphertext = data[:16], data[16:28], data[28:44], data[44:]
-    key = _derive_key(ENCRYPTION_KEY.encode(), salt)
-    decryptor = Cipher(algorithms.AES(key), modes.GCM(iv, tag), backend=default_backend()).decryptor()
-    plaintext = decryptor.update(ciphertext) + decryptor.finalize()
+    key = _derive_legacy_key(ENCRYPTION_KEY.encode(), salt) if legacy else _derive_key(salt)
+    plaintext = AESGCM(key).decrypt(iv, ciphertext + tag, None)
     return json.loads(plaintext.decode())
+
+def decrypt_fields(tokens: list) -> list:
+    """Decrypt many tokens, preserving order"""
+    return _map(decrypt_field, tokens)
+
+def _map(func, *iterables) -> list:
+    # OpenSSL releases the GIL during AES-GCM, so larger batches run across threads
+    if len(iterables[0]) < _PARALLEL_MIN_BATCH:
+        return list(map(func, *iterables))
+    with ThreadPoolExecutor() as executor:
+        return list(executor.map(func, *iterables))
@@ -1,284 +1,443 @@
+import bisect
+import functools
+import hashlib
+from collections import OrderedDict
+from enum import IntEnum
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Dict, List, Optional
 
+import numpy as np
+
+# Raw statement fields read by the vectorized metrics path
+_FIELDS = (
+    'revenue', 'gross_profit', 'net_income', 'operating_income', 'total_assets', 'equity',
+    'current_assets', 'current_liabilities', 'inventory', 'cash', 'short_term_debt', 'long_term_debt',
+    'interest_expense', 'cost_of_goods_sold', 'accounts_receivable', 'accounts_payable',
+)
+
+
+# Industries as small integer codes (IntEnum so codes index the benchmark and risk arrays directly)
+Industry = IntEnum('Industry', ['Manufacturing', 'Retail', 'Agriculture', 'Services', 'Logistics', 'E-commerce'], start=0)
+
+# Industry averages, one row per Industry code
+_BENCHMARK_COLS = (
+    'avg_gross_profit_margin', 'avg_net_profit_margin', 'avg_current_ratio', 'avg_quick_ratio',
+    'avg_debt_to_equity', 'avg_interest_coverage', 'avg_asset_turnover', 'avg_inventory_turnover',
+    'avg_working_capital_days', 'avg_cash_conversion_cycle',
+)
+_BENCHMARKS = np.array([
+    [0.25, 0.08, 1.5, 1.0, 0.8, 3.5, 1.2, 6.0, 45, 60],    # Manufacturing
+    [0.35, 0.05, 1.8, 0.8, 1.0, 3.0, 2.0, 8.0, 30, 45],    # Retail
+    [0.20, 0.04, 1.3, 0.7, 1.2, 2.5, 0.8, 4.0, 60, 90],    # Agriculture
+    [0.45, 0.12, 2.0, 1.8, 0.6, 5.0, 1.5, 12.0, 20, 30],   # Services
+    [0.22, 0.06, 1.4, 1.1, 1.5, 2.8, 1.8, 10.0, 35, 50],   # Logistics
+    [0.30, 0.07, 1.6, 1.2, 0.9, 3.2, 2.5, 12.0, 25, 35],   # E-commerce
+], dtype=np.float64)
+_BENCHMARKS.setflags(write=False)
+
+# Industry risk score per Industry code; the extra trailing slot is the default for unknown industries
+_INDUSTRY_RISK_BY_CODE = np.array([75, 70, 60, 85, 72, 68, 70], dtype=np.float64)
+_INDUSTRY_RISK_BY_CODE.setflags(write=False)
+_UNKNOWN_INDUSTRY_CODE = len(Industry)
+_INDUSTRY_CODES = MappingProxyType({industry.name: industry.value for industry in Industry})
+
+# Name-keyed views of the same tables for existing callers, shared read-only
+_INDUSTRY_BENCHMARKS = MappingProxyType({
+    industry.name: MappingProxyType(dict(zip(_BENCHMARK_COLS, _BENCHMARKS[industry].tolist())))
+    for industry in Industry
+})
+_INDUSTRY_RISK = MappingProxyType({industry.name: int(_INDUSTRY_RISK_BY_CODE[industry]) for industry in Industry})
+
+
+# Scoring ladders: (ascending thresholds, points per band). "Higher is better" metrics land in the
+# band of thresholds they reach (>=); debt-to-equity is "lower is better" and keeps a band while <=.
+# Each component is 50 plus at most two bands of 0-25 points, so it always lies in [50, 100]
+_GROSS_MARGIN_LADDER = ((0.1, 0.2, 0.4), (0, 5, 15, 25))
+_NET_MARGIN_LADDER = ((0.03, 0.08, 0.15), (0, 5, 15, 25))
+_CURRENT_RATIO_LADDER = ((1.0, 1.5, 2.0), (0, 5, 15, 25))
+_QUICK_RATIO_LADDER = ((0.8, 1.0, 1.5), (0, 5, 15, 25))
+_DEBT_TO_EQUITY_LADDER = ((0.5, 1.0, 1.5), (25, 15, 5, 0))
+_INTEREST_COVERAGE_LADDER = ((2.0, 3.0, 5.0), (0, 5, 15, 25))
+_CASH_RATIO_LADDER = ((0.1, 0.3, 0.5), (0, 5, 15, 25))
+
+# Credit grade cut-offs: a score takes the grade of the highest cut-off it reaches
+_GRADE_THRESHOLDS = (45, 55, 65, 75, 85)
+_GRADES = ('D', 'C', 'B', 'B+', 'A', 'A+')
+
+# Component weights, in the order the components are stacked for the weighted sums
+# (credit: profitability, liquidity, leverage, cash stability, tax compliance, industry risk)
+_CREDIT_WEIGHTS = np.array([0.30, 0.20, 0.20, 0.15, 0.10, 0.05], dtype=np.float64)
+_HEALTH_COMPONENTS = ('profitability', 'liquidity', 'leverage', 'efficiency', 'cash_stability')
+_HEALTH_WEIGHTS = np.array([0.25, 0.20, 0.20, 0.15, 0.20], dtype=np.float64)
+
+# Metrics each score reads, in the order they appear in the memoization key
+_CREDIT_METRIC_KEYS = (
+    'gross_profit_margin', 'net_profit_margin', 'current_ratio', 'quick_ratio',
+    'debt_to_equity', 'interest_coverage_ratio', 'cash_ratio', 'working_capital',
+)
+_HEALTH_METRIC_KEYS = ('net_profit_margin', 'current_ratio', 'debt_to_equity', 'asset_turnover', 'working_capital')
+_SCORE_CACHE_SIZE = 4096
+
+# Health component bands: (ascending breakpoints, points per band). Margins and ratios score the
+# band they reach (>=); debt-to-equity keeps a band while <=. Missing metrics score 50
+_HEALTH_PROFITABILITY_LADDER = ((0.0, 0.03, 0.08, 0.15), (0, 40, 60, 80, 100))
+_HEALTH_LIQUIDITY_LADDER = ((0.5, 1.0, 1.5, 2.0), (0, 40, 60, 80, 100))
+_HEALTH_LEVERAGE_LADDER = ((0.5, 1.0, 1.5, 2.0), (100, 80, 60, 40, 0))
+_HEALTH_EFFICIENCY_LADDER = ((0.5, 1.0, 1.5, 2.0), (0, 40, 60, 80, 100))
+_HEALTH_GRADE_THRESHOLDS = (40, 55, 70, 85)
+_HEALTH_GRADES = ('Critical', 'Poor', 'Fair', 'Good', 'Excellent')
+
+# Column layouts of the batch scoring kernel
+_SCORE_BATCH_METRICS = (
+    'gross_profit_margin', 'net_profit_margin', 'current_ratio', 'quick_ratio', 'debt_to_equity',
+    'interest_coverage_ratio', 'cash_ratio', 'working_capital', 'asset_turnover',
+)
+_SCORE_BATCH_OUTPUTS = (
+    'profitability_score', 'liquidity_score', 'leverage_score', 'cash_stability_score',
+    'tax_compliance_score', 'industry_risk_modifier', 'credit_score', 'financial_health_score',
+)
+
+
+def _ladder_points(ladder, value: float, side: str = 'right') -> int:
+    thresholds, points = ladder
+    index = bisect.bisect_right(thresholds, value) if side == 'right' else bisect.bisect_left(thresholds, value)
+    return points[index]
+
+
+def _ladder_points_batch(ladder, values: np.ndarray, side: str = 'right') -> np.ndarray:
+    thresholds, points = ladder
+    return np.asarray(points, dtype=np.float64)[np.searchsorted(thresholds, values, side=side)]
+
+
+def _score_batch(metrics: np.ndarray, industry_codes: np.ndarray) -> np.ndarray:
+    """Score an (N, len(_SCORE_BATCH_METRICS)) metrics matrix (NaN = missing) into (N, len(_SCORE_BATCH_OUTPUTS))"""
+    (gross_margin, net_margin, current_ratio, quick_ratio, debt_to_equity,
+     interest_coverage, cash_ratio, working_capital, asset_turnover) = metrics.T
+    n = metrics.shape[0]
+    
+    def credit_points(ladder, values, side='right'):
+        # Credit ladders only apply to present, non-zero metrics
+        return np.where(_present(values), _ladder_points_batch(ladder, values, side), 0.0)
+    
+    def health_points(ladder, values, side='right'):
+        return np.where(np.isnan(values), 50.0, _ladder_points_batch(ladder, values, side))
+    
+    out = np.empty((n, len(_SCORE_BATCH_OUTPUTS)), dtype=np.float64)
+    out[:, 0] = 50 + credit_points(_GROSS_MARGIN_LADDER, gross_margin) + credit_points(_NET_MARGIN_LADDER, net_margin)
+    out[:, 1] = 50 + credit_points(_CURRENT_RATIO_LADDER, current_ratio) + credit_points(_QUICK_RATIO_LADDER, quick_ratio)
+    out[:, 2] = (50 + credit_points(_DEBT_TO_EQUITY_LADDER, debt_to_equity, side='left')
+                 + credit_points(_INTEREST_COVERAGE_LADDER, interest_coverage))
+    out[:, 3] = 50 + credit_points(_CASH_RATIO_LADDER, cash_ratio) + np.where(working_capital > 0, 25.0, 0.0)
+    out[:, 4] = 85
+    out[:, 5] = _INDUSTRY_RISK_BY_CODE[industry_codes]
+    out[:, 6] = np.clip(out[:, :6] @ _CREDIT_WEIGHTS, 0, 100)
+    
+    health = np.column_stack((
+        health_points(_HEALTH_PROFITABILITY_LADDER, net_margin),
+        health_points(_HEALTH_LIQUIDITY_LADDER, current_ratio),
+        health_points(_HEALTH_LEVERAGE_LADDER, debt_to_equity, side='left'),
+        health_points(_HEALTH_EFFICIENCY_LADDER, asset_turnover),
+        np.where(np.isnan(working_capital), 50.0, np.where(working_capital > 0, 100.0, 0.0)),
+    ))
+    out[:, 7] = health @ _HEALTH_WEIGHTS
+    return out
+
+
+def _present(values: np.ndarray) -> np.ndarray:
+    # Vectorized form of the scalar path's truthiness gates (missing values are NaN)
+    return (values != 0) & ~np.isnan(values)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    # A zero numerator is a real value (e.g. break-even net income); only the denominator must be non-zero
+    return np.where(~np.isnan(numerator) & _present(denominator), numerator / denominator, np.nan)
+
+
+def _simple_ratio(data: Dict, numerator_key: str, denominator_key: str) -> Optional[float]:
+    numerator, denominator = data.get(numerator_key), data.get(denominator_key)
+    return numerator / denominator if numerator is not None and denominator else None
+
+
+def _total_debt(short_term_debt, long_term_debt) -> Optional[float]:
+    # Debt is unknown only when neither component was reported
+    if short_term_debt is None and long_term_debt is None:
+        return None
+    return (short_term_debt or 0) + (long_term_debt or 0)
+
+
+def _cash_conversion_cycle(inventory, receivables, payables, cogs, revenue) -> Optional[float]:
+    # DIO + DSO - DPO, straight from the balance-sheet fields rather than via the turnover ratios
+    if (inventory is not None and receivables is not None and payables is not None
+            and cogs and cogs > 0 and revenue and revenue > 0):
+        return 365.0 * (inventory / cogs + receivables / revenue - payables / cogs)
+    return None
+
+
+def _content_key(data: Dict) -> Optional[bytes]:
+    """Stable digest of a record's items, or None when a value is unhashable and the record can't be cached"""
+    items = sorted(data.items())
+    try:
+        hash(tuple(items))
+    except TypeError:
+        return None
+    return hashlib.blake2b(repr(items).encode(), digest_size=16).digest()
+
+
+def _metrics_key(metrics: Dict, keys) -> tuple:
+    """Hashable snapshot of the exact metric values a score depends on (missing values stay None)"""
+    return tuple(metrics.get(k) for k in keys)
+
+
+def _ols_forecast(y: np.ndarray, periods: int) -> np.ndarray:
+    """Extrapolate an OLS line y = a*x + b fitted over x = 0..n-1 for the next periods"""
+    n = y.size
+    # x is 0..n-1, so its mean and centred sum of squares have closed forms
+    x_mean = (n - 1) / 2
+    denom = n * (n * n - 1) / 12
+    a = (np.arange(n, dtype=np.float64) - x_mean) @ y / denom if denom else 0.0
+    b = y.mean() - a * x_mean
+    return a * np.arange(n, n + periods, dtype=np.float64) + b
+
+
 class FinancialCalculator:
     """Deterministic financial calculations engine"""
     
+    # Metrics cached by a digest of the raw record's contents
+    METRICS_CACHE_SIZE = 1024
+    _metrics_cache: "OrderedDict[bytes, Dict]" = OrderedDict()
+    
     def __init__(self):
-        self.industry_benchmarks = {
-            'Manufacturing': {
-                'avg_gross_profit_margin': 0.25,
-                'avg_net_profit_margin': 0.08,
-                'avg_current_ratio': 1.5,
-                'avg_quick_ratio': 1.0,
-                'avg_debt_to_equity': 0.8,
-                'avg_interest_coverage': 3.5,
-                'avg_asset_turnover': 1.2,
-                'avg_inventory_turnover': 6.0,
-                'avg_working_capital_days': 45,
-                'avg_cash_conversion_cycle': 60
-            },
-            'Retail': {
-                'avg_gross_profit_margin': 0.35,
-                'avg_net_profit_margin': 0.05,
-                'avg_current_ratio': 1.8,
-                'avg_quick_ratio': 0.8,
-                'avg_debt_to_equity': 1.0,
-                'avg_interest_coverage': 3.0,
-                'avg_asset_turnover': 2.0,
-                'avg_inventory_turnover': 8.0,
-                'avg_working_capital_days': 30,
-                'avg_cash_conversion_cycle': 45
-            },
-            'Agriculture': {
-                'avg_gross_profit_margin': 0.20,
-                'avg_net_profit_margin': 0.04,
-                'avg_current_ratio': 1.3,
-                'avg_quick_ratio': 0.7,
-                'avg_debt_to_equity': 1.2,
-                'avg_interest_coverage': 2.5,
-                'avg_asset_turnover': 0.8,
-                'avg_inventory_turnover': 4.0,
-                'avg_working_capital_days': 60,
-                'avg_cash_conversion_cycle': 90
-            },
-            'Services': {
-                'avg_gross_profit_margin': 0.45,
-                'avg_net_profit_margin': 0.12,
-                'avg_current_ratio': 2.0,
-                'avg_quick_ratio': 1.8,
-                'avg_debt_to_equity': 0.6,
-                'avg_interest_coverage': 5.0,
-                'avg_asset_turnover': 1.5,
-                'avg_inventory_turnover': 12.0,
-                'avg_working_capital_days': 20,
-                'avg_cash_conversion_cycle': 30
-            },
-            'Logistics': {
-                'avg_gross_profit_margin': 0.22,
-                'avg_net_profit_margin': 0.06,
-                'avg_current_ratio': 1.4,
-                'avg_quick_ratio': 1.1,
-                'avg_debt_to_equity': 1.5,
-                'avg_interest_coverage': 2.8,
-                'avg_asset_turnover': 1.8,
-                'avg_inventory_turnover': 10.0,
-                'avg_working_capital_days': 35,
-                'avg_cash_conversion_cycle': 50
-            },
-            'E-commerce': {
-                'avg_gross_profit_margin': 0.30,
-                'avg_net_profit_margin': 0.07,
-                'avg_current_ratio': 1.6,
-                'avg_quick_ratio': 1.2,
-                'avg_debt_to_equity': 0.9,
-                'avg_interest_coverage': 3.2,
-                'avg_asset_turnover': 2.5,
-                'avg_inventory_turnover': 12.0,
-                'avg_working_capital_days': 25,
-                'avg_cash_conversion_cycle': 35
-            }
-        }
+        self.industry_benchmarks = _INDUSTRY_BENCHMARKS
+    
+    @classmethod
+    def clear_metrics_cache(cls) -> None:
+        """Drop all cached per-record metrics"""
+        cls._metrics_cache.clear()
     
     def calculate_financial_metrics(self, financial_data: Dict) -> Dict:
         """Calculate all financial metrics from raw financial data"""
-        metrics = {}
+        cache_key = _content_key(financial_data)
+        if cache_key is None:
+            return self._compute_financial_metrics(financial_data)
         
-        # Profitability Ratios
-        metrics['gross_profit_margin'] = self._calculate_gross_profit_margin(financial_data)
-        metrics['net_profit_margin'] = self._calculate_net_profit_margin(financial_data)
-        metrics['operating_margin'] = self._calculate_operating_margin(financial_data)
-        metrics['return_on_assets'] = self._calculate_return_on_assets(financial_data)
-        metrics['return_on_equity'] = self._calculate_return_on_equity(financial_data)
-        
-        # Liquidity Ratios
-        metrics['current_ratio'] = self._calculate_current_ratio(financial_data)
-        metrics['quick_ratio'] = self._calculate_quick_ratio(financial_data)
-        metrics['cash_ratio'] = self._calculate_cash_ratio(financial_data)
-        
-        # Leverage Ratios
-        metrics['debt_to_equity'] = self._calculate_debt_to_equity(financial_data)
-        metrics['debt_to_assets'] = self._calculate_debt_to_assets(financial_data)
-        metrics['interest_coverage_ratio'] = self._calculate_interest_coverage_ratio(financial_data)
-        
-        # Efficiency Ratios
-        metrics['asset_turnover'] = self._calculate_asset_turnover(financial_data)
-        metrics['inventory_turnover'] = self._calculate_inventory_turnover(financial_data)
-        metrics['accounts_receivable_turnover'] = self._calculate_ar_turnover(financial_data)
-        metrics['accounts_payable_turnover'] = self._calculate_ap_turnover(financial_data)
-        
-        # Working Capital Metrics
-        metrics['working_capital'] = self._calculate_working_capital(financial_data)
-        metrics['cash_conversion_cycle'] = self._calculate_cash_conversion_cycle(financial_data)
+        cached = self._metrics_cache.get(cache_key)
+        if cached is not None:
+            self._metrics_cache.move_to_end(cache_key)
+            return dict(cached)
         
+        metrics = self._compute_financial_metrics(financial_data)
+        cache = self._metrics_cache
+        cache[cache_key] = dict(metrics)
+        while len(cache) > self.METRICS_CACHE_SIZE:
+            cache.popitem(last=False)
         return metrics
     
+    def _compute_financial_metrics(self, financial_data: Dict) -> Dict:
+        """Metrics for one record, uncached"""
+        (revenue, gross_profit, net_income, operating_income, total_assets, equity,
+         current_assets, current_liabilities, inventory, cash, short_term_debt, long_term_debt,
+         interest_expense, cogs, receivables, payables) = map(financial_data.get, _FIELDS)
+        total_debt = _total_debt(short_term_debt, long_term_debt)
+        cash_conversion_cycle = _cash_conversion_cycle(inventory, receivables, payables, cogs, revenue)
+        
+        # Ratios need a present numerator and a non-zero denominator
+        return {
+            # Profitability Ratios
+            'gross_profit_margin': gross_profit / revenue if gross_profit is not None and revenue else None,
+            'net_profit_margin': net_income / revenue if net_income is not None and revenue else None,
+            'operating_margin': operating_income / revenue if operating_income is not None and revenue else None,
+            'return_on_assets': net_income / total_assets if net_income is not None and total_assets else None,
+            'return_on_equity': net_income / equity if net_income is not None and equity else None,
+            
+            # Liquidity Ratios
+            'current_ratio': (current_assets or 0) / current_liabilities if current_liabilities else None,
+            # If inventory is not available, the current ratio stands in for the quick ratio
+            'quick_ratio': ((current_assets - (inventory or 0)) / current_liabilities
+                            if current_assets is not None and current_liabilities else None),
+            'cash_ratio': cash / current_liabilities if cash is not None and current_liabilities else None,
+            
+            # Leverage Ratios
+            'debt_to_equity': total_debt / equity if total_debt is not None and equity else None,
+            'debt_to_assets': total_debt / total_assets if total_debt is not None and total_assets else None,
+            'interest_coverage_ratio': (operating_income / interest_expense
+                                        if operating_income is not None and interest_expense else None),
+            
+            # Efficiency Ratios
+            'asset_turnover': revenue / total_assets if revenue is not None and total_assets else None,
+            'inventory_turnover': cogs / inventory if cogs is not None and inventory else None,
+            'accounts_receivable_turnover': revenue / receivables if revenue is not None and receivables else None,
+            'accounts_payable_turnover': cogs / payables if cogs is not None and payables else None,
+            
+            # Working Capital Metrics
+            'working_capital': (current_assets - current_liabilities
+                                if current_assets is not None and current_liabilities is not None else None),
+            'cash_conversion_cycle': cash_conversion_cycle,
+        }
+    
+    def calculate_financial_metrics_batch(self, records: List[Dict]) -> List[Dict]:
+        """Calculate financial metrics for many records in one vectorized pass"""
+        n = len(records)
+        arr = {
+            f: np.fromiter((np.nan if r.get(f) is None else r[f] for r in records), dtype=np.float64, count=n)
+            for f in _FIELDS
+        }
+        revenue, net_income, current_liabilities = arr['revenue'], arr['net_income'], arr['current_liabilities']
+        current_assets, cogs = arr['current_assets'], arr['cost_of_goods_sold']
+        short_term_debt, long_term_debt = arr['short_term_debt'], arr['long_term_debt']
+        short_missing, long_missing = np.isnan(short_term_debt), np.isnan(long_term_debt)
+        total_debt = np.where(short_missing & long_missing, np.nan,
+                              np.where(short_missing, 0.0, short_term_debt) + np.where(long_missing, 0.0, long_term_debt))
+        has_current_assets = ~np.isnan(current_assets)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns = {
+                'gross_profit_margin': _ratio(arr['gross_profit'], revenue),
+                'net_profit_margin': _ratio(net_income, revenue),
+                'operating_margin': _ratio(arr['operating_income'], revenue),
+                'return_on_assets': _ratio(net_income, arr['total_assets']),
+                'return_on_equity': _ratio(net_income, arr['equity']),
+                'current_ratio': np.where(_present(current_liabilities), np.nan_to_num(current_assets) / current_liabilities, np.nan),
+                'quick_ratio': np.where(has_current_assets & _present(current_liabilities),
+                                        (current_assets - np.nan_to_num(arr['inventory'])) / current_liabilities, np.nan),
+                'cash_ratio': _ratio(arr['cash'], current_liabilities),
+                'debt_to_equity': _ratio(total_debt, arr['equity']),
+                'debt_to_assets': _ratio(total_debt, arr['total_assets']),
+                'interest_coverage_ratio': _ratio(arr['operating_income'], arr['interest_expense']),
+                'asset_turnover': _ratio(revenue, arr['total_assets']),
+                'inventory_turnover': _ratio(arr['cost_of_goods_sold'], arr['inventory']),
+                'accounts_receivable_turnover': _ratio(revenue, arr['accounts_receivable']),
+                'accounts_payable_turnover': _ratio(arr['cost_of_goods_sold'], arr['accounts_payable']),
+                'working_capital': current_assets - current_liabilities,
+                'cash_conversion_cycle': np.where(
+                    ~(np.isnan(arr['inventory']) | np.isnan(arr['accounts_receivable']) | np.isnan(arr['accounts_payable']))
+                    & (cogs > 0) & (revenue > 0),
+                    365.0 * (arr['inventory'] / cogs + arr['accounts_receivable'] / revenue - arr['accounts_payable'] / cogs),
+                    np.nan,
+                ),
+            }
+
+        names = list(columns)
+        rows = np.column_stack(list(columns.values())).tolist() if n else []
+        return [{name: (None if value != value else value) for name, value in zip(names, row)} for row in rows]
+    
+    # Per-metric helpers kept for existing callers; calculate_financial_metrics computes every metric inline
     def _calculate_gross_profit_margin(self, data: Dict) -> Optional[float]:
         """Gross Profit Margin = Gross Profit / Revenue"""
-        if data.get('gross_profit') and data.get('revenue'):
-            return data['gross_profit'] / data['revenue']
-        return None
+        return _simple_ratio(data, 'gross_profit', 'revenue')
     
     def _calculate_net_profit_margin(self, data: Dict) -> Optional[float]:
         """Net Profit Margin = Net Income / Revenue"""
-        if data.get('net_income') and data.get('revenue'):
-            return data['net_income'] / data['revenue']
-        return None
+        return _simple_ratio(data, 'net_income', 'revenue')
     
     def _calculate_operating_margin(self, data: Dict) -> Optional[float]:
         """Operating Margin = Operating Income / Revenue"""
-        if data.get('operating_income') and data.get('revenue'):
-            return data['operating_income'] / data['revenue']
-        return None
+        return _simple_ratio(data, 'operating_income', 'revenue')
     
     def _calculate_return_on_assets(self, data: Dict) -> Optional[float]:
         """Return on Assets = Net Income / Total Assets"""
-        if data.get('net_income') and data.get('total_assets'):
-            return data['net_income'] / data['total_assets']
-        return None
+        return _simple_ratio(data, 'net_income', 'total_assets')
     
     def _calculate_return_on_equity(self, data: Dict) -> Optional[float]:
         """Return on Equity = Net Income / Equity"""
-        if data.get('net_income') and data.get('equity'):
-            return data['net_income'] / data['equity']
-        return None
+        return _simple_ratio(data, 'net_income', 'equity')
     
     def _calculate_current_ratio(self, data: Dict) -> Optional[float]:
-        # Current ratio = current_assets / current_liabilities
-        current_assets = data.get('current_assets', 0)
-        current_liabilities = data.get('current_liabilities', 0)
-        if current_liabilities:
-            return current_assets / current_liabilities
-        else:
-            return None
+        """Current Ratio = Current Assets / Current Liabilities"""
+        current_liabilities = data.get('current_liabilities')
+        return (data.get('current_assets') or 0) / current_liabilities if current_liabilities else None
     
     def _calculate_quick_ratio(self, data: Dict) -> Optional[float]:
         """Quick Ratio = (Current Assets - Inventory) / Current Liabilities"""
-        if (data.get('current_assets') and data.get('current_liabilities') and 
-            data.get('inventory') is not None):
-            return (data['current_assets'] - data['inventory']) / data['current_liabilities']
-        elif data.get('current_assets') and data.get('current_liabilities'):
-            # If inventory not available, use current ratio as approximation
-            return data['current_assets'] / data['current_liabilities']
-        return None
+        current_assets, current_liabilities = data.get('current_assets'), data.get('current_liabilities')
+        if current_assets is None or not current_liabilities:
+            return None
+        # If inventory is not available, the current ratio stands in for the quick ratio
+        return (current_assets - (data.get('inventory') or 0)) / current_liabilities
     
     def _calculate_cash_ratio(self, data: Dict) -> Optional[float]:
         """Cash Ratio = Cash / Current Liabilities"""
-        if data.get('cash') and data.get('current_liabilities'):
-            return data['cash'] / data['current_liabilities']
-        return None
+        return _simple_ratio(data, 'cash', 'current_liabilities')
     
     def _calculate_debt_to_equity(self, data: Dict) -> Optional[float]:
         """Debt to Equity = Total Debt / Equity"""
-        total_debt = (data.get('short_term_debt', 0) + data.get('long_term_debt', 0))
-        if total_debt and data.get('equity'):
-            return total_debt / data['equity']
-        return None
+        total_debt = _total_debt(data.get('short_term_debt'), data.get('long_term_debt'))
+        equity = data.get('equity')
+        return total_debt / equity if total_debt is not None and equity else None
     
     def _calculate_debt_to_assets(self, data: Dict) -> Optional[float]:
         """Debt to Assets = Total Debt / Total Assets"""
-        total_debt = (data.get('short_term_debt', 0) + data.get('long_term_debt', 0))
-        if total_debt and data.get('total_assets'):
-            return total_debt / data['total_assets']
-        return None
+        total_debt = _total_debt(data.get('short_term_debt'), data.get('long_term_debt'))
+        total_assets = data.get('total_assets')
+        return total_debt / total_assets if total_debt is not None and total_assets else None
     
     def _calculate_interest_coverage_ratio(self, data: Dict) -> Optional[float]:
         """Interest Coverage = Operating Income / Interest Expense"""
-        if (data.get('operating_income') and data.get('interest_expense') and 
-            data['interest_expense'] != 0):
-            return data['operating_income'] / data['interest_expense']
-        return None
+        return _simple_ratio(data, 'operating_income', 'interest_expense')
     
     def _calculate_asset_turnover(self, data: Dict) -> Optional[float]:
         """Asset Turnover = Revenue / Total Assets"""
-        if data.get('revenue') and data.get('total_assets'):
-            return data['revenue'] / data['total_assets']
-        return None
+        return _simple_ratio(data, 'revenue', 'total_assets')
     
     def _calculate_inventory_turnover(self, data: Dict) -> Optional[float]:
         """Inventory Turnover = Cost of Goods Sold / Inventory"""
-        if data.get('cost_of_goods_sold') and data.get('inventory'):
-            return data['cost_of_goods_sold'] / data['inventory']
-        return None
+        return _simple_ratio(data, 'cost_of_goods_sold', 'inventory')
     
     def _calculate_ar_turnover(self, data: Dict) -> Optional[float]:
         """Accounts Receivable Turnover = Revenue / Accounts Receivable"""
-        if data.get('revenue') and data.get('accounts_receivable'):
-            return data['revenue'] / data['accounts_receivable']
-        return None
+        return _simple_ratio(data, 'revenue', 'accounts_receivable')
     
     def _calculate_ap_turnover(self, data: Dict) -> Optional[float]:
         """Accounts Payable Turnover = Cost of Goods Sold / Accounts Payable"""
-        if data.get('cost_of_goods_sold') and data.get('accounts_payable'):
-            return data['cost_of_goods_sold'] / data['accounts_payable']
-        return None
+        return _simple_ratio(data, 'cost_of_goods_sold', 'accounts_payable')
     
     def _calculate_working_capital(self, data: Dict) -> Optional[float]:
         """Working Capital = Current Assets - Current Liabilities"""
-        if data.get('current_assets') and data.get('current_liabilities'):
-            return data['current_assets'] - data['current_liabilities']
-        return None
+        current_assets, current_liabilities = data.get('current_assets'), data.get('current_liabilities')
+        if current_assets is None or current_liabilities is None:
+            return None
+        return current_assets - current_liabilities
     
     def _calculate_cash_conversion_cycle(self, data: Dict) -> Optional[float]:
         """Cash Conversion Cycle = DIO + DSO - DPO"""
-        if (data.get('inventory_turnover') and data.get('accounts_receivable_turnover') and 
-            data.get('accounts_payable_turnover')):
-            
-            # Days Inventory Outstanding
-            dio = 365 / data['inventory_turnover'] if data['inventory_turnover'] != 0 else 0
-            
-            # Days Sales Outstanding
-            dso = 365 / data['accounts_receivable_turnover'] if data['accounts_receivable_turnover'] != 0 else 0
-            
-            # Days Payable Outstanding
-            dpo = 365 / data['accounts_payable_turnover'] if data['accounts_payable_turnover'] != 0 else 0
-            
-            return dio + dso - dpo
-        
-        return None
+        return _cash_conversion_cycle(
+            data.get('inventory'), data.get('accounts_receivable'), data.get('accounts_payable'),
+            data.get('cost_of_goods_sold'), data.get('revenue'),
+        )
+    
+    @classmethod
+    def cache_clear(cls) -> None:
+        """Drop memoized credit and health scores"""
+        cls._credit_score_core.cache_clear()
+        cls._health_score_core.cache_clear()
     
     def calculate_credit_score(self, metrics: Dict, industry: str) -> Dict:
         """Calculate creditworthiness score using deterministic weighted scoring"""
+        return dict(self._credit_score_core(_metrics_key(metrics, _CREDIT_METRIC_KEYS), industry))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=_SCORE_CACHE_SIZE)
+    def _credit_score_core(key: tuple, industry: str) -> Dict:
+        """Score a metrics key; cached (shared by all instances), so callers must copy the result"""
+        metrics = dict(zip(_CREDIT_METRIC_KEYS, key))
         
         # Component scores (0-100)
-        profitability_score = self._score_profitability(metrics)
-        liquidity_score = self._score_liquidity(metrics)
-        leverage_score = self._score_leverage(metrics)
-        cash_stability_score = self._score_cash_stability(metrics)
+        profitability_score = FinancialCalculator._score_profitability(metrics)
+        liquidity_score = FinancialCalculator._score_liquidity(metrics)
+        leverage_score = FinancialCalculator._score_leverage(metrics)
+        cash_stability_score = FinancialCalculator._score_cash_stability(metrics)
         tax_compliance_score = 85  # Default assumption, can be updated with actual data
-        industry_risk_modifier = self._get_industry_risk_modifier(industry)
+        industry_risk_modifier = FinancialCalculator._get_industry_risk_modifier(industry)
         
         # Weighted scoring
-        weights = {
-            'profitability': 0.30,
-            'liquidity': 0.20,
-            'leverage': 0.20,
-            'cash_stability': 0.15,
-            'tax_compliance': 0.10,
-            'industry_risk': 0.05
-        }
-        
-        final_score = (
-            profitability_score * weights['profitability'] +
-            liquidity_score * weights['liquidity'] +
-            leverage_score * weights['leverage'] +
-            cash_stability_score * weights['cash_stability'] +
-            tax_compliance_score * weights['tax_compliance'] +
-            industry_risk_modifier * weights['industry_risk']
-        )
+        components = np.array([
+            profitability_score, liquidity_score, leverage_score,
+            cash_stability_score, tax_compliance_score, industry_risk_modifier,
+        ], dtype=np.float64)
+        final_score = float(_CREDIT_WEIGHTS @ components)
         
         # Grade assignment
-        if final_score >= 85:
-            grade = "A+"
-        elif final_score >= 75:
-            grade = "A"
-        elif final_score >= 65:
-            grade = "B+"
-        elif final_score >= 55:
-            grade = "B"
-        elif final_score >= 45:
-            grade = "C"
-        else:
-            grade = "D"
+        grade = _GRADES[bisect.bisect_right(_GRADE_THRESHOLDS, final_score)]
         
         return {
             'profitability_score': profitability_score,
@@ -291,110 +450,101 @@ class FinancialCalculator:
             'credit_grade': grade
         }
     
-    def _score_profitability(self, metrics: Dict) -> float:
+    @staticmethod
+    def _score_profitability(metrics: Dict) -> float:
         """Score profitability metrics (0-100)"""
         score = 50  # Base score
         
         if metrics.get('gross_profit_margin'):
-            if metrics['gross_profit_margin'] >= 0.4:
-                score += 25
-            elif metrics['gross_profit_margin'] >= 0.2:
-                score += 15
-            elif metrics['gross_profit_margin'] >= 0.1:
-                score += 5
+            score += _ladder_points(_GROSS_MARGIN_LADDER, metrics['gross_profit_margin'])
         
         if metrics.get('net_profit_margin'):
-            if metrics['net_profit_margin'] >= 0.15:
-                score += 25
-            elif metrics['net_profit_margin'] >= 0.08:
-                score += 15
-            elif metrics['net_profit_margin'] >= 0.03:
-                score += 5
+            score += _ladder_points(_NET_MARGIN_LADDER, metrics['net_profit_margin'])
         
-        return min(100, max(0, score))
+        return score
     
-    def _score_liquidity(self, metrics: Dict) -> float:
+    @staticmethod
+    def _score_liquidity(metrics: Dict) -> float:
         """Score liquidity metrics (0-100)"""
         score = 50  # Base score
         
         if metrics.get('current_ratio'):
-            if metrics['current_ratio'] >= 2.0:
-                score += 25
-            elif metrics['current_ratio'] >= 1.5:
-                score += 15
-            elif metrics['current_ratio'] >= 1.0:
-                score += 5
+            score += _ladder_points(_CURRENT_RATIO_LADDER, metrics['current_ratio'])
         
         if metrics.get('quick_ratio'):
-            if metrics['quick_ratio'] >= 1.5:
-                score += 25
-            elif metrics['quick_ratio'] >= 1.0:
-                score += 15
-            elif metrics['quick_ratio'] >= 0.8:
-                score += 5
+            score += _ladder_points(_QUICK_RATIO_LADDER, metrics['quick_ratio'])
         
-        return min(100, max(0, score))
+        return score
     
-    def _score_leverage(self, metrics: Dict) -> float:
+    @staticmethod
+    def _score_leverage(metrics: Dict) -> float:
         """Score leverage metrics (0-100)"""
         score = 50  # Base score
         
         if metrics.get('debt_to_equity'):
-            if metrics['debt_to_equity'] <= 0.5:
-                score += 25
-            elif metrics['debt_to_equity'] <= 1.0:
-                score += 15
-            elif metrics['debt_to_equity'] <= 1.5:
-                score += 5
+            score += _ladder_points(_DEBT_TO_EQUITY_LADDER, metrics['debt_to_equity'], side='left')
         
         if metrics.get('interest_coverage_ratio'):
-            if metrics['interest_coverage_ratio'] >= 5.0:
-                score += 25
-            elif metrics['interest_coverage_ratio'] >= 3.0:
-                score += 15
-            elif metrics['interest_coverage_ratio'] >= 2.0:
-                score += 5
+            score += _ladder_points(_INTEREST_COVERAGE_LADDER, metrics['interest_coverage_ratio'])
         
-        return min(100, max(0, score))
+        return score
     
-    def _score_cash_stability(self, metrics: Dict) -> float:
+    @staticmethod
+    def _score_cash_stability(metrics: Dict) -> float:
         """Score cash stability metrics (0-100)"""
         score = 50  # Base score
         
         if metrics.get('cash_ratio'):
-            if metrics['cash_ratio'] >= 0.5:
-                score += 25
-            elif metrics['cash_ratio'] >= 0.3:
-                score += 15
-            elif metrics['cash_ratio'] >= 0.1:
-                score += 5
+            score += _ladder_points(_CASH_RATIO_LADDER, metrics['cash_ratio'])
         
         if metrics.get('working_capital'):
             # Positive working capital is good
             if metrics['working_capital'] > 0:
                 score += 25
         
-        return min(100, max(0, score))
+        return score
     
-    def _get_industry_risk_modifier(self, industry: str) -> float:
+    @staticmethod
+    def _get_industry_risk_modifier(industry: str) -> float:
         """Get industry risk modifier score (0-100)"""
-        industry_risk_scores = {
-            'Manufacturing': 75,
-            'Retail': 70,
-            'Agriculture': 60,
-            'Services': 85,
-            'Logistics': 72,
-            'E-commerce': 68
-        }
+        return _INDUSTRY_RISK.get(industry, 70)
+    
+    def calculate_scores_batch(self, metrics_list: List[Dict], industries: List[str]) -> List[Dict]:
+        """Credit and health scores for many metric records in one vectorized pass"""
+        n = len(metrics_list)
+        if not n:
+            return []
+        metrics = np.array(
+            [[np.nan if (value := m.get(k)) is None else value for k in _SCORE_BATCH_METRICS] for m in metrics_list],
+            dtype=np.float64,
+        )
+        industry_codes = np.fromiter((_INDUSTRY_CODES.get(i, _UNKNOWN_INDUSTRY_CODE) for i in industries),
+                                     dtype=np.int8, count=n)
+        scores = _score_batch(metrics, industry_codes)
+        credit_grades = np.searchsorted(_GRADE_THRESHOLDS, scores[:, 6], side='right')
+        health_grades = np.searchsorted(_HEALTH_GRADE_THRESHOLDS, scores[:, 7], side='right')
         
-        return industry_risk_scores.get(industry, 70)
+        results = []
+        for row, credit_grade, health_grade in zip(scores.tolist(), credit_grades.tolist(), health_grades.tolist()):
+            result = dict(zip(_SCORE_BATCH_OUTPUTS, row))
+            result['credit_grade'] = _GRADES[credit_grade]
+            result['financial_health_score'] = round(result['financial_health_score'], 1)
+            result['health_grade'] = _HEALTH_GRADES[health_grade]
+            results.append(result)
+        return results
     
     def generate_forecast(self, historical_data: List[Dict], periods: int = 12) -> Dict:
-        """Generate financial forecast using linear regression"""
+        """Generate financial forecast using linear regression (series are ndarrays; see forecast_payload)"""
         if not historical_data:
             return self._generate_simple_forecast(historical_data, periods)
 
-        data_sorted = sorted(historical_data, key=lambda x: x.get('period', ''))
+        if len(historical_data) < 2:
+            data_sorted = historical_data
+        else:
+            try:
+                data_sorted = sorted(historical_data, key=itemgetter('period'))
+            except (KeyError, TypeError):
+                data_sorted = sorted(historical_data, key=lambda x: x.get('period') or '')
 
         forecasts: Dict = {
             'confidence_level': 0.95,
@@ -402,22 +552,31 @@ class FinancialCalculator:
             'lower_bound': []
         }
 
-        revenue_series = [d.get('revenue') for d in data_sorted if d.get('revenue') is not None]
-        if revenue_series:
-            forecasts['revenue_forecast'] = self._linear_regression_forecast(revenue_series, periods)
-
-        expense_series = [d.get('total_expenses') for d in data_sorted if d.get('total_expenses') is not None]
-        if not expense_series:
-            expense_series = [d.get('cost_of_goods_sold') for d in data_sorted if d.get('cost_of_goods_sold') is not None]
-        if expense_series:
-            forecasts['expense_forecast'] = self._linear_regression_forecast(expense_series, periods)
+        # Collect all series in one pass; COGS stands in for expenses only if no period reports total_expenses
+        revenue_series, expense_series, cogs_series, cash_series = [], [], [], []
+        for d in data_sorted:
+            get = d.get
+            if (value := get('revenue')) is not None:
+                revenue_series.append(value)
+            if (value := get('total_expenses')) is not None:
+                expense_series.append(value)
+            if (value := get('cost_of_goods_sold')) is not None:
+                cogs_series.append(value)
+            if (value := get('net_cash_flow')) is not None:
+                cash_series.append(value)
+        expense_series = expense_series or cogs_series
 
-        cash_series = [d.get('net_cash_flow') for d in data_sorted if d.get('net_cash_flow') is not None]
-        if cash_series:
-            forecasts['cash_flow_forecast'] = self._linear_regression_forecast(cash_series, periods)
+        for key, series in (('revenue_forecast', revenue_series), ('expense_forecast', expense_series),
+                            ('cash_flow_forecast', cash_series)):
+            if len(series) >= 2:
+                forecasts[key] = _ols_forecast(np.asarray(series, dtype=np.float64), periods)
+            elif series:
+                # A single observation fits a flat line; no need to run the regression
+                forecasts[key] = np.full(periods, float(series[0]))
 
-        if 'revenue_forecast' in forecasts and len(forecasts['revenue_forecast']) >= 2 and forecasts['revenue_forecast'][0] not in (0, None):
-            forecasts['growth_rate'] = (forecasts['revenue_forecast'][-1] - forecasts['revenue_forecast'][0]) / forecasts['revenue_forecast'][0]
+        revenue_forecast = forecasts.get('revenue_forecast')
+        if revenue_forecast is not None and revenue_forecast.size >= 2 and revenue_forecast[0] != 0:
+            forecasts['growth_rate'] = float((revenue_forecast[-1] - revenue_forecast[0]) / revenue_forecast[0])
         else:
             forecasts['growth_rate'] = 0
 
@@ -425,136 +584,47 @@ class FinancialCalculator:
     
     def calculate_financial_health_score(self, metrics: Dict) -> Dict:
         """Calculate a composite financial health score (0-100)"""
-        score = 0
-        weights = {
-            'profitability': 0.25,
-            'liquidity': 0.20,
-            'leverage': 0.20,
-            'efficiency': 0.15,
-            'cash_stability': 0.20
+        result = self._health_score_core(_metrics_key(metrics, _HEALTH_METRIC_KEYS))
+        return {**result, 'components': dict(result['components'])}
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=_SCORE_CACHE_SIZE)
+    def _health_score_core(key: tuple) -> Dict:
+        """Score a metrics key; cached (shared by all instances), so callers must copy the result"""
+        net_margin, current_ratio, debt_to_equity, asset_turnover, working_capital = key
+        # Missing metrics score a neutral 50
+        components = {
+            'profitability': 50 if net_margin is None else _ladder_points(_HEALTH_PROFITABILITY_LADDER, net_margin),
+            'liquidity': 50 if current_ratio is None else _ladder_points(_HEALTH_LIQUIDITY_LADDER, current_ratio),
+            'leverage': (50 if debt_to_equity is None
+                         else _ladder_points(_HEALTH_LEVERAGE_LADDER, debt_to_equity, side='left')),
+            'efficiency': 50 if asset_turnover is None else _ladder_points(_HEALTH_EFFICIENCY_LADDER, asset_turnover),
+            'cash_stability': 50 if working_capital is None else (100 if working_capital > 0 else 0),
         }
-        components = {}
-        # Profitability component
-        net_margin = metrics.get('net_profit_margin')
-        if net_margin is not None:
-            if net_margin >= 0.15:
-                components['profitability'] = 100
-            elif net_margin >= 0.08:
-                components['profitability'] = 80
-            elif net_margin >= 0.03:
-                components['profitability'] = 60
-            elif net_margin >= 0:
-                components['profitability'] = 40
-            else:
-                components['profitability'] = 0
-        else:
-            components['profitability'] = 50
-        # Liquidity component
-        current_ratio = metrics.get('current_ratio')
-        if current_ratio is not None:
-            if current_ratio >= 2.0:
-                components['liquidity'] = 100
-            elif current_ratio >= 1.5:
-                components['liquidity'] = 80
-            elif current_ratio >= 1.0:
-                components['liquidity'] = 60
-            elif current_ratio >= 0.5:
-                components['liquidity'] = 40
-            else:
-                components['liquidity'] = 0
-        else:
-            components['liquidity'] = 50
-        # Leverage component
-        debt_to_equity = metrics.get('debt_to_equity')
-        if debt_to_equity is not None:
-            if debt_to_equity <= 0.5:
-                components['leverage'] = 100
-            elif debt_to_equity <= 1.0:
-                components['leverage'] = 80
-            elif debt_to_equity <= 1.5:
-                components['leverage'] = 60
-            elif debt_to_equity <= 2.0:
-                components['leverage'] = 40
-            else:
-                components['leverage'] = 0
-        else:
-            components['leverage'] = 50
-        # Efficiency component (asset turnover)
-        asset_turnover = metrics.get('asset_turnover')
-        if asset_turnover is not None:
-            if asset_turnover >= 2.0:
-                components['efficiency'] = 100
-            elif asset_turnover >= 1.5:
-                components['efficiency'] = 80
-            elif asset_turnover >= 1.0:
-                components['efficiency'] = 60
-            elif asset_turnover >= 0.5:
-                components['efficiency'] = 40
-            else:
-                components['efficiency'] = 0
-        else:
-            components['efficiency'] = 50
-        # Cash stability component (working capital)
-        working_capital = metrics.get('working_capital')
-        if working_capital is not None:
-            if working_capital > 0:
-                components['cash_stability'] = 100
-            else:
-                components['cash_stability'] = 0
-        else:
-            components['cash_stability'] = 50
-        # Weighted score
-        for k, v in components.items():
-            score += v * weights[k]
-        # Grade
-        if score >= 85:
-            grade = 'Excellent'
-        elif score >= 70:
-            grade = 'Good'
-        elif score >= 55:
-            grade = 'Fair'
-        elif score >= 40:
-            grade = 'Poor'
-        else:
-            grade = 'Critical'
+        # Weighted score (components are built in _HEALTH_COMPONENTS order)
+        score = float(_HEALTH_WEIGHTS @ np.fromiter(components.values(), dtype=np.float64, count=len(components)))
+        grade = _HEALTH_GRADES[bisect.bisect_right(_HEALTH_GRADE_THRESHOLDS, score)]
         return {
             'financial_health_score': round(score, 1),
             'grade': grade,
             'components': components
         }
     
-    def _linear_regression_forecast(self, series: List[float], periods: int) -> List[float]:
+    def _linear_regression_forecast(self, series: List[float], periods: int) -> np.ndarray:
         """Generate forecast using linear regression"""
         clean_series = [float(v) for v in series if v is not None]
         if len(clean_series) < 2:
-            base = clean_series[0] if clean_series else 0.0
-            return [base] * periods
-
-        # Simple OLS: y = a*x + b
-        n = len(clean_series)
-        xs = list(range(n))
-        x_mean = sum(xs) / n
-        y_mean = sum(clean_series) / n
-
-        denom = sum((x - x_mean) ** 2 for x in xs)
-        if denom == 0:
-            a = 0.0
-        else:
-            a = sum((xs[i] - x_mean) * (clean_series[i] - y_mean) for i in range(n)) / denom
-        b = y_mean - a * x_mean
+            return np.full(periods, clean_series[0] if clean_series else 0.0)
 
-        forecast = []
-        for i in range(n, n + periods):
-            forecast.append(a * i + b)
-        return forecast
+        return _ols_forecast(np.asarray(clean_series, dtype=np.float64), periods)
     
     def _generate_simple_forecast(self, historical_data: List[Dict], periods: int) -> Dict:
         """Generate simple forecast based on average growth"""
         if not historical_data:
             return {
-                'revenue_forecast': [0] * periods,
-                'expense_forecast': [0] * periods,
-                'cash_flow_forecast': [0] * periods,
+                'revenue_forecast': np.zeros(periods),
+                'expense_forecast': np.zeros(periods),
+                'cash_flow_forecast': np.zeros(periods),
                 'growth_rate': 0,
                 'confidence_level': 0.5
             }
@@ -569,12 +639,28 @@ class FinancialCalculator:
         # Apply simple growth assumption
         growth_rate = 0.05  # 5% growth assumption
         
+        # Compound factors for all periods in one vectorized pow per series
+        idx = np.arange(periods, dtype=np.float64)
+        
         forecasts = {
-            'revenue_forecast': [revenue * (1 + growth_rate) ** i for i in range(periods)],
-            'expense_forecast': [expenses * (1 + growth_rate * 0.8) ** i for i in range(periods)],
-            'cash_flow_forecast': [cash_flow * (1 + growth_rate * 0.6) ** i for i in range(periods)],
+            'revenue_forecast': revenue * (1 + growth_rate) ** idx,
+            'expense_forecast': expenses * (1 + growth_rate * 0.8) ** idx,
+            'cash_flow_forecast': cash_flow * (1 + growth_rate * 0.6) ** idx,
             'growth_rate': growth_rate,
             'confidence_level': 0.5
         }
         
         return forecasts
+
+
+# Shared stateless instance so request handlers do not rebuild a calculator per call
+_DEFAULT_CALCULATOR = FinancialCalculator()
+
+
+def get_calculator() -> FinancialCalculator:
+    return _DEFAULT_CALCULATOR
+
+
+def forecast_payload(forecasts: Dict) -> Dict:
+    """JSON-ready copy of a forecast dict, with ndarray series converted to lists"""
+    return {key: value.tolist() if isinstance(value, np.ndarray) else value for key, value in forecasts.items()}
@@ -1,21 +1,137 @@
 import numpy as np
-from typing import Dict, List, Any, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import repeat
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+from sqlalchemy import Float, cast, delete, func, insert, select
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
 from decimal import Decimal
+from utils._cache_generation import bump_generation, cache_generation
+from utils._numeric_kernels import coefficient_of_variation, compound_growth_rate
 from models import MonthlySummary, ForecastSummary
 
+# Response for companies without enough history, built once and shared read-only
+_EMPTY_FORECAST = MappingProxyType({
+    'forecast_type': 'Base',
+    'months_ahead': 0,
+    'historical_months_used': 0,
+    'projections': (),
+    'runway_months': None,
+    'confidence_score': None,
+    'revenue_growth_rate': None,
+    'expense_growth_rate': None,
+    'cash_flow_volatility': None,
+    'historical_data': MappingProxyType({
+        'revenues': (),
+        'expenses': (),
+        'cash_flows': (),
+        'months': ()
+    })
+})
+
+
+def _float_column(column):
+    """Numeric column read as a float, with NULL as 0.0, so rows need no Decimal conversion"""
+    return func.coalesce(cast(column, Float), 0.0).label(column.key)
+
+
+@lru_cache(maxsize=64)
+def _projection_steps(months_ahead: int) -> np.ndarray:
+    """Read-only compounding exponents 1..months_ahead, built once per horizon"""
+    steps = np.arange(1, months_ahead + 1, dtype=np.float64)
+    steps.setflags(write=False)
+    return steps
+
+
+def _month_index(month: str) -> int:
+    """Months since year 0 for a 'YYYY-MM' label, so calendar steps are integer additions"""
+    year, month_number = month.split('-')
+    return int(year) * 12 + int(month_number) - 1
+
+
 class FinancialForecaster:
     """Deterministic financial forecasting engine"""
     
+    # Forecasts cached per (company, forecast type, horizon) with the latest month they were computed
+    # from and the company's shared cache generation, so invalidations reach every worker process
+    FORECAST_CACHE_SIZE = 512
+    _forecast_cache: "OrderedDict[Tuple[str, str, int], Tuple[str, Dict[str, Any], int]]" = OrderedDict()
+    
+    @classmethod
+    def invalidate_cache(cls, company_id: str):
+        """Drop every cached forecast for a company after its monthly data changes"""
+        company_key = str(company_id)
+        for cache_key in [key for key in cls._forecast_cache if key[0] == company_key]:
+            cls._forecast_cache.pop(cache_key, None)
+        bump_generation('forecast', company_key)
+    
+    @staticmethod
+    def fetch_recent_summaries(company_id: str, db: Session, limit: int = 6) -> List:
+        """Fetch the newest monthly rows the forecast works from, newest first"""
+        return db.query(
+            _float_column(MonthlySummary.revenue), _float_column(MonthlySummary.operating_expense),
+            _float_column(MonthlySummary.operating_cash_flow), MonthlySummary.month
+        ).filter(
+            MonthlySummary.company_id == company_id
+        ).order_by(MonthlySummary.month.desc()).limit(limit).all()
+    
     def generate_forecast(self, company_id: str, db: Session, months_ahead: int = 6, 
-                         forecast_type: str = 'Base') -> Dict[str, Any]:
-        """Generate financial forecast for specified months ahead"""
+                         forecast_type: str = 'Base', summaries: Optional[List] = None) -> Dict[str, Any]:
+        """Generate financial forecast for specified months ahead, reusing the cached result for the latest month
+        
+        Callers running several scenarios back to back can pass rows from fetch_recent_summaries
+        so the monthly data is queried once.
+        """
+        if summaries is not None:
+            latest_month = summaries[0].month if summaries else None
+        else:
+            latest_month = db.execute(select(func.max(MonthlySummary.month)).where(
+                MonthlySummary.company_id == company_id
+            )).scalar()
+        if latest_month is None:
+            return self._empty_forecast_response()
+        
+        cache_key = (str(company_id), forecast_type, months_ahead)
+        # None when Redis is configured but unreachable: nothing cached can be trusted then
+        generation = cache_generation('forecast', cache_key[0])
+        entry = self._forecast_cache.get(cache_key)
+        if entry is not None and entry[0] == latest_month and entry[2] == generation:
+            self._forecast_cache.move_to_end(cache_key)
+            result = entry[1]
+            if result['projections']:
+                # Another horizon or worker may have replaced the stored rows since, so write these back
+                self._store_projections(company_id, db, result['projections'], forecast_type,
+                                        result['revenue_growth_rate'], result['expense_growth_rate'],
+                                        result['cash_flow_volatility'], result['confidence_score'])
+            return result
+        
+        result = self._compute_forecast(company_id, db, months_ahead, forecast_type, summaries)
+        if generation is None:
+            return result
+        cache = self._forecast_cache
+        cache[cache_key] = (latest_month, result, generation)
+        cache.move_to_end(cache_key)
+        while len(cache) > self.FORECAST_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+    
+    def generate_scenarios(self, company_id: str, db: Session, months_ahead: int = 6,
+                           forecast_types: Tuple[str, ...] = ('Base', 'Optimistic', 'Conservative')) -> Dict[str, Dict[str, Any]]:
+        """Generate several forecast scenarios from a single fetch of the monthly data"""
+        summaries = self.fetch_recent_summaries(company_id, db)
+        return {
+            forecast_type: self.generate_forecast(company_id, db, months_ahead, forecast_type, summaries)
+            for forecast_type in forecast_types
+        }
+    
+    def _compute_forecast(self, company_id: str, db: Session, months_ahead: int,
+                          forecast_type: str, summaries: Optional[List] = None) -> Dict[str, Any]:
+        """Generate and store financial forecast for specified months ahead"""
         
         # Get historical data (last 3-6 months)
-        summaries = db.query(MonthlySummary).filter(
-            MonthlySummary.company_id == company_id
-        ).order_by(MonthlySummary.month.desc()).limit(6).all()
+        if summaries is None:
+            summaries = self.fetch_recent_summaries(company_id, db)
         
         if len(summaries) < 3:
             return self._empty_forecast_response()
@@ -62,53 +178,32 @@ class FinancialForecaster:
             'expense_growth_rate': float(expense_growth_rate),
             'cash_flow_volatility': float(cash_flow_volatility),
             'historical_data': {
-                'revenues': [float(r) for r in reversed(historical_data['revenues'])],
-                'expenses': [float(e) for e in reversed(historical_data['expenses'])],
-                'cash_flows': [float(c) for c in reversed(historical_data['cash_flows'])],
-                'months': list(reversed(historical_data['months']))
+                'revenues': historical_data['revenues'][::-1].tolist(),
+                'expenses': historical_data['expenses'][::-1].tolist(),
+                'cash_flows': historical_data['cash_flows'][::-1].tolist(),
+                'months': historical_data['months'][::-1]
             }
         }
     
-    def _prepare_historical_data(self, summaries: List) -> Dict[str, List]:
-        """Prepare historical data arrays"""
-        data = {
-            'revenues': [],
-            'expenses': [],
-            'cash_flows': [],
-            'months': []
+    def _prepare_historical_data(self, summaries: List) -> Dict[str, Any]:
+        """Prepare historical data as float64 arrays (oldest to newest), the month labels and the latest month index"""
+        n = len(summaries)
+        oldest_first = summaries[::-1]
+        return {
+            'revenues': np.fromiter((s.revenue for s in oldest_first), dtype=np.float64, count=n),
+            'expenses': np.fromiter((s.operating_expense for s in oldest_first), dtype=np.float64, count=n),
+            'cash_flows': np.fromiter((s.operating_cash_flow for s in oldest_first), dtype=np.float64, count=n),
+            'months': [s.month for s in oldest_first],
+            'last_month_index': _month_index(summaries[0].month)
         }
-        
-        for summary in reversed(summaries):  # Oldest to newest
-            data['revenues'].append(float(summary.revenue or 0))
-            data['expenses'].append(float(summary.operating_expense or 0))
-            data['cash_flows'].append(float(summary.operating_cash_flow or 0))
-            data['months'].append(summary.month)
-        
-        return data
     
     def _calculate_growth_rate(self, values: List[float]) -> float:
         """Calculate compound monthly growth rate"""
-        if len(values) < 2 or values[0] == 0:
-            return 0
-        
-        start_value = values[0]
-        end_value = values[-1]
-        periods = len(values) - 1
-        
-        return (end_value / start_value) ** (1/periods) - 1
+        return compound_growth_rate(values)
     
     def _calculate_volatility(self, values: List[float]) -> float:
         """Calculate coefficient of variation"""
-        if len(values) < 2 or not any(values):
-            return 1.0
-        
-        values_array = np.array(values)
-        mean = np.mean(values_array)
-        if mean == 0:
-            return 1.0
-        
-        std_dev = np.std(values_array)
-        return std_dev / abs(mean)
+        return coefficient_of_variation(values)
     
     def _apply_forecast_type_adjustments(self, revenue_growth: float, expense_growth: float,
                                         forecast_type: str, volatility: float) -> Tuple[float, float]:
@@ -132,58 +227,62 @@ class FinancialForecaster:
     def _generate_projections(self, historical_data: Dict, revenue_growth: float,
                             expense_growth: float, months_ahead: int) -> List[Dict]:
         """Generate month-by-month projections"""
-        projections = []
-        
         # Get last actual values
         last_revenue = historical_data['revenues'][-1]
         last_expense = historical_data['expenses'][-1]
-        last_cash_flow = historical_data['cash_flows'][-1]
-        last_month = historical_data['months'][-1]
-        
-        # Parse last month to get date
-        year, month = map(int, last_month.split('-'))
-        last_date = datetime(year, month, 1)
-        
-        for i in range(1, months_ahead + 1):
-            # Project next month
-            projected_revenue = last_revenue * (1 + revenue_growth) ** i
-            projected_expense = last_expense * (1 + expense_growth) ** i
-            projected_net_income = projected_revenue - projected_expense
-            
-            # Estimate cash flow (typically 70-90% of net income for stable businesses)
-            cash_flow_ratio = 0.8  # Can be adjusted based on historical patterns
-            projected_cash_flow = projected_net_income * cash_flow_ratio
-            
-            # Calculate projection month
-            projection_date = last_date + timedelta(days=30 * i)
-            projection_month = projection_date.strftime('%Y-%m')
-            
-            projections.append({
+        last_month_index = historical_data['last_month_index']
+        
+        # Compound all months at once
+        steps = _projection_steps(months_ahead)
+        projected_revenue = last_revenue * (1 + revenue_growth) ** steps
+        projected_expense = last_expense * (1 + expense_growth) ** steps
+        projected_net_income = projected_revenue - projected_expense
+        
+        # Estimate cash flow (typically 70-90% of net income for stable businesses)
+        cash_flow_ratio = 0.8  # Can be adjusted based on historical patterns
+        projected_cash_flow = projected_net_income * cash_flow_ratio
+        
+        # Calendar months following the last actual month
+        projection_months = [
+            f"{year:04d}-{month + 1:02d}"
+            for year, month in map(divmod, range(last_month_index + 1, last_month_index + months_ahead + 1), repeat(12))
+        ]
+        
+        return [
+            {
                 'projection_month': projection_month,
-                'projected_revenue': round(projected_revenue, 2),
-                'projected_expenses': round(projected_expense, 2),
-                'projected_net_income': round(projected_net_income, 2),
-                'projected_cash_flow': round(projected_cash_flow, 2)
-            })
-        
-        return projections
+                'projected_revenue': revenue,
+                'projected_expenses': expense,
+                'projected_net_income': net_income,
+                'projected_cash_flow': cash_flow
+            }
+            for projection_month, revenue, expense, net_income, cash_flow in zip(
+                projection_months,
+                np.round(projected_revenue, 2).tolist(),
+                np.round(projected_expense, 2).tolist(),
+                np.round(projected_net_income, 2).tolist(),
+                np.round(projected_cash_flow, 2).tolist(),
+            )
+        ]
     
     def _calculate_runway(self, historical_data: Dict, projections: List[Dict]) -> float:
         """Calculate cash runway in months"""
         # Get current cash balance (use last cash flow as proxy)
         current_cash = max(0, historical_data['cash_flows'][-1])
         
-        # Calculate average monthly burn (negative cash flow)
-        avg_burn = 0
-        negative_months = [cf for cf in historical_data['cash_flows'] if cf < 0]
-        
-        if negative_months:
-            avg_burn = abs(sum(negative_months) / len(negative_months))
-        
-        # Include projected negative cash flows
-        projected_negative = [p['projected_cash_flow'] for p in projections if p['projected_cash_flow'] < 0]
-        if projected_negative:
-            avg_burn = (avg_burn * len(negative_months) + abs(sum(projected_negative))) / (len(negative_months) + len(projected_negative))
+        # Average monthly burn over the negative historical and projected cash flows, in one pass each
+        burn_months = 0
+        burn_total = 0.0
+        for cf in historical_data['cash_flows'].tolist():
+            if cf < 0:
+                burn_months += 1
+                burn_total -= cf
+        for p in projections:
+            cf = p['projected_cash_flow']
+            if cf < 0:
+                burn_months += 1
+                burn_total -= cf
+        avg_burn = burn_total / burn_months if burn_months else 0
         
         if avg_burn == 0:
             return 999.99  # Infinite runway
@@ -219,48 +318,35 @@ class FinancialForecaster:
                           forecast_type: str, revenue_growth: float, expense_growth: float,
                           volatility: float, confidence: float):
         """Store projections in database"""
-        # Delete existing forecasts for this company and type
-        db.query(ForecastSummary).filter(
+        # Replace existing forecasts for this company and type in one transaction:
+        # a single DELETE followed by one multi-row INSERT
+        db.execute(delete(ForecastSummary).where(
             ForecastSummary.company_id == company_id,
             ForecastSummary.forecast_type == forecast_type
-        ).delete()
-        
-        # Insert new projections
-        for projection in projections:
-            forecast = ForecastSummary(
-                company_id=company_id,
-                projection_month=projection['projection_month'],
-                projected_revenue=projection['projected_revenue'],
-                projected_expenses=projection['projected_expenses'],
-                projected_net_income=projection['projected_net_income'],
-                projected_cash_flow=projection['projected_cash_flow'],
-                forecast_type=forecast_type,
-                months_used=len(projections),
-                revenue_growth_rate=revenue_growth,
-                expense_growth_rate=expense_growth,
-                cash_flow_volatility=volatility,
-                confidence_score=confidence
-            )
-            db.add(forecast)
+        ))
+        
+        if projections:
+            months_used = len(projections)
+            db.execute(insert(ForecastSummary), [
+                {
+                    'company_id': company_id,
+                    'projection_month': projection['projection_month'],
+                    'projected_revenue': projection['projected_revenue'],
+                    'projected_expenses': projection['projected_expenses'],
+                    'projected_net_income': projection['projected_net_income'],
+                    'projected_cash_flow': projection['projected_cash_flow'],
+                    'forecast_type': forecast_type,
+                    'months_used': months_used,
+                    'revenue_growth_rate': revenue_growth,
+                    'expense_growth_rate': expense_growth,
+                    'cash_flow_volatility': volatility,
+                    'confidence_score': confidence,
+                }
+                for projection in projections
+            ])
         
         db.commit()
     
     def _empty_forecast_response(self) -> Dict[str, Any]:
         """Return empty response when insufficient data"""
-        return {
-            'forecast_type': 'Base',
-            'months_ahead': 0,
-            'historical_months_used': 0,
-            'projections': [],
-            'runway_months': None,
-            'confidence_score': None,
-            'revenue_growth_rate': None,
-            'expense_growth_rate': None,
-            'cash_flow_volatility': None,
-            'historical_data': {
-                'revenues': [],
-                'expenses': [],
-                'cash_flows': [],
-                'months': []
-            }
-        }
+        return _EMPTY_FORECAST
@@ -1,8 +1,86 @@
+import bisect
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from collections import OrderedDict, defaultdict
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Any
+from sqlalchemy import Float, cast, func, select
 from sqlalchemy.orm import Session
+from utils._cache_generation import bump_generation, cache_generation, cache_generations
+from utils._numeric_kernels import coefficient_of_variation, compound_growth_rate
 from models import MonthlySummary
 
+# Score for each band of a threshold ladder, worst band first
+_BAND_SCORES = (20, 40, 60, 80, 100)
+
+# Cash flow score: base points by share of positive months, plus a bonus while volatility stays below a cut-off
+_POSITIVE_CASH_FLOW_LADDER = ((0.4, 0.6, 0.8), (20, 40, 60, 80))
+_CASH_FLOW_STABILITY_BONUS = ((0.3, 0.5), (20, 10, 0))
+
+# Response for companies without enough history, built once and shared read-only
+_EMPTY_HEALTH = MappingProxyType({
+    'health_score': None,
+    'health_category': 'No Data',
+    'component_scores': MappingProxyType({
+        'profitability': None,
+        'liquidity': None,
+        'leverage': None,
+        'cash_flow': None,
+        'growth': None
+    }),
+    'component_details': MappingProxyType({
+        'net_margin': None,
+        'current_ratio': None,
+        'debt_to_equity': None,
+        'cash_flow_stability': None,
+        'revenue_growth_rate': None
+    }),
+    'improvement_recommendations': ()
+})
+
+
+def _float_column(column):
+    """Numeric column read as a float, with NULL as 0.0, so rows need no Decimal conversion"""
+    return func.coalesce(cast(column, Float), 0.0).label(column.key)
+
+
+def _ladder(thresholds: Dict[str, float], lower_is_better: bool = False) -> Tuple[Tuple[float, ...], Tuple[int, ...]]:
+    """(ascending cut-offs, score per band) for one THRESHOLDS entry"""
+    return tuple(sorted(thresholds.values())), _BAND_SCORES[::-1] if lower_is_better else _BAND_SCORES
+
+
+def _band_score(ladder: Tuple[Tuple[float, ...], Tuple[int, ...]], value: float, lower_is_better: bool = False) -> int:
+    # Higher-is-better values score the band of the highest cut-off they reach (>=);
+    # lower-is-better values keep a band while they are <= its cut-off
+    cutoffs, scores = ladder
+    index = bisect.bisect_left(cutoffs, value) if lower_is_better else bisect.bisect_right(cutoffs, value)
+    return scores[index]
+
+
+def _ladder_scores(ladder: Tuple[Tuple[float, ...], Tuple[int, ...]], values: np.ndarray,
+                   lower_is_better: bool = False) -> np.ndarray:
+    """Vectorized _band_score"""
+    cutoffs, scores = ladder
+    index = np.searchsorted(cutoffs, values, side='left' if lower_is_better else 'right')
+    return np.asarray(scores, dtype=np.float64)[index]
+
+
+def _row_stats(values: np.ndarray, lengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-row coefficient of variation and compound growth of right-aligned, NaN-padded series"""
+    present = ~np.isnan(values)
+    mean = np.where(present, values, 0).sum(axis=1) / lengths
+    deviations = np.where(present, values - mean[:, None], 0)
+    std = np.sqrt((deviations * deviations).sum(axis=1) / lengths)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv = np.where(mean == 0, 1.0, std / np.abs(mean))
+        first = values[np.arange(len(values)), values.shape[1] - lengths]
+        ratio = values[:, -1] / first
+        # Same rules as series_stats: the ratio over one period, expm1(log(ratio) / periods) over
+        # more, and -100% when a multi-period series hits zero or changes sign
+        compound = np.where(ratio > 0, np.expm1(np.log(ratio) / (lengths - 1)), -1.0)
+        growth = np.where(first == 0, 0.0, np.where(lengths == 2, ratio - 1, compound))
+    return cv, growth
+
+
 class FinancialHealthCalculator:
     """Deterministic financial health calculator with weighted component scoring"""
     
@@ -24,44 +102,252 @@ class FinancialHealthCalculator:
         'revenue_growth': {'excellent': 0.20, 'good': 0.10, 'moderate': 0.03, 'weak': 0}
     }
     
-    def calculate_comprehensive_health(self, company_id: str, db: Session) -> Dict[str, Any]:
+    # THRESHOLDS as sorted cut-off / score tables for bisect lookups
+    _NET_MARGIN_LADDER = _ladder(THRESHOLDS['net_margin'])
+    _CURRENT_RATIO_LADDER = _ladder(THRESHOLDS['current_ratio'])
+    _DEBT_TO_EQUITY_LADDER = _ladder(THRESHOLDS['debt_to_equity'], lower_is_better=True)
+    _REVENUE_GROWTH_LADDER = _ladder(THRESHOLDS['revenue_growth'])
+    
+    # WEIGHTS as plain floats, in component order
+    _WEIGHT_PROFITABILITY, _WEIGHT_LIQUIDITY, _WEIGHT_LEVERAGE, _WEIGHT_CASH_FLOW, _WEIGHT_GROWTH = WEIGHTS.values()
+    # ...and as a read-only vector for scoring many companies with one matrix product
+    _WEIGHT_VECTOR = np.array(list(WEIGHTS.values()))
+    _WEIGHT_VECTOR.setflags(write=False)
+    
+    # Results cached per company together with the latest month they were computed from and the
+    # company's shared cache generation, so invalidations reach every worker process
+    HEALTH_CACHE_SIZE = 512
+    _health_cache: "OrderedDict[str, Tuple[str, Dict[str, Any], int]]" = OrderedDict()
+    
+    @classmethod
+    def invalidate_cache(cls, company_id: str):
+        """Drop the cached health result for a company after its monthly data changes"""
+        cache_key = str(company_id)
+        cls._health_cache.pop(cache_key, None)
+        bump_generation('health', cache_key)
+    
+    @staticmethod
+    def fetch_recent_summaries(company_id: str, db: Session, limit: int = 12) -> List:
+        """Fetch the newest monthly rows the health score works from, newest first"""
+        return db.query(
+            _float_column(MonthlySummary.revenue), _float_column(MonthlySummary.net_income),
+            _float_column(MonthlySummary.current_ratio), _float_column(MonthlySummary.operating_cash_flow),
+            _float_column(MonthlySummary.net_margin), _float_column(MonthlySummary.debt_to_equity),
+            MonthlySummary.month
+        ).filter(
+            MonthlySummary.company_id == company_id
+        ).order_by(MonthlySummary.month.desc()).limit(limit).all()
+    
+    def calculate_comprehensive_health(self, company_id: str, db: Session,
+                                       summaries: Optional[List] = None) -> Dict[str, Any]:
+        """Calculate comprehensive financial health score, reusing the cached result for the latest month
+        
+        Rows already fetched with fetch_recent_summaries can be passed in to skip the query.
+        """
+        if summaries is not None:
+            latest_month = summaries[0].month if summaries else None
+        else:
+            latest_month = db.execute(select(func.max(MonthlySummary.month)).where(
+                MonthlySummary.company_id == company_id
+            )).scalar()
+        if latest_month is None:
+            return self._empty_health_response()
+        
+        cache_key = str(company_id)
+        generation = cache_generation('health', cache_key)
+        entry = self._health_cache.get(cache_key)
+        if entry is not None and entry[0] == latest_month and entry[2] == generation:
+            self._health_cache.move_to_end(cache_key)
+            return entry[1]
+        
+        result = self._compute_health(company_id, db, summaries)
+        self._remember_health(cache_key, latest_month, result, generation)
+        return result
+    
+    @classmethod
+    def _remember_health(cls, cache_key: str, latest_month: str, result: Dict[str, Any], generation: Optional[int]):
+        """Insert into the bounded in-process LRU; skipped when Redis is configured but unreachable (generation None)"""
+        if generation is None:
+            return
+        cache = cls._health_cache
+        cache[cache_key] = (latest_month, result, generation)
+        cache.move_to_end(cache_key)
+        while len(cache) > cls.HEALTH_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def calculate_many(self, company_ids: List[str], db: Session) -> Dict[str, Dict[str, Any]]:
+        """Calculate health for several companies with one window query and one vectorized scoring pass"""
+        if not company_ids:
+            return {}
+        
+        # Number each company's months newest first and keep the 12-month windows
+        ranked = select(
+            MonthlySummary.company_id,
+            MonthlySummary.month,
+            _float_column(MonthlySummary.revenue),
+            _float_column(MonthlySummary.net_income),
+            _float_column(MonthlySummary.current_ratio),
+            _float_column(MonthlySummary.operating_cash_flow),
+            _float_column(MonthlySummary.net_margin),
+            _float_column(MonthlySummary.debt_to_equity),
+            func.row_number().over(
+                partition_by=MonthlySummary.company_id,
+                order_by=MonthlySummary.month.desc()
+            ).label('month_rank')
+        ).where(
+            MonthlySummary.company_id.in_(company_ids)
+        ).subquery()
+        rows = db.execute(
+            select(ranked).where(ranked.c.month_rank <= 12).order_by(ranked.c.company_id, ranked.c.month_rank)
+        ).all()
+        
+        windows = defaultdict(list)
+        for row in rows:
+            windows[str(row.company_id)].append(row)
+        
+        results = {}
+        pending = []
+        generations = dict(zip(windows, cache_generations('health', windows)))
+        for company_id in company_ids:
+            cache_key = str(company_id)
+            summaries = windows.get(cache_key)
+            if not summaries:
+                results[company_id] = self._empty_health_response()
+                continue
+            # The window head is the latest month, so cached results can be reused without a probe query
+            entry = self._health_cache.get(cache_key)
+            if entry is not None and entry[0] == summaries[0].month and entry[2] == generations[cache_key]:
+                self._health_cache.move_to_end(cache_key)
+                results[company_id] = entry[1]
+            elif len(summaries) < 2:
+                results[company_id] = self._empty_health_response()
+            else:
+                results[company_id] = None  # Filled in below, keeping the callers' order
+                pending.append((company_id, summaries))
+        
+        for (company_id, summaries), result in zip(pending, self._score_windows([s for _, s in pending])):
+            results[company_id] = result
+            cache_key = str(company_id)
+            self._remember_health(cache_key, summaries[0].month, result, generations[cache_key])
+        
+        return results
+    
+    def _score_windows(self, windows: List[List]) -> List[Dict[str, Any]]:
+        """Score several monthly windows (each newest first, at least 2 months) in one vectorized pass"""
+        n = len(windows)
+        if not n:
+            return []
+        
+        # (companies, months) matrices, oldest to newest and right-aligned so column -1 is the latest month
+        width = max(len(w) for w in windows)
+        lengths = np.fromiter((len(w) for w in windows), dtype=np.intp, count=n)
+        revenues = np.full((n, width), np.nan)
+        net_incomes = np.full((n, width), np.nan)
+        cash_flows = np.full((n, width), np.nan)
+        for i, window in enumerate(windows):
+            oldest_first = window[::-1]
+            revenues[i, width - len(window):] = [s.revenue for s in oldest_first]
+            net_incomes[i, width - len(window):] = [s.net_income for s in oldest_first]
+            cash_flows[i, width - len(window):] = [s.operating_cash_flow for s in oldest_first]
+        latest_revenue, latest_net_income = revenues[:, -1], net_incomes[:, -1]
+        stored_margin = np.fromiter((w[0].net_margin for w in windows), dtype=np.float64, count=n)
+        current_ratio = np.fromiter((w[0].current_ratio for w in windows), dtype=np.float64, count=n)
+        debt_to_equity = np.fromiter((w[0].debt_to_equity for w in windows), dtype=np.float64, count=n)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            derived_margin = np.where(latest_revenue > 0, latest_net_income / latest_revenue, 0.0)
+        net_margin = np.where(stored_margin != 0, stored_margin, derived_margin)
+        income_cv, _ = _row_stats(net_incomes, lengths)
+        cash_flow_cv, _ = _row_stats(cash_flows, lengths)
+        _, revenue_growth = _row_stats(revenues, lengths)
+        
+        profitability = np.minimum(
+            100, _ladder_scores(self._NET_MARGIN_LADDER, net_margin) + np.maximum(0, (0.5 - income_cv) * 40)
+        )
+        profitability = np.where(latest_revenue == 0, 0.0, profitability)
+        liquidity = _ladder_scores(self._CURRENT_RATIO_LADDER, current_ratio)
+        leverage = _ladder_scores(self._DEBT_TO_EQUITY_LADDER, debt_to_equity, lower_is_better=True)
+        positive_ratio = (cash_flows > 0).sum(axis=1) / lengths
+        cash_flow = np.minimum(100, _ladder_scores(_POSITIVE_CASH_FLOW_LADDER, positive_ratio)
+                               + _ladder_scores(_CASH_FLOW_STABILITY_BONUS, cash_flow_cv))
+        growth = _ladder_scores(self._REVENUE_GROWTH_LADDER, revenue_growth)
+        
+        # Weighted aggregation for every company at once: (companies, 5) @ (5,)
+        components = np.column_stack((profitability, liquidity, leverage, cash_flow, growth))
+        health = components @ self._WEIGHT_VECTOR
+        
+        # Display values rounded once per column rather than once per value
+        rounded = np.column_stack((
+            np.round(health, 2), np.round(components, 2), np.round(net_margin, 4), np.round(current_ratio, 2),
+            np.round(debt_to_equity, 2), np.round(cash_flow_cv, 2), np.round(revenue_growth, 4),
+        )).tolist()
+        
+        return [
+            self._health_result(*scores, rounded=display)
+            for display, *scores in zip(
+                rounded,
+                profitability.tolist(), liquidity.tolist(), leverage.tolist(), cash_flow.tolist(), growth.tolist(),
+                net_margin.tolist(), current_ratio.tolist(), debt_to_equity.tolist(), cash_flow_cv.tolist(),
+                revenue_growth.tolist(), health.tolist(),
+            )
+        ]
+    
+    def _compute_health(self, company_id: str, db: Session, summaries: Optional[List] = None) -> Dict[str, Any]:
         """Calculate comprehensive financial health score with all components"""
         
         # Get last 12 months of data
-        summaries = db.query(MonthlySummary).filter(
-            MonthlySummary.company_id == company_id
-        ).order_by(MonthlySummary.month.desc()).limit(12).all()
+        if summaries is None:
+            summaries = self.fetch_recent_summaries(company_id, db)
         
         if len(summaries) < 2:
             return self._empty_health_response()
         
-        # Extract data arrays
-        revenues = [float(s.revenue or 0) for s in reversed(summaries)]
-        net_incomes = [float(s.net_income or 0) for s in reversed(summaries)]
-        current_ratios = [float(s.current_ratio or 0) for s in reversed(summaries)]
-        cash_flows = [float(s.operating_cash_flow or 0) for s in reversed(summaries)]
+        # Extract data arrays (the query already returns floats with NULL as 0.0)
+        oldest_first = summaries[::-1]
+        revenues = [s.revenue for s in oldest_first]
+        net_incomes = [s.net_income for s in oldest_first]
+        current_ratios = [s.current_ratio for s in oldest_first]
+        cash_flows = [s.operating_cash_flow for s in oldest_first]
         
         # Get latest debt metrics
         latest = summaries[0]
-        net_margin = float(latest.net_margin or 0) if latest.net_margin else (net_incomes[-1] / revenues[-1] if revenues[-1] > 0 else 0)
+        net_margin = latest.net_margin or (net_incomes[-1] / revenues[-1] if revenues[-1] > 0 else 0)
         current_ratio_val = current_ratios[-1]
-        debt_to_equity_val = float(latest.debt_to_equity or 0)
+        debt_to_equity_val = latest.debt_to_equity
+        
+        # Series statistics shared by the component scores and the details
+        cash_flow_stability = self._calculate_stability(cash_flows)
+        revenue_growth_rate = self._calculate_growth_rate(revenues)
         
         # Calculate component scores
         profitability_score = self._calculate_profitability_score(net_margin, revenues, net_incomes)
         liquidity_score = self._calculate_liquidity_score(current_ratio_val)
         leverage_score = self._calculate_leverage_score(debt_to_equity_val)
-        cash_flow_score = self._calculate_cash_flow_score(cash_flows)
-        growth_score = self._calculate_growth_score(revenues)
-        
-        # Weighted aggregation
-        health_score = (
-            profitability_score * self.WEIGHTS['profitability'] +
-            liquidity_score * self.WEIGHTS['liquidity'] +
-            leverage_score * self.WEIGHTS['leverage'] +
-            cash_flow_score * self.WEIGHTS['cash_flow'] +
-            growth_score * self.WEIGHTS['growth']
+        cash_flow_score = self._calculate_cash_flow_score(cash_flows, cash_flow_stability)
+        growth_score = self._calculate_growth_score(revenues, revenue_growth_rate)
+        
+        return self._health_result(
+            profitability_score, liquidity_score, leverage_score, cash_flow_score, growth_score,
+            net_margin, current_ratio_val, debt_to_equity_val, cash_flow_stability, revenue_growth_rate
         )
+    
+    def _health_result(self, profitability_score: float, liquidity_score: float, leverage_score: float,
+                       cash_flow_score: float, growth_score: float, net_margin: float, current_ratio_val: float,
+                       debt_to_equity_val: float, cash_flow_stability: float, revenue_growth_rate: float,
+                       health_score: Optional[float] = None, rounded: Optional[List[float]] = None) -> Dict[str, Any]:
+        """Aggregate component scores into the health response
+        
+        rounded, when given, holds the display values already rounded in bulk, in response order.
+        """
+        # Weighted aggregation, unless the batch path already took it as a matrix product
+        if health_score is None:
+            health_score = (
+                profitability_score * self._WEIGHT_PROFITABILITY +
+                liquidity_score * self._WEIGHT_LIQUIDITY +
+                leverage_score * self._WEIGHT_LEVERAGE +
+                cash_flow_score * self._WEIGHT_CASH_FLOW +
+                growth_score * self._WEIGHT_GROWTH
+            )
         
         # Categorize health
         health_category = self._categorize_health(health_score)
@@ -79,22 +365,33 @@ class FinancialHealthCalculator:
             'debt_to_equity': debt_to_equity_val
         })
         
+        if rounded is None:
+            rounded = (
+                round(health_score, 2), round(profitability_score, 2), round(liquidity_score, 2),
+                round(leverage_score, 2), round(cash_flow_score, 2), round(growth_score, 2), round(net_margin, 4),
+                round(current_ratio_val, 2), round(debt_to_equity_val, 2), round(cash_flow_stability, 2),
+                round(revenue_growth_rate, 4),
+            )
+        (health_display, profitability_display, liquidity_display, leverage_display, cash_flow_display,
+         growth_display, net_margin_display, current_ratio_display, debt_to_equity_display,
+         stability_display, growth_rate_display) = rounded
+        
         return {
-            'health_score': round(health_score, 2),
+            'health_score': health_display,
             'health_category': health_category,
             'component_scores': {
-                'profitability': round(profitability_score, 2),
-                'liquidity': round(liquidity_score, 2),
-                'leverage': round(leverage_score, 2),
-                'cash_flow': round(cash_flow_score, 2),
-                'growth': round(growth_score, 2)
+                'profitability': profitability_display,
+                'liquidity': liquidity_display,
+                'leverage': leverage_display,
+                'cash_flow': cash_flow_display,
+                'growth': growth_display
             },
             'component_details': {
-                'net_margin': round(net_margin, 4),
-                'current_ratio': round(current_ratio_val, 2),
-                'debt_to_equity': round(debt_to_equity_val, 2),
-                'cash_flow_stability': round(self._calculate_stability(cash_flows), 2),
-                'revenue_growth_rate': round(self._calculate_growth_rate(revenues), 4)
+                'net_margin': net_margin_display,
+                'current_ratio': current_ratio_display,
+                'debt_to_equity': debt_to_equity_display,
+                'cash_flow_stability': stability_display,
+                'revenue_growth_rate': growth_rate_display
             },
             'improvement_recommendations': recommendations
         }
@@ -105,17 +402,7 @@ class FinancialHealthCalculator:
             return 0
         
         # Base score from margin
-        thresholds = self.THRESHOLDS['net_margin']
-        if net_margin >= thresholds['excellent']:
-            base_score = 100
-        elif net_margin >= thresholds['good']:
-            base_score = 80
-        elif net_margin >= thresholds['moderate']:
-            base_score = 60
-        elif net_margin >= thresholds['weak']:
-            base_score = 40
-        else:
-            base_score = 20
+        base_score = _band_score(self._NET_MARGIN_LADDER, net_margin)
         
         # Adjust for stability (less volatility = higher score)
         if len(net_incomes) > 1:
@@ -127,101 +414,44 @@ class FinancialHealthCalculator:
     
     def _calculate_liquidity_score(self, current_ratio: float) -> float:
         """Score based on current ratio"""
-        thresholds = self.THRESHOLDS['current_ratio']
-        if current_ratio >= thresholds['excellent']:
-            return 100
-        elif current_ratio >= thresholds['good']:
-            return 80
-        elif current_ratio >= thresholds['moderate']:
-            return 60
-        elif current_ratio >= thresholds['weak']:
-            return 40
-        else:
-            return 20
+        return _band_score(self._CURRENT_RATIO_LADDER, current_ratio)
     
     def _calculate_leverage_score(self, debt_to_equity: float) -> float:
         """Score based on debt-to-equity (inverse scoring - lower is better)"""
-        thresholds = self.THRESHOLDS['debt_to_equity']
-        if debt_to_equity <= thresholds['excellent']:
-            return 100
-        elif debt_to_equity <= thresholds['good']:
-            return 80
-        elif debt_to_equity <= thresholds['moderate']:
-            return 60
-        elif debt_to_equity <= thresholds['weak']:
-            return 40
-        else:
-            return 20
+        return _band_score(self._DEBT_TO_EQUITY_LADDER, debt_to_equity, lower_is_better=True)
     
-    def _calculate_cash_flow_score(self, cash_flows: List[float]) -> float:
+    def _calculate_cash_flow_score(self, cash_flows: List[float], stability: Optional[float] = None) -> float:
         """Score based on cash flow stability and positivity"""
         if not cash_flows:
             return 0
+        if stability is None:
+            stability = self._calculate_stability(cash_flows)
         
         # Check if cash flows are consistently positive
-        positive_ratio = sum(1 for cf in cash_flows if cf > 0) / len(cash_flows)
-        
-        # Base score from positivity
-        if positive_ratio >= 0.8:
-            base_score = 80
-        elif positive_ratio >= 0.6:
-            base_score = 60
-        elif positive_ratio >= 0.4:
-            base_score = 40
-        else:
-            base_score = 20
+        positive_ratio = sum(cf > 0 for cf in cash_flows) / len(cash_flows)
         
-        # Adjust for stability
-        stability = self._calculate_stability(cash_flows)
-        if stability < 0.3:
-            base_score += 20
-        elif stability < 0.5:
-            base_score += 10
+        # Base score from positivity, adjusted for stability
+        base_score = _band_score(_POSITIVE_CASH_FLOW_LADDER, positive_ratio)
+        base_score += _band_score(_CASH_FLOW_STABILITY_BONUS, stability)
         
         return min(100, base_score)
     
-    def _calculate_growth_score(self, revenues: List[float]) -> float:
+    def _calculate_growth_score(self, revenues: List[float], growth_rate: Optional[float] = None) -> float:
         """Score based on revenue growth rate"""
         if len(revenues) < 2:
             return 50  # Neutral score if insufficient data
+        if growth_rate is None:
+            growth_rate = self._calculate_growth_rate(revenues)
         
-        growth_rate = self._calculate_growth_rate(revenues)
-        thresholds = self.THRESHOLDS['revenue_growth']
-        
-        if growth_rate >= thresholds['excellent']:
-            return 100
-        elif growth_rate >= thresholds['good']:
-            return 80
-        elif growth_rate >= thresholds['moderate']:
-            return 60
-        elif growth_rate >= thresholds['weak']:
-            return 40
-        else:
-            return 20
+        return _band_score(self._REVENUE_GROWTH_LADDER, growth_rate)
     
     def _calculate_stability(self, values: List[float]) -> float:
         """Calculate coefficient of variation (lower = more stable)"""
-        if len(values) < 2 or not any(values):
-            return 1.0
-        
-        values_array = np.array(values)
-        mean = np.mean(values_array)
-        if mean == 0:
-            return 1.0
-        
-        std_dev = np.std(values_array)
-        return std_dev / abs(mean)
+        return coefficient_of_variation(values)
     
     def _calculate_growth_rate(self, values: List[float]) -> float:
         """Calculate compound monthly growth rate"""
-        if len(values) < 2 or values[0] == 0:
-            return 0
-        
-        start_value = values[0]
-        end_value = values[-1]
-        periods = len(values) - 1
-        
-        return (end_value / start_value) ** (1/periods) - 1
+        return compound_growth_rate(values)
     
     def _categorize_health(self, score: float) -> str:
         """Categorize health score"""
@@ -268,22 +498,4 @@ class FinancialHealthCalculator:
     
     def _empty_health_response(self) -> Dict[str, Any]:
         """Return empty response when insufficient data"""
-        return {
-            'health_score': None,
-            'health_category': 'No Data',
-            'component_scores': {
-                'profitability': None,
-                'liquidity': None,
-                'leverage': None,
-                'cash_flow': None,
-                'growth': None
-            },
-            'component_details': {
-                'net_margin': None,
-                'current_ratio': None,
-                'debt_to_equity': None,
-                'cash_flow_stability': None,
-                'revenue_growth_rate': None
-            },
-            'improvement_recommendations': []
-        }
+        return _EMPTY_HEALTH
@@ -3,6 +3,7 @@ import json
 import hashlib
 from datetime import datetime
 from typing import Dict, List, Any, Optional
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from decimal import Decimal
 from pathlib import Path
@@ -37,38 +38,42 @@ class ReportGenerator:
         
         print(f"[REPORT GENERATOR] company_id={company_id} report_type={report_type}")
         
-        # Get latest financial data
-        latest_summary = db.query(MonthlySummary).filter(
+        # Latest month, the one-per-company analysis summaries, the month count and the latest
+        # report version in a single round trip; the summary tables are unique per company
+        data_months_used = select(func.count()).select_from(MonthlySummary).where(
             MonthlySummary.company_id == company_id
-        ).order_by(MonthlySummary.month.desc()).first()
+        ).scalar_subquery()
+        latest_version = select(func.max(Report.version_number)).where(
+            Report.company_id == company_id
+        ).scalar_subquery()
+        row = db.execute(
+            select(
+                MonthlySummary, FinancialHealthSummary, RiskSummary, CreditScoreSummary, BenchmarkSummary,
+                data_months_used, latest_version
+            )
+            .outerjoin(FinancialHealthSummary, FinancialHealthSummary.company_id == MonthlySummary.company_id)
+            .outerjoin(RiskSummary, RiskSummary.company_id == MonthlySummary.company_id)
+            .outerjoin(CreditScoreSummary, CreditScoreSummary.company_id == MonthlySummary.company_id)
+            .outerjoin(BenchmarkSummary, BenchmarkSummary.company_id == MonthlySummary.company_id)
+            .where(MonthlySummary.company_id == company_id)
+            .order_by(MonthlySummary.month.desc())
+            .limit(1)
+        ).first()
         
-        if not latest_summary:
+        if not row:
             print(f"[REPORT GENERATOR] No monthly summary found for company_id={company_id}")
             return self._empty_report_response()
         
-        print(f"[REPORT GENERATOR] Found monthly summary for month={latest_summary.month}")
-        
-        # Get analysis data
-        health_summary = db.query(FinancialHealthSummary).filter(
-            FinancialHealthSummary.company_id == company_id
-        ).first()
+        (latest_summary, health_summary, risk_summary, credit_summary, benchmark_summary,
+         data_months_used, latest_version) = row
         
+        print(f"[REPORT GENERATOR] Found monthly summary for month={latest_summary.month}")
         print(f"[REPORT GENERATOR] Health summary found: {health_summary is not None}")
         if health_summary:
             print(f"[REPORT GENERATOR] Health score: {health_summary.health_score}")
-        
-        risk_summary = db.query(RiskSummary).filter(
-            RiskSummary.company_id == company_id
-        ).first()
-        
         print(f"[REPORT GENERATOR] Risk summary found: {risk_summary is not None}")
         if risk_summary:
             print(f"[REPORT GENERATOR] Risk score: {risk_summary.overall_risk_score}")
-        
-        credit_summary = db.query(CreditScoreSummary).filter(
-            CreditScoreSummary.company_id == company_id
-        ).first()
-        
         print(f"[REPORT GENERATOR] Credit summary found: {credit_summary is not None}")
         if credit_summary:
             print(f"[REPORT GENERATOR] Credit score: {credit_summary.credit_score}")
@@ -78,15 +83,21 @@ class ReportGenerator:
             ForecastSummary.forecast_type == "Base"
         ).order_by(ForecastSummary.projection_month).limit(6).all()
         
-        benchmark_summary = db.query(BenchmarkSummary).filter(
-            BenchmarkSummary.company_id == company_id
-        ).first()
-        
-        # Get next version number
-        latest_report = db.query(Report).filter(
-            Report.company_id == company_id
+        # Reuse the latest report built from exactly the same source rows while its files still exist
+        content_hash = self._content_hash(
+            company_id, report_type, latest_summary, data_months_used,
+            health_summary, risk_summary, credit_summary, forecast_data, benchmark_summary
+        )
+        cached_report = db.query(Report).filter(
+            Report.company_id == company_id,
+            Report.content_hash == content_hash
         ).order_by(Report.version_number.desc()).first()
-        next_version = (latest_report.version_number + 1) if latest_report else 1
+        if (cached_report and cached_report.file_path_pdf and cached_report.file_path_json
+                and Path(cached_report.file_path_pdf).exists() and Path(cached_report.file_path_json).exists()):
+            print(f"[REPORT GENERATOR] Source data unchanged, reusing report version={cached_report.version_number}")
+            return self._report_response(cached_report)
+        
+        next_version = (latest_version or 0) + 1
         
         # Compile report data
         report_data = {
@@ -132,21 +143,40 @@ class ReportGenerator:
             benchmark_comparison=report_data["benchmark_comparison"],
             recommendations=report_data["recommendations"],
             processing_period=latest_summary.month,
-            data_months_used=db.query(MonthlySummary).filter(
-                MonthlySummary.company_id == company_id
-            ).count()
+            data_months_used=data_months_used,
+            content_hash=content_hash
         )
         
         db.add(report)
         db.commit()
         
+        return self._report_response(report)
+    
+    def _content_hash(self, company_id: str, report_type: str, latest: MonthlySummary, data_months_used: int,
+                      health: Optional[FinancialHealthSummary], risk: Optional[RiskSummary],
+                      credit: Optional[CreditScoreSummary], forecasts: List,
+                      benchmark: Optional[BenchmarkSummary]) -> str:
+        """SHA-256 over the ids and update timestamps of every row a report is built from"""
+        parts = [
+            str(company_id), report_type, str(data_months_used),
+            f"{latest.id}:{latest.month}:{latest.updated_at or latest.created_at}",
+        ]
+        for summary in (health, risk, credit):
+            parts.append(f"{summary.id}:{summary.last_updated}" if summary else "-")
+        # Forecast rows are replaced wholesale on regeneration, so their ids change with their content
+        parts.append(",".join(str(forecast.id) for forecast in forecasts))
+        parts.append(f"{benchmark.id}:{benchmark.results_hash or benchmark.last_updated}" if benchmark else "-")
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+    
+    def _report_response(self, report: Report) -> Dict[str, Any]:
+        """API response for a stored report"""
         return {
             "report_id": str(report.id),
-            "version_number": next_version,
+            "version_number": report.version_number,
             "generated_at": report.generated_at.isoformat(),
             "file_paths": {
-                "pdf": str(pdf_path),
-                "json": str(json_path)
+                "pdf": report.file_path_pdf,
+                "json": report.file_path_json
             },
             "scores": {
                 "health": report.health_score,